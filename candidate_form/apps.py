@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CandidateFormConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'candidate_form'
+
+    def ready(self):
+        import candidate_form.signals  # noqa
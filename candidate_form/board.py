@@ -0,0 +1,186 @@
+"""
+Hiring pipeline board.
+
+PipelineBoardCount holds submissions per form_type x current_phase x status
+and PipelineAssigneeCount assigned submissions per assignee x current_phase.
+ApplicationForm.save() moves a submission between rows with F() updates in
+its own transaction, so create, PUT/PATCH, ChangePhaseAPIView and
+RollbackAPIView all keep them current; candidate_form.signals takes a
+submission off on delete. The board endpoint reads only these two small
+tables, cached until the next change bumps BOARD_VERSION_KEY.
+
+Writes that skip save() (queryset.update(), raw SQL, fixtures) are not
+tracked; the check_pipeline_board command recomputes the rollup from
+ApplicationForm, reports any drift and, with --fix, rewrites it.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import PHASE_CHOICES, ApplicationForm, PipelineAssigneeCount, PipelineBoardCount
+
+BOARD_VERSION_KEY = "pipeline_board:version"
+BOARD_TTL = 300
+
+# what a submission's place on the board depends on, in this order
+BOARD_FIELDS = ("form_type", "current_phase", "status", "assigned_to_id")
+
+
+def board_key(form, previous=None, update_fields=None):
+    """BOARD_FIELDS as stored once `form` is saved with `update_fields`."""
+    if previous is None or update_fields is None:
+        return tuple(getattr(form, name) for name in BOARD_FIELDS)
+    updated = set(update_fields)
+    return tuple(
+        getattr(form, name) if name in updated or name.removesuffix("_id") in updated else old
+        for name, old in zip(BOARD_FIELDS, previous)
+    )
+
+
+# --------------------------
+# Incremental updates
+# --------------------------
+def _bump(model, delta, **key):
+    updated = model.objects.filter(**key).update(count=F("count") + delta)
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # created concurrently
+        model.objects.filter(**key).update(count=F("count") + delta)
+
+
+def record_transition(before, after):
+    """Move one submission from the BOARD_FIELDS tuple `before` to `after`; either may be None."""
+    if before == after:
+        return
+    if (before and before[:3]) != (after and after[:3]):
+        if before:
+            _bump(PipelineBoardCount, -1, form_type=before[0], current_phase=before[1], status=before[2])
+        if after:
+            _bump(PipelineBoardCount, 1, form_type=after[0], current_phase=after[1], status=after[2])
+    was = (before[3], before[1]) if before and before[3] else None
+    now = (after[3], after[1]) if after and after[3] else None
+    if was != now:
+        if was:
+            _bump(PipelineAssigneeCount, -1, assignee_id=was[0], current_phase=was[1])
+        if now:
+            _bump(PipelineAssigneeCount, 1, assignee_id=now[0], current_phase=now[1])
+    transaction.on_commit(bump_board_version)
+
+
+# --------------------------
+# Board
+# --------------------------
+def board_version():
+    return cache.get_or_set(BOARD_VERSION_KEY, 1, None)
+
+
+def bump_board_version():
+    try:
+        cache.incr(BOARD_VERSION_KEY)
+    except ValueError:
+        cache.set(BOARD_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def build_board():
+    from .serializers import user_display
+
+    columns, by_phase = [], {phase: 0 for phase, _ in PHASE_CHOICES}
+    for form_type, phase, status, count in (
+        PipelineBoardCount.objects.filter(count__gt=0)
+        .order_by("form_type", "current_phase", "status")
+        .values_list("form_type", "current_phase", "status", "count")
+    ):
+        columns.append({"form_type": form_type, "current_phase": phase, "status": status, "count": count})
+        by_phase[phase] = by_phase.get(phase, 0) + count
+
+    assignees = {}
+    for assignee_id, username, email, phase, count in (
+        PipelineAssigneeCount.objects.filter(count__gt=0)
+        .values_list("assignee_id", "assignee__username", "assignee__email", "current_phase", "count")
+    ):
+        entry = assignees.setdefault(assignee_id, {
+            "assignee": assignee_id,
+            "assignee_display": user_display(username, email),
+            "total": 0,
+            "phases": {},
+        })
+        entry["phases"][phase] = count
+        entry["total"] += count
+
+    return {
+        "total": sum(by_phase.values()),
+        "by_phase": by_phase,
+        "columns": columns,
+        "assignees": sorted(assignees.values(), key=lambda e: (-e["total"], e["assignee"])),
+    }
+
+
+def get_board():
+    return cache.get_or_set(f"pipeline_board:{board_version()}", build_board, BOARD_TTL)
+
+
+# --------------------------
+# Consistency
+# --------------------------
+def stored_rollup():
+    """({(form_type, phase, status): n}, {(assignee_id, phase): n}) from the rollup tables."""
+    board = {
+        (form_type, phase, status): count
+        for form_type, phase, status, count in PipelineBoardCount.objects.filter(count__gt=0)
+        .values_list("form_type", "current_phase", "status", "count")
+    }
+    assignees = {
+        (assignee_id, phase): count
+        for assignee_id, phase, count in PipelineAssigneeCount.objects.filter(count__gt=0)
+        .values_list("assignee_id", "current_phase", "count")
+    }
+    return board, assignees
+
+
+def computed_rollup():
+    """The same two maps aggregated from ApplicationForm."""
+    forms = ApplicationForm.objects.order_by()
+    board = {
+        (row["form_type"], row["current_phase"], row["status"]): row["total"]
+        for row in forms.values("form_type", "current_phase", "status").annotate(total=Count("pk"))
+    }
+    assignees = {
+        (row["assigned_to_id"], row["current_phase"]): row["total"]
+        for row in forms.filter(assigned_to__isnull=False)
+        .values("assigned_to_id", "current_phase").annotate(total=Count("pk"))
+    }
+    return board, assignees
+
+
+def find_drift():
+    """[(table, key, stored, actual)] for every rollup count that disagrees with ApplicationForm."""
+    drift = []
+    for table, stored, actual in zip(("board", "assignee"), stored_rollup(), computed_rollup()):
+        for key in sorted(stored.keys() | actual.keys(), key=str):
+            if stored.get(key, 0) != actual.get(key, 0):
+                drift.append((table, key, stored.get(key, 0), actual.get(key, 0)))
+    return drift
+
+
+@transaction.atomic
+def rebuild_rollup():
+    """Rewrite both rollup tables from ApplicationForm; returns (board rows, assignee rows)."""
+    board, assignees = computed_rollup()
+    PipelineBoardCount.objects.all().delete()
+    PipelineAssigneeCount.objects.all().delete()
+    PipelineBoardCount.objects.bulk_create([
+        PipelineBoardCount(form_type=form_type, current_phase=phase, status=status, count=count)
+        for (form_type, phase, status), count in board.items()
+    ], batch_size=1000)
+    PipelineAssigneeCount.objects.bulk_create([
+        PipelineAssigneeCount(assignee_id=assignee_id, current_phase=phase, count=count)
+        for (assignee_id, phase), count in assignees.items()
+    ], batch_size=1000)
+    transaction.on_commit(bump_board_version)
+    return len(board), len(assignees)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from candidate_form.board import find_drift, rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = ("Recompute the pipeline board rollup from ApplicationForm and report any counts that drifted; "
+            "--fix rewrites the rollup tables. Exits non-zero on drift without --fix.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Rewrite the rollup from ApplicationForm")
+
+    def handle(self, *args, **options):
+        drift = find_drift()
+        for table, key, stored, actual in drift:
+            self.stdout.write(f"{table:<9} {' / '.join(str(part) for part in key)}: rollup {stored}, actual {actual}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Pipeline board rollup matches ApplicationForm."))
+            return
+        if options["fix"]:
+            board, assignees = rebuild_rollup()
+            self.stdout.write(self.style.SUCCESS(
+                f"Fixed {len(drift)} drifted counts; rebuilt {board} board and {assignees} assignee rows"
+            ))
+            return
+        raise CommandError(f"{len(drift)} drifted counts; rerun with --fix to rebuild the rollup")
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rollup(apps, schema_editor):
+    ApplicationForm = apps.get_model('candidate_form', 'ApplicationForm')
+    PipelineBoardCount = apps.get_model('candidate_form', 'PipelineBoardCount')
+    PipelineAssigneeCount = apps.get_model('candidate_form', 'PipelineAssigneeCount')
+    forms = ApplicationForm.objects.order_by()
+    PipelineBoardCount.objects.bulk_create([
+        PipelineBoardCount(form_type=row['form_type'], current_phase=row['current_phase'], status=row['status'],
+                           count=row['total'])
+        for row in forms.values('form_type', 'current_phase', 'status').annotate(total=Count('pk'))
+    ], batch_size=1000)
+    PipelineAssigneeCount.objects.bulk_create([
+        PipelineAssigneeCount(assignee_id=row['assigned_to_id'], current_phase=row['current_phase'], count=row['total'])
+        for row in forms.filter(assigned_to__isnull=False).values('assigned_to_id', 'current_phase')
+        .annotate(total=Count('pk'))
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate_form', '0002_rename_field_by_applicationform_submitted_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineBoardCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form_type', models.CharField(blank=True, max_length=150)),
+                ('current_phase', models.CharField(choices=[('first_round', 'First Round'), ('second_round', 'Second Round'), ('third_round', 'Third Round'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=50)),
+                ('status', models.CharField(max_length=30)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'pipeline_board_counts',
+                'constraints': [models.UniqueConstraint(fields=('form_type', 'current_phase', 'status'), name='pipeline_board_count_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PipelineAssigneeCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_phase', models.CharField(choices=[('first_round', 'First Round'), ('second_round', 'Second Round'), ('third_round', 'Third Round'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('assignee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'pipeline_assignee_counts',
+                'constraints': [models.UniqueConstraint(fields=('assignee', 'current_phase'), name='pipeline_assignee_count_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
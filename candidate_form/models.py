@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from profile_details.models import CandidateDetails
@@ -71,6 +71,18 @@ class ApplicationForm(models.Model):
     def __str__(self):
         return f"{self.form_type or 'submission'} #{self.pk} by {self.submitted_by}"
 
+    def save(self, *args, **kwargs):
+        from .board import BOARD_FIELDS, board_key, record_transition
+
+        # the row lock orders concurrent phase changes, so the board rollup never drifts
+        with transaction.atomic(using=kwargs.get("using")):
+            previous = None
+            if not self._state.adding and self.pk:
+                previous = ApplicationForm.objects.select_for_update().filter(pk=self.pk).values_list(
+                    *BOARD_FIELDS).first()
+            super().save(*args, **kwargs)
+            record_transition(previous, board_key(self, previous, kwargs.get("update_fields")))
+
     # convenience helpers
     def last_action(self):
         return self.actions.order_by("-created_at").first()
@@ -101,3 +113,45 @@ class ApplicationStatusHistory(models.Model):
 
     def __str__(self):
         return f"Action {self.action} on {self.submission_id} -> {self.to_phase} by {self.action_by}"
+
+
+class PipelineBoardCount(models.Model):
+    """
+    Submissions per form_type x current_phase x status, kept by
+    ApplicationForm.save() and candidate_form.signals in the same transaction
+    as the submission itself (see candidate_form.board).
+    """
+    form_type = models.CharField(max_length=150, blank=True)
+    current_phase = models.CharField(max_length=50, choices=PHASE_CHOICES)
+    status = models.CharField(max_length=30)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "pipeline_board_counts"
+        constraints = [
+            models.UniqueConstraint(fields=["form_type", "current_phase", "status"], name="pipeline_board_count_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.form_type or '-'} / {self.current_phase} / {self.status}: {self.count}"
+
+
+class PipelineAssigneeCount(models.Model):
+    """
+    Assigned submissions per assignee x current_phase. Deleting a user nulls
+    assigned_to on their submissions and cascades to their rows here, so the
+    two stay in step without going through save().
+    """
+    # the unique constraint below already indexes assignee_id first
+    assignee = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="pipeline_counts", db_index=False)
+    current_phase = models.CharField(max_length=50, choices=PHASE_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "pipeline_assignee_counts"
+        constraints = [
+            models.UniqueConstraint(fields=["assignee", "current_phase"], name="pipeline_assignee_count_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.assignee_id} / {self.current_phase}: {self.count}"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db.models import OuterRef, Prefetch, Subquery
 from django.utils import timezone
 from .models import ApplicationForm, ApplicationStatusHistory
 from superadmin.models import UserProfile
@@ -70,13 +71,84 @@ class ApplicationFormSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Everything the serializer touches, in a fixed number of queries."""
+        return queryset.select_related("submitted_by", "assigned_to", "last_action_by").prefetch_related(
+            Prefetch("actions", queryset=ApplicationStatusHistory.objects.select_related("action_by"))
+        )
+
     def get_assigned_to_display(self, obj):
         if obj.assigned_to:
-            return f"{obj.assigned_to.username} ({obj.assigned_to.email})"
+            return user_display(obj.assigned_to.username, obj.assigned_to.email)
         return None
 
     def get_last_action_by_display(self, obj):
         if obj.last_action_by:
-            return f"{obj.last_action_by.username} ({obj.last_action_by.email})"
+            return user_display(obj.last_action_by.username, obj.last_action_by.email)
         return None
 
+
+
+def user_display(username, email):
+    return f"{username} ({email})"
+
+
+# --------------------------
+# Compact list / timeline
+# --------------------------
+SUMMARY_FIELDS = [
+    "id", "form_type", "current_phase", "status", "assigned_to_id", "assigned_to__username", "assigned_to__email",
+    "last_action", "last_action_by_id", "last_action_by__username", "last_action_by__email", "last_action_at",
+    "created_at",
+]
+
+
+def summary_queryset(queryset):
+    """
+    Plain dict rows for the compact list: the two user FKs are joined in the
+    same SELECT and the latest history action comes from a correlated subquery
+    on the (submission, created_at) index, so no model instances are built.
+    """
+    latest = (
+        ApplicationStatusHistory.objects.filter(submission=OuterRef("pk"))
+        .order_by("-created_at", "-pk")
+        .values("action")[:1]
+    )
+    return queryset.annotate(last_action=Subquery(latest)).values(*SUMMARY_FIELDS)
+
+
+def summary_row(row):
+    """A summary_queryset() row in the shape of the full serializer's fields."""
+    return {
+        "id": row["id"],
+        "form_type": row["form_type"],
+        "current_phase": row["current_phase"],
+        "status": row["status"],
+        "assigned_to": row["assigned_to_id"],
+        "assigned_to_display": user_display(row["assigned_to__username"], row["assigned_to__email"])
+        if row["assigned_to_id"] else None,
+        "last_action": row["last_action"],
+        "last_action_by": row["last_action_by_id"],
+        "last_action_by_display": user_display(row["last_action_by__username"], row["last_action_by__email"])
+        if row["last_action_by_id"] else None,
+        "last_action_at": serializers.DateTimeField().to_representation(row["last_action_at"])
+        if row["last_action_at"] else None,
+        "created_at": serializers.DateTimeField().to_representation(row["created_at"]),
+    }
+
+
+class ApplicationHistoryEntrySerializer(serializers.ModelSerializer):
+    """One timeline entry; action_by is an id plus display string rather than a nested user."""
+    action_by_display = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ApplicationStatusHistory
+        fields = ["id", "action", "from_phase", "to_phase", "notes", "metadata", "action_by", "action_by_display",
+                  "created_at"]
+        read_only_fields = fields
+
+    def get_action_by_display(self, obj):
+        if obj.action_by_id:
+            return user_display(obj.action_by.username, obj.action_by.email)
+        return None
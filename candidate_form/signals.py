@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from superadmin.signals import USER_MODELS
+
+from .board import board_key, bump_board_version, record_transition
+from .models import ApplicationForm
+
+
+@receiver(post_delete, sender=ApplicationForm)
+def remove_from_board(sender, instance, **kwargs):
+    record_transition(board_key(instance), None)
+
+
+def drop_deleted_assignee(sender, instance, **kwargs):
+    """The cascade / SET_NULL on a user's board rows bypasses save(), so the cached board is retired here."""
+    transaction.on_commit(bump_board_version)
+
+
+for model in USER_MODELS:
+    post_delete.connect(drop_deleted_assignee, sender=model)
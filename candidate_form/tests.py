@@ -1,3 +1,214 @@
+from io import StringIO
+from itertools import count
+
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from restserver.testing import QueryBudgetMixin
+from superadmin.models import UserProfile
+
+from .board import find_drift
+from .models import PHASE_SECOND, ApplicationForm, ApplicationStatusHistory, PipelineAssigneeCount
+
+_seq = count()
+
+
+def make_applications(n, hr, manager):
+    for _ in range(n):
+        i = next(_seq)
+        form = ApplicationForm.objects.create(
+            form_type="backend", form_data={"name": f"Candidate {i}"},
+            submitted_by=hr, assigned_to=manager, last_action_by=hr,
+        )
+        ApplicationStatusHistory.objects.create(submission=form, action_by=hr, to_phase=form.current_phase,
+                                                action="submitted")
+        ApplicationStatusHistory.objects.create(submission=form, action_by=manager, to_phase=form.current_phase,
+                                                action="phase_change")
+
+
+class ApplicationQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        cls.hr = UserProfile.objects.create(
+            email="hr@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=cls.manager
+        )
+        make_applications(3, cls.hr, cls.manager)
+
+    def grow(self):
+        make_applications(10, self.hr, self.manager)
+
+    def test_applications_list(self):
+        # forms with their three users joined, actions with action_by joined
+        self.assertQueryBudget(2, "/api/candidates/applications/", grow=self.grow)
+
+    def test_my_candidates(self):
+        self.assertQueryBudget(2, "/api/candidates/applications/my-candidates/", grow=self.grow, user=self.hr)
+
+    def test_hr_candidates(self):
+        self.assertQueryBudget(3, f"/api/candidates/applications/{self.hr.pk}/my-candidates/", grow=self.grow)
+
+    def test_applications_summary(self):
+        # one SELECT: users joined, latest action as a subquery
+        self.assertQueryBudget(1, "/api/candidates/applications/?view=summary", grow=self.grow)
+
+    def test_application_history(self):
+        form = ApplicationForm.objects.first()
+        grow = lambda: [ApplicationStatusHistory.objects.create(submission=form, action_by=self.hr, action="note")
+                        for _ in range(5)]
+        self.assertQueryBudget(2, f"/api/candidates/applications/{form.pk}/history/", grow=grow)
+
+
+class ApplicationSummaryHistoryTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", username="manager", password="x", role=UserProfile.ROLE_MANAGER,
+            created_by_superadmin=cls.admin,
+        )
+        cls.hr = UserProfile.objects.create(
+            email="hr@example.com", username="hr", password="x", role=UserProfile.ROLE_HR,
+            created_by_manager=cls.manager,
+        )
+        cls.other = UserProfile.objects.create(
+            email="other@example.com", password="x", role=UserProfile.ROLE_EXTERNAL, created_by_superadmin=cls.admin
+        )
+        make_applications(3, cls.hr, cls.manager)
+        cls.form = ApplicationForm.objects.order_by("pk").first()
+
+    def test_summary_rows(self):
+        self.client.force_authenticate(self.hr)
+        response = self.client.get("/api/candidates/applications/?view=summary&page_size=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        row = response.data["results"][0]
+        self.assertNotIn("actions", row)
+        self.assertNotIn("form_data", row)
+        self.assertEqual(row["assigned_to_display"], "manager (manager@example.com)")
+        self.assertEqual(row["last_action_by_display"], "hr (hr@example.com)")
+        self.assertEqual(row["last_action"], "phase_change")
+
+        rest = self.client.get(response.data["next"])
+        self.assertEqual(len(rest.data["results"]), 1)
+        seen = {r["id"] for r in response.data["results"] + rest.data["results"]}
+        self.assertEqual(seen, set(ApplicationForm.objects.values_list("pk", flat=True)))
+
+    def test_history_pages_in_order(self):
+        for i in range(3):
+            ApplicationStatusHistory.objects.create(submission=self.form, action_by=self.manager, action=f"step{i}")
+        self.client.force_authenticate(self.hr)
+        url = f"/api/candidates/applications/{self.form.pk}/history/?page_size=2"
+        actions = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            actions += [entry["action"] for entry in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(actions, ["submitted", "phase_change", "step0", "step1", "step2"])
+        self.assertEqual(response.data["results"][-1]["action_by_display"], "manager (manager@example.com)")
+
+    def test_history_requires_access(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.get(f"/api/candidates/applications/{self.form.pk}/history/")
+        self.assertEqual(response.status_code, 403)
+
+
+class PipelineBoardTests(QueryBudgetMixin, TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", username="manager", password="x", role=UserProfile.ROLE_MANAGER,
+            created_by_superadmin=cls.user,
+        )
+        cls.hr = UserProfile.objects.create(
+            email="hr@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=cls.manager
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def board(self):
+        response = self.client.get("/api/candidates/applications/board/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_board_follows_every_write_path(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            created = self.client.post("/api/candidates/applications/", {"form_type": "backend", "form_data": {}},
+                                       format="json")
+        pk = created.data["id"]
+        make_applications(2, self.hr, self.manager)
+        self.assertEqual(self.board()["by_phase"]["first_round"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/candidates/applications/{pk}/change-phase/",
+                             {"to_phase": PHASE_SECOND, "assigned_to": self.manager.pk}, format="json")
+        board = self.board()
+        self.assertEqual((board["by_phase"]["first_round"], board["by_phase"]["second_round"]), (2, 1))
+        self.assertEqual(board["assignees"][0]["assignee_display"], "manager (manager@example.com)")
+        self.assertEqual(board["assignees"][0]["phases"], {"first_round": 2, "second_round": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/candidates/applications/{pk}/rollback/", {}, format="json")
+        self.assertEqual(self.board()["by_phase"]["first_round"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/candidates/applications/{pk}/", {"status": "on_hold"}, format="json")
+            self.client.delete(f"/api/candidates/applications/{ApplicationForm.objects.exclude(pk=pk).first().pk}/")
+        board = self.board()
+        self.assertEqual(board["total"], 2)
+        self.assertIn({"form_type": "backend", "current_phase": "first_round", "status": "on_hold", "count": 1},
+                      board["columns"])
+        self.assertEqual(find_drift(), [])
+
+    def test_board_budget(self):
+        # the two rollup tables, whatever the number of submissions
+        self.assertQueryBudget(2, "/api/candidates/applications/board/",
+                               grow=lambda: make_applications(10, self.hr, self.manager))
+
+    def test_board_staff_only(self):
+        external = UserProfile.objects.create(
+            email="ext@example.com", password="x", role=UserProfile.ROLE_EXTERNAL, created_by_superadmin=self.user
+        )
+        self.client.force_authenticate(external)
+        self.assertEqual(self.client.get("/api/candidates/applications/board/").status_code, 403)
+
+    def test_deleting_assignee_drops_their_counts(self):
+        make_applications(2, self.hr, self.hr)
+        self.hr.delete()
+        self.assertFalse(PipelineAssigneeCount.objects.exists())
+        self.assertEqual(find_drift(), [])
+
+    def test_deleting_assignee_refreshes_cached_board(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_applications(2, self.hr, self.hr)
+        self.assertEqual([a["assignee"] for a in self.board()["assignees"]], [self.hr.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.get(pk=self.hr.pk).delete()
+        board = self.board()
+        self.assertEqual(board["assignees"], [])
+        self.assertEqual(board["total"], 2)
+
+    def test_check_command_reports_and_fixes_drift(self):
+        make_applications(3, self.hr, self.manager)
+        call_command("check_pipeline_board", stdout=StringIO())
+
+        ApplicationForm.objects.filter(pk=ApplicationForm.objects.first().pk).update(current_phase=PHASE_SECOND)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_pipeline_board", stdout=out)
+        self.assertIn("rollup 0, actual 1", out.getvalue())
 
-# Create your tests here.
+        call_command("check_pipeline_board", "--fix", stdout=StringIO())
+        self.assertEqual(find_drift(), [])
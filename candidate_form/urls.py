@@ -8,6 +8,8 @@ from .views import (
     ChangePhaseAPIView,
     RollbackAPIView,
     MyCandidatesAPIView,
+    ApplicationHistoryAPIView,
+    PipelineBoardAPIView,
 )
 
 urlpatterns = [
@@ -18,6 +20,9 @@ urlpatterns = [
     # Custom actions
     path('applications/<int:pk>/change-phase/', ChangePhaseAPIView.as_view(), name='applications-change-phase'),
     path('applications/<int:pk>/rollback/', RollbackAPIView.as_view(), name='applications-rollback'),
+    path('applications/<int:pk>/history/', ApplicationHistoryAPIView.as_view(), name='applications-history'),
+    # pipeline board counts, maintained incrementally (candidate_form.board)
+    path('applications/board/', PipelineBoardAPIView.as_view(), name='applications-board'),
     # for logged-in user's candidates
     path('applications/my-candidates/', MyCandidatesAPIView.as_view(), name='my-candidates'),
 
@@ -2,19 +2,55 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.pagination import CursorPagination
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from .board import get_board
 from .models import ApplicationForm, ApplicationStatusHistory
-from .serializers import ApplicationFormSerializer, ApplicationStatusHistorySerializer
+from .serializers import (
+    ApplicationFormSerializer, ApplicationHistoryEntrySerializer, ApplicationStatusHistorySerializer,
+    summary_queryset, summary_row,
+)
 from superadmin.models import UserProfile
 from superadmin.serializers import UserSerializer
 from rest_framework import status
 
 
+class ApplicationSummaryPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-created_at", "-id")
+
+
+class ApplicationHistoryPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("created_at", "id")
+
+
+def can_view_submission(request, submission):
+    """Staff and superusers, the submitter, or the assignee."""
+    user = request.user
+    return bool(
+        user.is_staff or user.is_superuser
+        or (isinstance(user, UserProfile) and submission.submitted_by_id == user.id)
+        or submission.assigned_to_id == user.id
+    )
+
+
+def summary_response(request, qs, view):
+    """?view=summary: cursor-paginated compact rows instead of full serialized submissions."""
+    paginator = ApplicationSummaryPagination()
+    page = paginator.paginate_queryset(summary_queryset(qs), request, view=view)
+    return paginator.get_paginated_response([summary_row(row) for row in page])
+
+
 class ApplicationFormAPIView(APIView):
     # authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
@@ -22,23 +58,15 @@ class ApplicationFormAPIView(APIView):
     def _get_request_profile(self, request):
         if not request or not getattr(request, "user", None) or not request.user.is_authenticated:
             return None
-        try:
-            return UserProfile.objects.get(user=request.user)
-        except Exception:
-            try:
-                return UserProfile.objects.get(pk=request.user.pk)
-            except Exception:
-                return None
+        # request.user is already the (cached) UserProfile loaded by the authentication class
+        return request.user if isinstance(request.user, UserProfile) else None
 
     def get(self, request, pk=None):
-        """Retrieve a single submission or list all relevant submissions"""
+        """Retrieve a single submission or list all relevant submissions (?view=summary for compact rows)"""
         # return Response({'detail': 'Not implemented'}, status=501)
         if pk:
             submission = get_object_or_404(ApplicationForm, pk=pk)
-            profile = self._get_request_profile(request)
-            if request.user.is_staff or request.user.is_superuser \
-               or (profile and submission.submitted_by_id == profile.id) \
-               or submission.assigned_to_id == request.user.id:
+            if can_view_submission(request, submission):
                 serializer = ApplicationFormSerializer(submission, context={"request": request})
                 return Response(serializer.data)
             return Response({"detail": "Permission denied."}, status=403)
@@ -59,6 +87,10 @@ class ApplicationFormAPIView(APIView):
         if status_q:
             qs = qs.filter(status=status_q)
 
+        if request.query_params.get("view") == "summary":
+            return summary_response(request, qs, self)
+
+        qs = ApplicationFormSerializer.setup_eager_loading(qs)
         serializer = ApplicationFormSerializer(qs, many=True, context={"request": request})
         return Response(serializer.data)
 
@@ -225,8 +257,8 @@ class MyCandidatesAPIView(APIView):
             qs = ApplicationForm.objects.filter(Q(submitted_by=hr_profile) | Q(assigned_to_id=hr_profile.id)).distinct()
         else:
             # no hr_id: return candidates relevant to the logged-in user
-            # request.user is a UserProfile instance in your setup (custom user model), so find profile by id
-            profile = UserProfile.objects.filter(id=request.user.id).first()
+            # request.user is a UserProfile instance in your setup (custom user model)
+            profile = request.user if isinstance(request.user, UserProfile) else None
             if profile:
                 qs = ApplicationForm.objects.filter(Q(submitted_by=profile) | Q(assigned_to=request.user))
             else:
@@ -240,6 +272,41 @@ class MyCandidatesAPIView(APIView):
         if status_q:
             qs = qs.filter(status=status_q)
 
-        qs = qs.select_related("submitted_by", "assigned_to", "last_action_by").prefetch_related("actions")
+        if request.query_params.get("view") == "summary":
+            return summary_response(request, qs, self)
+
+        qs = ApplicationFormSerializer.setup_eager_loading(qs)
         serializer = ApplicationFormSerializer(qs, many=True, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ApplicationHistoryAPIView(APIView):
+    """
+    GET /api/candidates/applications/<pk>/history/?page_size=20&cursor=...
+        -> the submission's status history, oldest first, cursor-paginated
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        submission = get_object_or_404(ApplicationForm.objects.only("id", "submitted_by_id", "assigned_to_id"), pk=pk)
+        if not can_view_submission(request, submission):
+            return Response({"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
+
+        paginator = ApplicationHistoryPagination()
+        qs = ApplicationStatusHistory.objects.filter(submission_id=submission.id).select_related("action_by")
+        page = paginator.paginate_queryset(qs, request, view=self)
+        serializer = ApplicationHistoryEntrySerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
+
+
+class PipelineBoardAPIView(APIView):
+    """
+    GET /api/candidates/applications/board/
+        -> submission counts per form_type x phase x status and per assignee (staff/superuser only)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response({"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(get_board(), status=status.HTTP_200_OK)
@@ -3,10 +3,15 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
+from .bulk import MAX_BULK_JOBS, create_jobs, validate_jobs
 from .models import add_job
+from .search import JobSearch
 from .serializers import addjobSerializer
+from .transfer import FORMATS, JobImportError, astream_export, import_jobs, read_rows, stream_export
 
 
 class TenPerPagePagination(PageNumberPagination):
@@ -16,12 +21,18 @@ class TenPerPagePagination(PageNumberPagination):
     max_page_size = 200  # safety cap
 
 
+def description_requested(request):
+    """?fields=Description puts the full HTML back into a list response."""
+    fields = request.query_params.get('fields', '')
+    return 'description' in {f.strip().lower() for f in fields.split(',')}
+
+
 class AddJobAPIView(APIView):
     def get(self, request, pk=None):
         base_qs = (
             add_job.objects
             .select_related('teams', 'employments_types', 'posted_by', 'manager', 'hiring_manager')
-            .prefetch_related('hr_team_members')
+            .prefetch_related('hr_team_members', 'skills_required', 'application_counters')
             .order_by('-created_at')  # <-- default ordering
         )
 
@@ -30,9 +41,12 @@ class AddJobAPIView(APIView):
             serializer = addjobSerializer(job)
             return Response({"status": "success", "data": serializer.data}, status=status.HTTP_200_OK)
 
+        with_description = description_requested(request)
+        if not with_description:
+            base_qs = base_qs.defer('Description')
         paginator = TenPerPagePagination()
         page = paginator.paginate_queryset(base_qs, request)
-        serializer = addjobSerializer(page, many=True)
+        serializer = addjobSerializer(page, many=True, context={'omit_description': not with_description})
         return paginator.get_paginated_response({"status": "success", "data": serializer.data})
 
     def post(self, request):
@@ -72,3 +86,106 @@ class AddJobAPIView(APIView):
         job.delete()
         # 200 with a message (clearer for clients than a 204 with empty body)
         return Response({"status": "success", "message": "Job deleted"}, status=status.HTTP_200_OK)
+
+
+class AddJobBulkAPIView(APIView):
+    """
+    POST /addjob/bulk/  [{job}, ...] or {"jobs": [...]}
+    Same fields as /addjob/ with ids for relations; all jobs are created or none.
+    """
+    def post(self, request):
+        rows = request.data.get("jobs") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({"status": "error", "errors": "Send a non-empty list of jobs."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > MAX_BULK_JOBS:
+            return Response({"status": "error", "errors": f"At most {MAX_BULK_JOBS} jobs per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        valid, errors = validate_jobs(rows)
+        if errors:
+            return Response({"status": "error", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        posted_by = request.user if request.user and request.user.is_authenticated else None
+        jobs = create_jobs(valid, posted_by=posted_by)
+        return Response(
+            {"status": "success", "message": f"{len(jobs)} jobs added",
+             "data": [{"id": job.pk, "job_id": job.job_id, "title": job.title} for job in jobs]},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class AddJobImportAPIView(APIView):
+    """
+    POST /addjob/import/  multipart `file` (.csv or .jsonl; ?type=csv|jsonl overrides), ?dry_run=true
+    Columns as in /addjob/export/, with names for team, employment type and skills
+    and emails for people (lists separated by ';'). All jobs are created or none.
+    """
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"status": "error", "errors": "Upload a CSV or JSONL 'file'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.query_params.get("type") or upload.name.rsplit(".", 1)[-1].lower()
+        if file_format not in FORMATS:
+            return Response({"status": "error", "errors": f"Unsupported type '{file_format}', use csv or jsonl."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+
+        posted_by = request.user if request.user and request.user.is_authenticated else None
+        try:
+            created, errors = import_jobs(read_rows(upload, file_format), posted_by=posted_by, dry_run=dry_run)
+        except JobImportError as e:
+            return Response({"status": "error", "errors": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if errors:
+            return Response({"status": "error", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if dry_run:
+            return Response({"status": "success", "message": "Dry run: all rows are valid", "dry_run": True})
+        return Response({"status": "success", "message": f"{created} jobs imported", "created": created},
+                        status=status.HTTP_201_CREATED)
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+class AddJobExportAPIView(APIView):
+    """GET /addjob/export/?type=csv|jsonl  every job, streamed."""
+    def get(self, request):
+        file_format = request.query_params.get("type", "csv")
+        if file_format not in FORMATS:
+            return Response({"status": "error", "errors": f"Unsupported type '{file_format}', use csv or jsonl."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        # ASGI reads a sync iterator into a list before sending; give it an async one
+        content = astream_export(file_format) if is_asgi(request) else stream_export(file_format)
+        response = StreamingHttpResponse(content, content_type=FORMATS[file_format])
+        response["Content-Disposition"] = f'attachment; filename="jobs.{file_format}"'
+        return response
+
+
+class JobSearchAPIView(APIView):
+    """
+    GET /jobs/search/?q=&skills=&team=&department=&location=&employment_type=&experience=&is_active=&page=
+    Paginated jobs plus facet counts for every dimension (see create_job.search).
+    """
+    def get(self, request):
+        search = JobSearch(request.query_params)
+        if search.errors:
+            return Response({"status": "error", "errors": search.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = search.filtered(
+            add_job.objects
+            .select_related('teams', 'employments_types', 'posted_by', 'manager', 'hiring_manager')
+            .prefetch_related('hr_team_members', 'skills_required', 'application_counters')
+            .order_by('-created_at')
+        )
+        with_description = description_requested(request)
+        if not with_description:
+            qs = qs.defer('Description')
+        paginator = TenPerPagePagination()
+        page = paginator.paginate_queryset(qs, request)
+        serializer = addjobSerializer(page, many=True, context={'omit_description': not with_description})
+        return paginator.get_paginated_response(
+            {"status": "success", "data": serializer.data, "facets": search.facets()}
+        )
@@ -0,0 +1,101 @@
+"""
+Per-job application counters.
+
+A FormData submission is linked to its add_job when it is saved: an explicit
+job_id / Job_ID code first, then a job whose title matches Role or Role_Type
+(case-insensitive). Its pipeline status (submission_data["status"]) is
+mirrored into FormData.status. FormData.save() then moves the submission
+between JobApplicationCounter rows with F() updates inside the same
+transaction, and create_job.signals takes it off on delete, so job listings
+read the counts directly instead of aggregating over the JSON.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+
+from .models import JobApplicationCounter, add_job
+
+# pipeline status -> key in the counts payload
+STATUS_KEYS = {
+    "Scouting": "scouting",
+    "Ongoing": "in_progress",
+    "Hired": "hired",
+    "Reject": "rejected",
+}
+JOB_CODE_KEYS = ("job_id", "Job_ID")
+TITLE_KEYS = ("Role", "Role_Type")
+
+
+def resolve_job_id(submission_data):
+    """The add_job a submission applies to, or None; one query."""
+    if not isinstance(submission_data, dict):
+        return None
+    codes = [str(submission_data[k]).strip() for k in JOB_CODE_KEYS if submission_data.get(k)]
+    titles = [str(submission_data[k]).strip() for k in TITLE_KEYS if submission_data.get(k)]
+    if not codes and not titles:
+        return None
+
+    q = Q()
+    for code in codes:
+        q |= Q(job_id__iexact=code)
+    for title in titles:
+        q |= Q(title__iexact=title)
+    candidates = list(add_job.objects.filter(q).values_list("pk", "job_id", "title"))
+    for wanted, position in [(code.lower(), 1) for code in codes] + [(title.lower(), 2) for title in titles]:
+        for row in candidates:
+            if row[position].lower() == wanted:
+                return row[0]
+    return None
+
+
+def _bump(job_id, status, delta):
+    updated = JobApplicationCounter.objects.filter(job_id=job_id, status=status).update(count=F("count") + delta)
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            JobApplicationCounter.objects.create(job_id=job_id, status=status, count=delta)
+    except IntegrityError:
+        # created concurrently
+        JobApplicationCounter.objects.filter(job_id=job_id, status=status).update(count=F("count") + delta)
+
+
+def record_transition(before, after):
+    """Move one submission from the (job_id, status) pair `before` to `after`; either may be None."""
+    if before == after:
+        return
+    if before and before[0]:
+        _bump(before[0], before[1], -1)
+    if after and after[0]:
+        _bump(after[0], after[1], 1)
+
+
+def pipeline_counts(job):
+    """Counts for a job; reads the prefetched application_counters when available."""
+    counts = {counter.status: counter.count for counter in job.application_counters.all()}
+    payload = {key: counts.get(status, 0) for status, key in STATUS_KEYS.items()}
+    payload["applications"] = sum(counts.values())
+    return payload
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Link unlinked submissions where possible and recount everything; returns (linked, counter rows)."""
+    from form_data.models import FormData
+
+    linked = 0
+    for form in FormData.objects.filter(job__isnull=True).only("pk", "submission_data").iterator(chunk_size=1000):
+        job_id = resolve_job_id(form.submission_data)
+        if job_id:
+            FormData.objects.filter(pk=form.pk).update(job_id=job_id)
+            linked += 1
+
+    JobApplicationCounter.objects.all().delete()
+    rows = (
+        FormData.objects.filter(job__isnull=False).order_by()
+        .values("job_id", "status").annotate(total=Count("pk"))
+    )
+    counters = JobApplicationCounter.objects.bulk_create(
+        [JobApplicationCounter(job_id=row["job_id"], status=row["status"], count=row["total"]) for row in rows],
+        batch_size=1000,
+    )
+    return linked, len(counters)
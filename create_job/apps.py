@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CreateJobConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'create_job'
+
+    def ready(self):
+        import create_job.signals  # noqa
@@ -0,0 +1,123 @@
+"""
+Bulk job creation in a constant number of queries, whatever the batch size:
+one lookup per related table to validate ids and people (role / creator
+rules as in addjobSerializer), one for existing titles, the job_id range
+from the allocator, one bulk insert for the jobs and one per M2M table.
+"""
+from django.db import transaction
+
+from superadmin.models import UserProfile
+
+from .job_ids import allocate_job_ids
+from .models import Job_types, Skills, Teams, add_job
+from . import careers
+from .search import bump_jobs_version
+from .serializers import addjobBulkRowSerializer, job_relation_errors
+
+MAX_BULK_JOBS = 500
+M2M_FIELDS = ('skills_required', 'hr_team_members')
+
+
+def validate_jobs(rows, start=1):
+    """Returns (validated rows, errors); errors are [{"row": n, "errors": {...}}], numbered from `start`."""
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=start):
+        serializer = addjobBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({"row": number, "errors": serializer.errors})
+
+    def ids(field, many=False):
+        found = set()
+        for _, data in valid:
+            value = data.get(field)
+            if many:
+                found.update(value or [])
+            elif value is not None:
+                found.add(value)
+        return found
+
+    teams = set(Teams.objects.filter(pk__in=ids('teams')).values_list('pk', flat=True))
+    job_types = set(Job_types.objects.filter(pk__in=ids('employments_types')).values_list('pk', flat=True))
+    skills = set(Skills.objects.filter(pk__in=ids('skills_required', many=True)).values_list('pk', flat=True))
+    people = UserProfile.objects.only('id', 'role', 'created_by_manager_id').in_bulk(
+        ids('manager') | ids('hiring_manager') | ids('hr_team_members', many=True)
+    )
+    titles = [data['title'] for _, data in valid]
+    taken = set(add_job.objects.filter(title__in=titles).values_list('title', flat=True))
+
+    seen = {}
+    for number, data in valid:
+        row_errors = {}
+        if data['title'] in taken:
+            row_errors['title'] = "A job with this title already exists."
+        elif data['title'] in seen:
+            row_errors['title'] = f"Duplicate of row {seen[data['title']]}."
+        seen.setdefault(data['title'], number)
+
+        for field, known in (('teams', teams), ('employments_types', job_types)):
+            if data.get(field) is not None and data[field] not in known:
+                row_errors[field] = f"Invalid pk \"{data[field]}\" - object does not exist."
+        missing_skills = set(data.get('skills_required') or []) - skills
+        if missing_skills:
+            row_errors['skills_required'] = f"Invalid IDs: {sorted(missing_skills)}"
+        missing_people = {
+            pk for pk in [data.get('manager'), data.get('hiring_manager'), *(data.get('hr_team_members') or [])]
+            if pk is not None and pk not in people
+        }
+        if missing_people:
+            row_errors['users'] = f"Invalid user IDs: {sorted(missing_people)}"
+        else:
+            hrs = data.get('hr_team_members')
+            relation_errors = job_relation_errors(
+                people.get(data.get('manager')),
+                people.get(data.get('hiring_manager')),
+                [people[pk] for pk in hrs] if hrs is not None else None,
+            )
+            row_errors.update(relation_errors or {})
+
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+
+    errors.sort(key=lambda e: e["row"])
+    return [data for _, data in valid], errors
+
+
+@transaction.atomic
+def create_jobs(rows, posted_by=None):
+    """Insert validated rows (from validate_jobs) with their M2M links; returns the jobs."""
+    job_ids = allocate_job_ids(len(rows))
+    jobs, links = [], []
+    for row, job_id in zip(rows, job_ids):
+        fields = {k: v for k, v in row.items() if k not in M2M_FIELDS}
+        for fk in ('teams', 'employments_types', 'manager', 'hiring_manager'):
+            if fk in fields:
+                fields[f'{fk}_id'] = fields.pop(fk)
+        # fields were validated by addjobBulkRowSerializer, relations by validate_jobs()
+        job = add_job(job_id=job_id, posted_by=posted_by, **fields)
+        job.refresh_description_summary()
+        jobs.append(job)
+        links.append({name: row.get(name) or [] for name in M2M_FIELDS})
+
+    add_job.objects.bulk_create(jobs, batch_size=500)
+    if any(job.pk is None for job in jobs):
+        # backends that cannot return ids from a bulk insert
+        pks = dict(add_job.objects.filter(job_id__in=job_ids).values_list('job_id', 'pk'))
+        for job in jobs:
+            job.pk = pks[job.job_id]
+
+    for name in M2M_FIELDS:
+        field = add_job._meta.get_field(name)
+        through = field.remote_field.through
+        source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+        through.objects.bulk_create([
+            through(**{source: job.pk, target: pk})
+            for job, job_links in zip(jobs, links)
+            for pk in dict.fromkeys(job_links[name])
+        ], batch_size=1000)
+
+    # bulk_create sends no signals
+    transaction.on_commit(bump_jobs_version)
+    transaction.on_commit(careers.regenerate)
+    return jobs
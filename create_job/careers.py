@@ -0,0 +1,128 @@
+"""
+Public careers feed: active jobs for anonymous visitors.
+
+Responses are precomputed snapshots in the cache, holding the encoded JSON
+body, its strong ETag (a hash of the bytes) and the Surrogate-Key header. A
+request is served from one or two cache reads and never touches the database
+unless the snapshot is missing. Any change to a job or to the names it shows
+(team, department, location, job type, skill) bumps CAREERS_VERSION_KEY after
+commit and rebuilds the feed right away (create_job.signals). Per-job
+snapshots, including "not found" ones, are rebuilt lazily under the new
+version.
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import add_job
+
+CAREERS_VERSION_KEY = "careers:version"
+SNAPSHOT_TTL = 60 * 60 * 24
+# browsers revalidate after a minute; shared caches / the CDN keep it longer
+CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+FEED_SURROGATE_KEY = "careers"
+
+
+def job_surrogate_key(pk):
+    return f"careers-job-{pk}"
+
+
+def careers_version():
+    return cache.get_or_set(CAREERS_VERSION_KEY, 1, None)
+
+
+def bump_careers_version():
+    try:
+        return cache.incr(CAREERS_VERSION_KEY)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(CAREERS_VERSION_KEY, version, None)
+        return version
+
+
+# --------------------------
+# Payloads
+# --------------------------
+def public_jobs():
+    return (
+        add_job.objects
+        .filter(is_active=True)
+        .select_related("teams__department_types", "employments_types")
+        .prefetch_related("skills_required", "teams__department_types__Location_types")
+        .order_by("-created_at", "-pk")
+    )
+
+
+def job_payload(job, detail=False):
+    department = job.teams.department_types if job.teams else None
+    payload = {
+        "id": job.pk,
+        "job_id": job.job_id,
+        "title": job.title,
+        "excerpt": job.description_excerpt,
+        "word_count": job.description_words,
+        "salary_range": job.Salary_range,
+        "experience_required": job.Experience_required,
+        "openings": job.no_opening,
+        "last_hiring_date": job.last_hiring_date,
+        "team": job.teams.name if job.teams else None,
+        "department": department.name if department else None,
+        "locations": [location.name for location in department.Location_types.all()] if department else [],
+        "employment_type": job.employments_types.name if job.employments_types else None,
+        "skills": [skill.name for skill in job.skills_required.all()],
+        "posted_at": job.created_at,
+    }
+    if detail:
+        payload["description"] = job.Description
+    return payload
+
+
+def _snapshot(payload, surrogate_key, status=200):
+    body = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    return {
+        "status": status,
+        "body": body,
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "surrogate_key": surrogate_key,
+    }
+
+
+# --------------------------
+# Snapshots
+# --------------------------
+def build_feed(version):
+    jobs = list(public_jobs())
+    snapshot = _snapshot(
+        {"status": "success", "count": len(jobs), "data": [job_payload(job) for job in jobs]},
+        " ".join([FEED_SURROGATE_KEY, *(job_surrogate_key(job.pk) for job in jobs)]),
+    )
+    cache.set(f"careers:feed:{version}", snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def feed_snapshot():
+    version = careers_version()
+    return cache.get(f"careers:feed:{version}") or build_feed(version)
+
+
+def job_snapshot(pk):
+    version = careers_version()
+    key = f"careers:job:{version}:{pk}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        job = public_jobs().filter(pk=pk).first()
+        if job is None:
+            # cached too, so probing unknown ids stays off the database
+            snapshot = _snapshot({"status": "error", "message": "Job not found"}, job_surrogate_key(pk), status=404)
+        else:
+            snapshot = _snapshot({"status": "success", "data": job_payload(job, detail=True)}, job_surrogate_key(pk))
+        cache.set(key, snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def regenerate():
+    """Start a new version and rebuild the feed for it (run after commit)."""
+    build_feed(bump_careers_version())
@@ -0,0 +1,37 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from .careers import CACHE_CONTROL, feed_snapshot, job_snapshot
+
+
+def snapshot_response(request, snapshot):
+    if_none_match = request.headers.get("If-None-Match")
+    if snapshot["status"] == 200 and if_none_match and snapshot["etag"] in parse_etags(if_none_match):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(snapshot["body"], status=snapshot["status"], content_type="application/json")
+    response["ETag"] = snapshot["etag"]
+    response["Cache-Control"] = CACHE_CONTROL
+    response["Surrogate-Key"] = snapshot["surrogate_key"]
+    return response
+
+
+# -------------------- PUBLIC CAREERS API --------------------
+class CareersFeedAPIView(APIView):
+    """GET /careers/jobs/  every active job (public, served from a cached snapshot)."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return snapshot_response(request, feed_snapshot())
+
+
+class CareersJobAPIView(APIView):
+    """GET /careers/jobs/<id>/  one active job with its full description."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk):
+        return snapshot_response(request, job_snapshot(pk))
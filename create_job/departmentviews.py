@@ -13,7 +13,7 @@ class DepartmentAPIView(APIView):
             skill = get_object_or_404(Department, pk=pk)
             serializer = DepartmentSerializer(skill)
         else:
-            skills = Department.objects.all()
+            skills = Department.objects.prefetch_related('Location_types')
             serializer = DepartmentSerializer(skills, many=True)
         return Response({"status": "success", "data": serializer.data})
 
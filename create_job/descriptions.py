@@ -0,0 +1,35 @@
+"""
+Plain-text excerpt and word count of a job's Summernote Description.
+
+add_job.save() (and create_job.bulk for bulk inserts) stores both next to the
+HTML, so list pages can ship a short excerpt instead of the full markup.
+"""
+import html
+import re
+
+from django.utils.html import strip_tags
+
+EXCERPT_LENGTH = 280
+
+# content that never renders as text
+_HIDDEN = re.compile(r"<(script|style|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+# block boundaries become spaces so "</p><p>" does not glue two words together
+_BREAKS = re.compile(r"<\s*(?:br|/p|/div|/li|/h[1-6]|/tr|/td)\b[^>]*>", re.IGNORECASE)
+
+
+def plain_text(markup):
+    text = _HIDDEN.sub(" ", markup or "")
+    text = _BREAKS.sub(" ", text)
+    return " ".join(html.unescape(strip_tags(text)).split())
+
+
+def summarize(markup):
+    """(excerpt of at most EXCERPT_LENGTH characters plus an ellipsis, word count)."""
+    text = plain_text(markup)
+    words = len(text.split())
+    if len(text) > EXCERPT_LENGTH:
+        head = text[:EXCERPT_LENGTH + 1]
+        # cut at the last whole word unless that leaves almost nothing
+        cut = head.rsplit(" ", 1)[0] if " " in head[EXCERPT_LENGTH // 2:] else head[:EXCERPT_LENGTH]
+        text = cut.rstrip(" ,.;:-") + "…"
+    return text, words
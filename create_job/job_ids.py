@@ -0,0 +1,55 @@
+"""
+job_id allocation (GXI1001, GXI1002, ...) from the JobIdCounter row.
+
+allocate_job_ids(n) reserves a contiguous range with one UPDATE, which holds
+the row lock until the surrounding transaction ends: concurrent creators
+queue behind it instead of reading the same "last job" and colliding on the
+unique constraint, and a rollback returns the range. Call it inside the
+transaction that inserts the jobs.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import JobIdCounter, add_job
+
+JOB_ID_PREFIX = "GXI"
+JOB_ID_COUNTER = "add_job"
+FIRST_JOB_NUMBER = 1001
+
+JOB_NUMBER_RE = re.compile(rf"^{JOB_ID_PREFIX}(\d+)$")
+
+
+def format_job_id(number):
+    return f"{JOB_ID_PREFIX}{number}"
+
+
+def next_free_number(job_ids):
+    """First number after the highest GXI<n> in `job_ids`."""
+    numbers = [int(m.group(1)) for m in map(JOB_NUMBER_RE.match, job_ids) if m]
+    return max(numbers, default=FIRST_JOB_NUMBER - 1) + 1
+
+
+def _seed_counter():
+    # first allocation on this database: start after the highest existing job_id
+    start = next_free_number(add_job.objects.values_list("job_id", flat=True).iterator())
+    try:
+        with transaction.atomic():
+            JobIdCounter.objects.create(name=JOB_ID_COUNTER, next_value=start)
+    except IntegrityError:
+        # seeded concurrently
+        pass
+
+
+@transaction.atomic
+def allocate_job_ids(count):
+    """Reserve `count` consecutive job_ids; returns them as strings."""
+    if count < 1:
+        return []
+    counter = JobIdCounter.objects.filter(name=JOB_ID_COUNTER)
+    if not counter.update(next_value=F("next_value") + count):
+        _seed_counter()
+        counter.update(next_value=F("next_value") + count)
+    end = counter.values_list("next_value", flat=True).get()
+    return [format_job_id(number) for number in range(end - count, end)]
@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from create_job.matching import RATING_SCALE, MatchIndex
+
+
+class Command(BaseCommand):
+    help = ("Score synthetic candidates against random jobs with the matching index "
+            "(in memory, no database) and report build time, memory and latency.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidates", type=int, default=1_000_000)
+        parser.add_argument("--skills", type=int, default=60, help="Distinct skills in the vocabulary")
+        parser.add_argument("--per-candidate", type=int, default=6, help="Skills per candidate")
+        parser.add_argument("--required", type=int, default=5, help="Skills required per job")
+        parser.add_argument("--jobs", type=int, default=20, help="Jobs to score")
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        n, vocabulary, per = options["candidates"], options["skills"], options["per_candidate"]
+
+        started = time.perf_counter()
+        rows = np.repeat(np.arange(n, dtype=np.int32), per)
+        skills = rng.integers(0, vocabulary, size=n * per)
+        # one entry per (candidate, skill)
+        keys = np.unique(rows.astype(np.int64) * vocabulary + skills)
+        rows, skills = (keys // vocabulary).astype(np.int32), keys % vocabulary
+        ratings = rng.integers(0, RATING_SCALE + 1, size=len(keys), dtype=np.uint8)
+        order = np.argsort(skills, kind="stable")
+        bounds = np.searchsorted(skills[order], np.arange(vocabulary + 1))
+        columns = {
+            f"skill {s}": (rows[order[bounds[s]:bounds[s + 1]]], ratings[order[bounds[s]:bounds[s + 1]]])
+            for s in range(vocabulary)
+        }
+        index = MatchIndex.from_columns(np.arange(1, n + 1), columns)
+        built = time.perf_counter() - started
+
+        timings, counts = [], []
+        for _ in range(options["jobs"]):
+            required = [f"skill {s}" for s in rng.choice(vocabulary, size=options["required"], replace=False)]
+            started = time.perf_counter()
+            _, count = index.score(required, limit=options["limit"])
+            timings.append(time.perf_counter() - started)
+            counts.append(count)
+
+        timings_ms = np.array(timings) * 1000
+        self.stdout.write(f"{n:,} candidates, {len(keys):,} skill entries, {vocabulary} skills")
+        self.stdout.write(f"index built in {built:.2f}s, {index.nbytes / 2 ** 20:.1f} MiB")
+        self.stdout.write(
+            f"{options['jobs']} jobs x {options['required']} required skills: "
+            f"p50 {np.percentile(timings_ms, 50):.1f} ms, p95 {np.percentile(timings_ms, 95):.1f} ms, "
+            f"max {timings_ms.max():.1f} ms; {int(np.mean(counts)):,} candidates matched per job on average"
+        )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from create_job.applications import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = ("Link submissions that have no job yet (by job code or Role / Role_Type title) "
+            "and recompute the per-job application counters.")
+
+    def handle(self, *args, **options):
+        linked, rows = rebuild_counters()
+        self.stdout.write(f"Linked {linked} submissions; {rows} counter rows rebuilt")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from create_job.matching import rebuild_profiles
+
+
+class Command(BaseCommand):
+    help = "Re-extract every CandidateSkillProfile from the form submissions and Typeform responses."
+
+    def handle(self, *args, **options):
+        rows = rebuild_profiles()
+        self.stdout.write(f"Candidate skill profiles rebuilt: {rows} rows")
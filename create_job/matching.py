@@ -0,0 +1,314 @@
+"""
+Candidate-to-job matching.
+
+Extraction: profile_from_form() and profile_from_typeform() pull skill names
+and 0-5 ratings out of a FormData submission (Skills / Tech_Experience) or a
+Typeform response (the Skills / Maths_Skills answers) into a
+CandidateSkillProfile row. create_job.signals refreshes the row whenever its
+source is saved, so the raw JSON is parsed once per submission.
+
+Scoring: MatchIndex holds the profiles as a sparse candidates x skills matrix
+stored column by column: per skill, a NumPy array of candidate rows and one of
+uint8 ratings. Scoring a job reads only its required skills' columns:
+
+    score = 100 * sum(WEIGHTS[rating] for each required skill) / len(required)
+
+Each process keeps one index and, on every call, applies the profiles changed
+since it last synced (one query on the updated_at index). A changed profile
+gets a new row and its old row is masked out; deletions bump
+MATCH_VERSION_KEY, which makes every process rebuild from scratch.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CandidateSkillProfile
+
+MATCH_VERSION_KEY = "candidate_match:version"
+
+RATING_SCALE = 5
+UNRATED = 0
+# score contribution by rating; a skill listed without a rating counts as a 3/5
+WEIGHTS = np.array([0.6, 0.2, 0.4, 0.6, 0.8, 1.0], dtype=np.float32)
+
+# rows committed slightly after a sync started still carry an earlier updated_at
+SYNC_OVERLAP = timedelta(seconds=30)
+
+SKILL_SECTIONS = ("Skills", "Maths_Skills")
+RATE_SUFFIX = "_rate"
+SKILL_ALIASES = {
+    "r language": "r",
+    "rave developer": "rave",
+}
+NEGATIVE = {"no", "false", "0", "none", ""}
+
+
+# --------------------------
+# Extraction
+# --------------------------
+def normalize_skill(name):
+    key = " ".join(str(name).replace("_", " ").lower().split())
+    return SKILL_ALIASES.get(key, key)
+
+
+def _rating(value):
+    try:
+        return min(max(int(float(value)), 0), RATING_SCALE)
+    except (TypeError, ValueError):
+        return UNRATED
+
+
+def _has(value):
+    if isinstance(value, (list, dict)):
+        return bool(value)
+    return value is not None and str(value).strip().lower() not in NEGATIVE
+
+
+def profile_from_form(form):
+    """{name, email, skills} from a FormData submission."""
+    data = form.submission_data if isinstance(form.submission_data, dict) else {}
+    skills = {}
+    for name in data.get("Skills") or []:
+        if isinstance(name, str) and name.strip():
+            skills.setdefault(normalize_skill(name), UNRATED)
+
+    tech = data.get("Tech_Experience")
+    for name, info in (tech.items() if isinstance(tech, dict) else []):
+        info = info if isinstance(info, dict) else {"rating": info}
+        if not _has(info.get("experience", "yes")):
+            continue
+        key = normalize_skill(name)
+        skills[key] = max(skills.get(key, UNRATED), _rating(info.get("rating")))
+
+    return {
+        "name": str(data.get("Name") or "")[:255],
+        "email": str(data.get("Email") or form.candidate_email or "")[:255],
+        "skills": skills,
+    }
+
+
+def profile_from_typeform(answer):
+    """{name, email, skills} from a TypeformAnswer ("python" + "python_rate" pairs)."""
+    from google_sheet.views import map_answers_grouped
+
+    grouped = map_answers_grouped(answer.answers or [])
+    present, ratings = {}, {}
+    for section in SKILL_SECTIONS:
+        for entry in grouped.get(section, []):
+            for key, value in entry.items():
+                if key.endswith(RATE_SUFFIX):
+                    ratings[key[:-len(RATE_SUFFIX)]] = _rating(value)
+                else:
+                    present[key] = _has(value)
+
+    skills = {}
+    for key in present.keys() | ratings.keys():
+        has, rating = present.get(key), ratings.get(key, UNRATED)
+        # an explicit "No" wins over a stray rating
+        if has or (has is None and rating):
+            skills[normalize_skill(key)] = rating
+
+    personal = {key: value for entry in grouped.get("Personal_details", []) for key, value in entry.items()}
+    name = " ".join(str(personal.get(key) or "").strip() for key in ("first_name", "last_name")).strip()
+    return {"name": name[:255], "email": str(personal.get("email") or "")[:255], "skills": skills}
+
+
+EXTRACTORS = {
+    CandidateSkillProfile.SOURCE_FORM: profile_from_form,
+    CandidateSkillProfile.SOURCE_TYPEFORM: profile_from_typeform,
+}
+
+
+def refresh_profile(source, instance):
+    """Re-extract `instance`'s profile; writes (and so re-indexes) only if something changed."""
+    fields = EXTRACTORS[source](instance)
+    profile = CandidateSkillProfile.objects.filter(source=source, source_id=instance.pk).first()
+    if profile is None:
+        CandidateSkillProfile.objects.create(source=source, source_id=instance.pk, **fields)
+    elif any(getattr(profile, name) != value for name, value in fields.items()):
+        for name, value in fields.items():
+            setattr(profile, name, value)
+        profile.save()
+
+
+def remove_profile(source, source_id):
+    deleted, _ = CandidateSkillProfile.objects.filter(source=source, source_id=source_id).delete()
+    if deleted:
+        transaction.on_commit(bump_match_version)
+
+
+@transaction.atomic
+def rebuild_profiles():
+    """Re-extract every profile from its source (backfill, or after changing the extractors)."""
+    from form_data.models import FormData
+    from google_sheet.models import TypeformAnswer
+
+    CandidateSkillProfile.objects.all().delete()
+    total = 0
+    for source, queryset in (
+        (CandidateSkillProfile.SOURCE_FORM, FormData.objects.order_by("pk")),
+        (CandidateSkillProfile.SOURCE_TYPEFORM, TypeformAnswer.objects.order_by("pk")),
+    ):
+        extract = EXTRACTORS[source]
+        batch = []
+        for instance in queryset.iterator(chunk_size=2000):
+            batch.append(CandidateSkillProfile(source=source, source_id=instance.pk, **extract(instance)))
+            if len(batch) >= 2000:
+                total += len(CandidateSkillProfile.objects.bulk_create(batch))
+                batch = []
+        total += len(CandidateSkillProfile.objects.bulk_create(batch))
+    transaction.on_commit(bump_match_version)
+    return total
+
+
+# --------------------------
+# Index
+# --------------------------
+def match_version():
+    return cache.get_or_set(MATCH_VERSION_KEY, 1, None)
+
+
+def bump_match_version():
+    try:
+        cache.incr(MATCH_VERSION_KEY)
+    except ValueError:
+        cache.set(MATCH_VERSION_KEY, int(time.time() * 1000), None)
+
+
+class MatchIndex:
+    def __init__(self, version=None):
+        self.version = version
+        self.synced_at = None
+        self.profile_ids = np.empty(0, dtype=np.int64)
+        self.alive = np.empty(0, dtype=bool)
+        self.columns = {}   # skill -> (rows int32, ratings uint8)
+        self.row_of = {}    # profile id -> its current row
+        self.stamp = {}     # profile id -> updated_at of the indexed version
+        self.dead = 0
+
+    @classmethod
+    def from_columns(cls, profile_ids, columns):
+        """Index over prebuilt arrays (bulk loads and benchmarks)."""
+        index = cls()
+        index.profile_ids = np.asarray(profile_ids, dtype=np.int64)
+        index.alive = np.ones(len(index.profile_ids), dtype=bool)
+        index.columns = {
+            skill: (np.asarray(rows, dtype=np.int32), np.asarray(ratings, dtype=np.uint8))
+            for skill, (rows, ratings) in columns.items()
+        }
+        return index
+
+    @property
+    def live(self):
+        return len(self.profile_ids) - self.dead
+
+    @property
+    def nbytes(self):
+        return (self.profile_ids.nbytes + self.alive.nbytes
+                + sum(rows.nbytes + ratings.nbytes for rows, ratings in self.columns.values()))
+
+    def add(self, profiles):
+        """Index (id, skills, updated_at) triples; a re-added profile replaces its old row."""
+        start = len(self.profile_ids)
+        ids, dead = [], []
+        pending = defaultdict(lambda: ([], []))
+        for profile_id, skills, updated_at in profiles:
+            if self.stamp.get(profile_id) == updated_at:
+                continue
+            old = self.row_of.get(profile_id)
+            if old is not None:
+                dead.append(old)
+            row = start + len(ids)
+            ids.append(profile_id)
+            self.row_of[profile_id] = row
+            self.stamp[profile_id] = updated_at
+            for skill, rating in skills.items():
+                rows, ratings = pending[skill]
+                rows.append(row)
+                ratings.append(min(max(int(rating), 0), RATING_SCALE))
+        if not ids:
+            return 0
+
+        self.profile_ids = np.concatenate([self.profile_ids, np.array(ids, dtype=np.int64)])
+        self.alive = np.concatenate([self.alive, np.ones(len(ids), dtype=bool)])
+        if dead:
+            self.alive[dead] = False
+            self.dead += len(dead)
+        for skill, (rows, ratings) in pending.items():
+            rows, ratings = np.array(rows, dtype=np.int32), np.array(ratings, dtype=np.uint8)
+            if skill in self.columns:
+                old_rows, old_ratings = self.columns[skill]
+                rows, ratings = np.concatenate([old_rows, rows]), np.concatenate([old_ratings, ratings])
+            self.columns[skill] = (rows, ratings)
+        return len(ids)
+
+    def score(self, required, limit=50, min_score=0):
+        """
+        ([(profile_id, score, matched), ...] best first, number of candidates
+        matching at least one required skill and scoring >= min_score).
+        """
+        required = list(dict.fromkeys(required))
+        size = len(self.profile_ids)
+        if not required or not size:
+            return [], 0
+
+        total = np.zeros(size, dtype=np.float32)
+        matched = np.zeros(size, dtype=np.uint8)
+        for skill in required:
+            column = self.columns.get(skill)
+            if column is None:
+                continue
+            rows, ratings = column
+            # a candidate appears at most once per column, so fancy-index += is safe
+            total[rows] += WEIGHTS[ratings]
+            matched[rows] += 1
+        scores = total * np.float32(100.0 / len(required))
+
+        eligible = (matched > 0) & self.alive
+        if min_score:
+            eligible &= scores >= min_score
+        rows = np.flatnonzero(eligible)
+        count = len(rows)
+        if count > limit:
+            rows = rows[np.argpartition(-scores[rows], limit - 1)[:limit]]
+        rows = rows[np.lexsort((self.profile_ids[rows], -scores[rows]))]
+        return [(int(self.profile_ids[r]), round(float(scores[r]), 1), int(matched[r])) for r in rows], count
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _synced_index():
+    """This process's index, caught up with the database. Call with _index_lock held."""
+    global _index
+    version = match_version()
+    index = _index
+    if index is None or index.version != version or index.dead > index.live:
+        index = MatchIndex(version)
+    started = timezone.now()
+    profiles = CandidateSkillProfile.objects.order_by()
+    if index.synced_at:
+        profiles = profiles.filter(updated_at__gte=index.synced_at - SYNC_OVERLAP)
+    index.add(profiles.values_list("id", "skills", "updated_at").iterator(chunk_size=5000))
+    index.synced_at = started
+    _index = index
+    return index
+
+
+def match_candidates(required, limit=50, min_score=0):
+    """Score every indexed candidate against `required` (normalized skill names)."""
+    with _index_lock:
+        return _synced_index().score(required, limit=limit, min_score=min_score)
+
+
+def clear_local_index():
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,60 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .matching import match_candidates, normalize_skill
+from .models import CandidateSkillProfile, add_job
+
+MAX_MATCHES = 500
+
+
+# -------------------- JOB MATCHES API --------------------
+class JobMatchesAPIView(APIView):
+    """
+    GET /jobs/<id>/matches/?limit=50&min_score=0
+    Candidates ranked by how well their skills and self-ratings cover the
+    job's skills_required (see create_job.matching for the score).
+    """
+    def get(self, request, pk):
+        job = get_object_or_404(add_job, pk=pk)
+
+        try:
+            limit = int(request.query_params.get("limit", 50))
+            min_score = float(request.query_params.get("min_score", 0))
+        except ValueError:
+            return Response({"status": "error", "message": "limit and min_score must be numbers"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= MAX_MATCHES:
+            return Response({"status": "error", "message": f"limit must be between 1 and {MAX_MATCHES}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # normalized name -> name as the job shows it
+        required = {normalize_skill(name): name for name in job.skills_required.values_list("name", flat=True)}
+        results, count = match_candidates(list(required), limit=limit, min_score=min_score) if required else ([], 0)
+
+        profiles = CandidateSkillProfile.objects.in_bulk([profile_id for profile_id, _, _ in results])
+        data = []
+        for profile_id, score, matched in results:
+            profile = profiles.get(profile_id)
+            if profile is None:
+                # deleted since the index last synced
+                continue
+            data.append({
+                "profile_id": profile_id,
+                "source": profile.source,
+                "source_id": profile.source_id,
+                "name": profile.name,
+                "email": profile.email,
+                "score": score,
+                "matched": matched,
+                "skills": {label: profile.skills[key] for key, label in required.items() if key in profile.skills},
+            })
+
+        return Response({
+            "status": "success",
+            "job_id": job.pk,
+            "required_skills": list(required.values()),
+            "count": count,
+            "data": data,
+        })
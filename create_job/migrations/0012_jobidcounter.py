@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:08
+
+import re
+
+from django.db import migrations, models
+
+
+def seed_counter(apps, schema_editor):
+    add_job = apps.get_model('create_job', 'add_job')
+    JobIdCounter = apps.get_model('create_job', 'JobIdCounter')
+    numbers = [
+        int(m.group(1))
+        for m in (re.match(r'^GXI(\d+)$', job_id or '') for job_id in add_job.objects.values_list('job_id', flat=True))
+        if m
+    ]
+    JobIdCounter.objects.create(name='add_job', next_value=max(numbers, default=1000) + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0011_alter_add_job_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobIdCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('next_value', models.PositiveBigIntegerField()),
+            ],
+            options={
+                'db_table': 'job_id_counter',
+            },
+        ),
+        migrations.RunPython(seed_counter, migrations.RunPython.noop),
+    ]
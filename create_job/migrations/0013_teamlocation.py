@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    Teams = apps.get_model('create_job', 'Teams')
+    TeamLocation = apps.get_model('create_job', 'TeamLocation')
+    Through = apps.get_model('create_job', 'Department').Location_types.through
+    locations = {}
+    for department_id, location_id, name in Through.objects.values_list(
+        'department_id', 'location_id', 'location__name'
+    ):
+        locations.setdefault(department_id, []).append((location_id, name))
+    TeamLocation.objects.bulk_create([
+        TeamLocation(team_id=team_id, location_id=location_id, location_name=name.lower())
+        for team_id, department_id in Teams.objects.values_list('id', 'department_types_id')
+        for location_id, name in locations.get(department_id, [])
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0012_jobidcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location_name', models.CharField(max_length=100)),
+                ('location', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='team_links', to='create_job.location')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_links', to='create_job.teams')),
+            ],
+            options={
+                'db_table': 'team_locations',
+                'indexes': [models.Index(fields=['location_name'], name='team_loc_name_prefix_idx', opclasses=['varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('location', 'team'), name='team_location_unique')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
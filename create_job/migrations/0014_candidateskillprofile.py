@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0013_teamlocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSkillProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('form', 'Form submission'), ('typeform', 'Typeform response')], max_length=10)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('email', models.CharField(blank=True, default='', max_length=255)),
+                ('skills', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'candidate_skill_profiles',
+                'constraints': [models.UniqueConstraint(fields=('source', 'source_id'), name='candidate_profile_source_unique')],
+            },
+        ),
+    ]
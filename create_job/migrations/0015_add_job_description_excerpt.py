@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+from create_job.descriptions import summarize
+
+
+def backfill(apps, schema_editor):
+    add_job = apps.get_model('create_job', 'add_job')
+    jobs = []
+    for job in add_job.objects.only('id', 'Description').iterator(chunk_size=500):
+        job.description_excerpt, job.description_words = summarize(job.Description)
+        jobs.append(job)
+        if len(jobs) >= 500:
+            add_job.objects.bulk_update(jobs, ['description_excerpt', 'description_words'])
+            jobs = []
+    add_job.objects.bulk_update(jobs, ['description_excerpt', 'description_words'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0014_candidateskillprofile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='add_job',
+            name='description_excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='add_job',
+            name='description_words',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
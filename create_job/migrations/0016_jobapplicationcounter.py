@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0015_add_job_description_excerpt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='application_counters', to='create_job.add_job')),
+            ],
+            options={
+                'db_table': 'job_application_counters',
+                'constraints': [models.UniqueConstraint(fields=('job', 'status'), name='job_application_counter_unique')],
+            },
+        ),
+    ]
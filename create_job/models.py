@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from superadmin.models import UserProfile  # just for role constants
 
+from .descriptions import summarize as summarize_description
+
 
 # Optional reusable timestamp mixin (left as-is per your code)
 class TimeStampedModel(models.Model):
@@ -87,6 +89,9 @@ class add_job(TimeStampedModel):
     title = models.CharField(max_length=255,  unique=True,db_index=True)
     job_id = models.CharField(max_length=20, unique=True, db_index=True, editable=False)
     Description = models.TextField()
+    # plain-text summary of Description for list pages, kept by save() / create_job.bulk
+    description_excerpt = models.CharField(max_length=300, blank=True, default='', editable=False)
+    description_words = models.PositiveIntegerField(default=0, editable=False)
     Salary_range = models.CharField(max_length=100, db_index=True)
     Experience_required = models.CharField(max_length=100, db_index=True)
     no_opening = models.PositiveIntegerField(validators=[MinValueValidator(1)], db_index=True)
@@ -127,22 +132,28 @@ class add_job(TimeStampedModel):
     #         raise ValidationError(errors)
 
 
+    def refresh_description_summary(self):
+        self.description_excerpt, self.description_words = summarize_description(self.Description)
+
     def save(self, *args, **kwargs):
-        if not self.job_id:
-            last_job = add_job.objects.all().order_by('-id').first()
-            if last_job and last_job.job_id:
-                try:
-                    last_number = int(last_job.job_id.replace('GXI', ''))
-                except ValueError:
-                    last_number = 1000
-                new_number = last_number + 1
-            else:
-                new_number = 1001
-
-            self.job_id = f"GXI{new_number}"
-
-        self.full_clean()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'Description' in update_fields:
+            self.refresh_description_summary()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'description_excerpt', 'description_words'}
+
+        # allocate inside the insert's transaction: a rolled-back save hands its number back
+        with transaction.atomic(using=kwargs.get('using')):
+            if not self.job_id:
+                from .job_ids import allocate_job_ids
+                self.job_id = allocate_job_ids(1)[0]
+
+            # uniqueness (title, job_id) and FK existence are left to the database constraints
+            self.full_clean(
+                exclude=[f.name for f in self._meta.concrete_fields if f.is_relation],
+                validate_unique=False, validate_constraints=False,
+            )
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} ({self.job_id})"
@@ -163,3 +174,98 @@ class add_job(TimeStampedModel):
         constraints = [
             models.UniqueConstraint(fields=['job_id'], name='unique_job_id_constraint'),
         ]
+
+
+class JobIdCounter(models.Model):
+    """
+    Next job number per sequence name ("add_job" -> GXI<n>). Allocation bumps
+    the row in the caller's transaction, so numbers are gap-free and two
+    concurrent creations serialize on the row lock instead of colliding.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    next_value = models.PositiveBigIntegerField()
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+    class Meta:
+        db_table = 'job_id_counter'
+
+
+class TeamLocation(models.Model):
+    """
+    Teams x their department's Location_types, flattened so filtering teams by
+    location is one indexed lookup instead of Teams -> Departments -> M2M ->
+    locations plus DISTINCT. Kept in step by create_job.signals
+    (see create_job.team_locations); location_name is the lowercased name.
+    """
+    team = models.ForeignKey(Teams, on_delete=models.CASCADE, related_name='location_links')
+    # covered by the (location, team) unique index
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='team_links', db_index=False)
+    location_name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f"{self.team_id} @ {self.location_name}"
+
+    class Meta:
+        db_table = 'team_locations'
+        constraints = [
+            models.UniqueConstraint(fields=['location', 'team'], name='team_location_unique'),
+        ]
+        indexes = [
+            # LIKE 'prefix%' needs the pattern opclass on Postgres outside the C locale
+            models.Index(fields=['location_name'], name='team_loc_name_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+
+class CandidateSkillProfile(models.Model):
+    """
+    A candidate's skills and 0-5 self-ratings, extracted once from their
+    FormData submission or Typeform response so matching never re-parses the
+    raw JSON. `skills` maps the normalized skill name to the rating (0 means
+    listed without a rating). Refreshed by create_job.signals on every save of
+    the source; see create_job.matching.
+    """
+    SOURCE_FORM = 'form'
+    SOURCE_TYPEFORM = 'typeform'
+    SOURCE_CHOICES = [
+        (SOURCE_FORM, 'Form submission'),
+        (SOURCE_TYPEFORM, 'Typeform response'),
+    ]
+
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+    name = models.CharField(max_length=255, blank=True, default='')
+    email = models.CharField(max_length=255, blank=True, default='')
+    skills = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.source}:{self.source_id} ({len(self.skills)} skills)"
+
+    class Meta:
+        db_table = 'candidate_skill_profiles'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'source_id'], name='candidate_profile_source_unique'),
+        ]
+
+
+class JobApplicationCounter(models.Model):
+    """
+    Submissions per job and pipeline status, kept by FormData.save() and
+    create_job.signals in the same transaction as the submission itself
+    (see create_job.applications).
+    """
+    # the (job, status) unique constraint below already indexes job_id first
+    job = models.ForeignKey(add_job, on_delete=models.CASCADE, related_name='application_counters', db_index=False)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id} {self.status}: {self.count}"
+
+    class Meta:
+        db_table = 'job_application_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'status'], name='job_application_counter_unique'),
+        ]
@@ -0,0 +1,59 @@
+"""
+Reference-data bundle: every create_job lookup (locations, skills, job types,
+departments with their locations, teams) in one response.
+
+The serialized bundle is cached under the current version and the version is
+the ETag, so a client that sends If-None-Match gets a 304 from a single cache
+read. Any change to a lookup table bumps the version after its transaction
+commits (create_job.signals); the next request rebuilds the bundle once.
+"""
+import time
+
+from django.core.cache import cache
+
+from .models import Department, Job_types, Location, Skills, Teams
+from .serializers import (
+    DepartmentSerializer, Job_typesSerializer, LocationSerializer, SkillsSerializer, TeamSerializer,
+)
+
+REFERENCE_VERSION_KEY = "reference_bundle:version"
+BUNDLE_TTL = 60 * 60 * 24  # old versions just age out
+
+
+def reference_version():
+    return cache.get_or_set(REFERENCE_VERSION_KEY, 1, None)
+
+
+def bump_reference_version():
+    try:
+        cache.incr(REFERENCE_VERSION_KEY)
+    except ValueError:
+        # evicted: restart from a value no old ETag can have used
+        cache.set(REFERENCE_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def reference_etag(version):
+    return f'"reference-{version}"'
+
+
+def build_bundle():
+    return {
+        "locations": LocationSerializer(Location.objects.order_by("id"), many=True).data,
+        "skills": SkillsSerializer(Skills.objects.order_by("id"), many=True).data,
+        "job_types": Job_typesSerializer(Job_types.objects.order_by("id"), many=True).data,
+        "departments": DepartmentSerializer(
+            Department.objects.prefetch_related("Location_types").order_by("id"), many=True
+        ).data,
+        "teams": TeamSerializer(Teams.objects.order_by("id"), many=True).data,
+    }
+
+
+def get_bundle(version=None):
+    """(version, bundle) for the current version, building it on a miss."""
+    version = version or reference_version()
+    key = f"reference_bundle:{version}"
+    bundle = cache.get(key)
+    if bundle is None:
+        bundle = build_bundle()
+        cache.set(key, bundle, BUNDLE_TTL)
+    return version, bundle
@@ -0,0 +1,31 @@
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .reference import get_bundle, reference_etag, reference_version
+
+
+# -------------------- REFERENCE BUNDLE API --------------------
+class ReferenceBundleAPIView(APIView):
+    """
+    GET /reference-bundle/
+    Locations, skills, job types, departments and teams in one response.
+    Send the returned ETag back as If-None-Match to get a 304 while nothing changed.
+    """
+    def get(self, request):
+        version = reference_version()
+        etag = reference_etag(version)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in parse_etags(if_none_match)):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            _, bundle = get_bundle(version)
+            response = Response({"status": "success", "version": version, "data": bundle})
+
+        response["ETag"] = etag
+        # cacheable by the browser, but revalidated on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
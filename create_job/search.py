@@ -0,0 +1,152 @@
+"""
+Faceted job search.
+
+JobSearch parses the query string into one Q per dimension. The result list
+applies all of them; each dimension's facet counts apply all the others
+(so picking one team still shows how many jobs every other team has). All
+facets are computed in a single statement: one grouped SELECT per dimension,
+combined with UNION ALL. Counts are cached per filter signature and dropped
+together by bumping a version whenever a job, its skills or the team /
+department / location data changes (create_job.signals).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, Q, Value
+from django.db.models.functions import Cast
+
+from .models import Department, add_job
+
+JOBS_VERSION_KEY = "job_search:version"
+FACETS_TTL = 300
+
+# dimension -> (group-by value, label, list filter lookup)
+FACETS = {
+    "skills": ("skills_required__id", "skills_required__name", None),
+    "team": ("teams_id", "teams__name", "teams_id__in"),
+    "department": ("teams__department_types_id", "teams__department_types__name", "teams__department_types_id__in"),
+    "location": ("teams__department_types__Location_types__id", "teams__department_types__Location_types__name", None),
+    "employment_type": ("employments_types_id", "employments_types__name", "employments_types_id__in"),
+    "experience": ("Experience_required", "Experience_required", "Experience_required__in"),
+    "is_active": ("is_active", "is_active", "is_active"),
+}
+ID_FACETS = {"skills", "team", "department", "location", "employment_type"}
+
+
+def jobs_version():
+    return cache.get_or_set(JOBS_VERSION_KEY, 1, None)
+
+
+def bump_jobs_version():
+    """Invalidates every cached facet count at once."""
+    try:
+        cache.incr(JOBS_VERSION_KEY)
+    except ValueError:
+        # evicted: restart from a value no old cache key can have used
+        cache.set(JOBS_VERSION_KEY, int(time.time() * 1000), None)
+
+
+class JobSearch:
+    """
+    ?q=python backend&skills=1,2&team=3&department=4&location=5&employment_type=1
+     &experience=3 years&is_active=true
+
+    Several values in one dimension match any of them; dimensions combine with AND.
+    """
+
+    def __init__(self, params):
+        self.text = " ".join(params.get("q", "").split())
+        self.selected = {}
+        self.errors = {}
+        for dim in FACETS:
+            raw = params.get(dim)
+            if raw in (None, ""):
+                continue
+            if dim == "is_active":
+                if raw.lower() not in ("true", "false"):
+                    self.errors[dim] = "Must be true or false."
+                    continue
+                self.selected[dim] = [raw.lower() == "true"]
+                continue
+            values = [v.strip() for v in raw.split(",") if v.strip()]
+            if dim in ID_FACETS and not all(v.isdigit() for v in values):
+                self.errors[dim] = "Must be a comma-separated list of ids."
+                continue
+            self.selected[dim] = [int(v) for v in values] if dim in ID_FACETS else values
+
+    @property
+    def signature(self):
+        parts = [f"q={self.text.lower()}"] + [
+            f"{dim}={','.join(sorted(map(str, values)))}" for dim, values in sorted(self.selected.items())
+        ]
+        return hashlib.sha1("&".join(parts).encode()).hexdigest()
+
+    # --------------------------
+    # Filters
+    # --------------------------
+    def text_q(self):
+        q = Q()
+        for word in self.text.split():
+            q &= Q(title__icontains=word) | Q(Description__icontains=word)
+        return q
+
+    @staticmethod
+    def dimension_q(dim, values):
+        # M2M dimensions go through subqueries so the list never joins (and duplicates) rows
+        if dim == "skills":
+            through = add_job.skills_required.through
+            return Q(pk__in=through.objects.filter(skills_id__in=values).values("add_job_id"))
+        if dim == "location":
+            through = Department.Location_types.through
+            return Q(teams__department_types_id__in=through.objects.filter(location_id__in=values).values("department_id"))
+        if dim == "is_active":
+            return Q(is_active=values[0])
+        return Q(**{FACETS[dim][2]: values})
+
+    def filtered(self, queryset, skip=None):
+        queryset = queryset.filter(self.text_q())
+        for dim, values in self.selected.items():
+            if dim != skip:
+                queryset = queryset.filter(self.dimension_q(dim, values))
+        return queryset
+
+    # --------------------------
+    # Facets
+    # --------------------------
+    def facet_query(self):
+        """One grouped SELECT per dimension, UNION ALL'd into a single statement."""
+        parts = []
+        for dim, (value, label, _) in FACETS.items():
+            parts.append(
+                self.filtered(add_job.objects.all(), skip=dim)
+                .order_by()
+                .filter(**{f"{value}__isnull": False})
+                .values(
+                    dim=Value(dim, output_field=CharField()),
+                    value=Cast(F(value), CharField()),
+                    label=Cast(F(label), CharField()),
+                )
+                .annotate(count=Count("pk", distinct=True))
+            )
+        return parts[0].union(*parts[1:], all=True)
+
+    def facets(self):
+        key = f"job_facets:{jobs_version()}:{self.signature}"
+        facets = cache.get(key)
+        if facets is None:
+            facets = {dim: [] for dim in FACETS}
+            for row in self.facet_query():
+                value = row["value"]
+                if row["dim"] in ID_FACETS:
+                    value = int(value)
+                label = row["label"]
+                if row["dim"] == "is_active":
+                    # booleans cast to text as '1'/'0' or 'true'/'false' depending on the backend
+                    value = value.lower() in ("1", "true")
+                    label = "true" if value else "false"
+                facets[row["dim"]].append({"value": value, "label": label, "count": row["count"]})
+            for entries in facets.values():
+                entries.sort(key=lambda e: (-e["count"], str(e["label"])))
+            cache.set(key, facets, FACETS_TTL)
+        return facets
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.db import transaction
 from rest_framework import serializers
 
+from .applications import pipeline_counts
 from .models import Skills, Department, Job_types, Location, Teams, add_job
 from superadmin.models import UserProfile  # role constants
 
@@ -116,6 +117,26 @@ class LiteUserSerializer(serializers.ModelSerializer):
 
 
 # ---------- add_job ----------
+def job_relation_errors(manager, hiring_manager, hrs):
+    """Role / creator rules for a job's people; {field: message} for the first problem, else None."""
+    if manager and getattr(manager, 'role', None) != UserProfile.ROLE_MANAGER:
+        return {"manager": "Selected user is not a Manager."}
+
+    if hiring_manager:
+        if getattr(hiring_manager, 'role', None) != UserProfile.Hiring_Manager:
+            return {"hiring_manager": "Selected user is not a HiringManager."}
+        if manager and getattr(hiring_manager, 'created_by_manager_id', None) != manager.id:
+            return {"hiring_manager": "HiringManager must be created by the selected Manager."}
+
+    if hrs is not None:
+        for hr in hrs:
+            if getattr(hr, 'role', None) != UserProfile.ROLE_HR:
+                return {"hr_team_members": f"User {hr.id} is not an HR."}
+            if manager and getattr(hr, 'created_by_manager_id', None) != manager.id:
+                return {"hr_team_members": f"HR {hr.id} must be created by the selected Manager."}
+    return None
+
+
 class addjobSerializer(serializers.ModelSerializer):
     # ---- write-only relation IDs (accepted on POST/PATCH, hidden in output) ----
     teams = serializers.PrimaryKeyRelatedField(
@@ -151,12 +172,19 @@ class addjobSerializer(serializers.ModelSerializer):
     hiring_manager_detail = serializers.SerializerMethodField(read_only=True)
     hr_team_members_detail = serializers.SerializerMethodField(read_only=True)
     skills_details = serializers.SerializerMethodField(read_only=True)
+    pipeline_counts = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = add_job
         fields = '__all__'
         read_only_fields = ('job_id', 'created_at', 'updated_at', 'posted_by')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # list pages send description_excerpt; the HTML only on request
+        if self.context.get('omit_description'):
+            self.fields.pop('Description', None)
+
     # ---------- detail getters (these fix your AttributeError) ----------
     def get_teams_detail(self, obj):
         if obj.teams_id:
@@ -196,6 +224,9 @@ class addjobSerializer(serializers.ModelSerializer):
             return [{"id": s.id, "name": getattr(s, "name", str(s))} for s in obj.skills_required.all()]
         return []
 
+    def get_pipeline_counts(self, obj):
+        return pipeline_counts(obj)
+
     # ---------- simple sanitizers ----------
     def validate_Salary_range(self, value):
         return value.strip() if isinstance(value, str) else value
@@ -210,21 +241,9 @@ class addjobSerializer(serializers.ModelSerializer):
         hiring_manager = attrs.get('hiring_manager') or getattr(self.instance, 'hiring_manager', None)
         hrs = attrs.get('hr_team_members', None)
 
-        if manager and getattr(manager, 'role', None) != UserProfile.ROLE_MANAGER:
-            raise serializers.ValidationError({"manager": "Selected user is not a Manager."})
-
-        if hiring_manager:
-            if getattr(hiring_manager, 'role', None) != UserProfile.Hiring_Manager:
-                raise serializers.ValidationError({"hiring_manager": "Selected user is not a HiringManager."})
-            if manager and getattr(hiring_manager, 'created_by_manager_id', None) != manager.id:
-                raise serializers.ValidationError({"hiring_manager": "HiringManager must be created by the selected Manager."})
-
-        if hrs is not None:
-            for hr in hrs:
-                if getattr(hr, 'role', None) != UserProfile.ROLE_HR:
-                    raise serializers.ValidationError({"hr_team_members": f"User {hr.id} is not an HR."})
-                if manager and getattr(hr, 'created_by_manager_id', None) != manager.id:
-                    raise serializers.ValidationError({"hr_team_members": f"HR {hr.id} must be created by the selected Manager."})
+        errors = job_relation_errors(manager, hiring_manager, hrs)
+        if errors:
+            raise serializers.ValidationError(errors)
 
         return attrs
 
@@ -239,4 +258,36 @@ class addjobSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         # keep job_id immutable
         validated_data.pop("job_id", None)
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+
+class addjobBulkRowSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk job upload. Relations are plain ids, resolved for the
+    whole batch at once (create_job.bulk), and title uniqueness is checked
+    against the batch instead of per row.
+    """
+    teams = serializers.IntegerField(allow_null=True, required=False)
+    employments_types = serializers.IntegerField(allow_null=True, required=False)
+    manager = serializers.IntegerField(allow_null=True, required=False)
+    hiring_manager = serializers.IntegerField(allow_null=True, required=False)
+    skills_required = serializers.ListField(child=serializers.IntegerField(), required=False)
+    hr_team_members = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = add_job
+        fields = [
+            'title', 'Description', 'Salary_range', 'Experience_required', 'no_opening', 'last_hiring_date',
+            'is_active', 'teams', 'employments_types', 'manager', 'hiring_manager',
+            'skills_required', 'hr_team_members',
+        ]
+        extra_kwargs = {'title': {'validators': []}}
+
+    def validate_title(self, value):
+        return value.strip()
+
+    def validate_Salary_range(self, value):
+        return value.strip() if isinstance(value, str) else value
+
+    def validate_Experience_required(self, value):
+        return value.strip() if isinstance(value, str) else value
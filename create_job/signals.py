@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CandidateSkillProfile, Department, Job_types, Location, Skills, TeamLocation, Teams, add_job
+from form_data.models import FormData
+from google_sheet.models import TypeformAnswer
+
+from . import applications, careers, matching, team_locations
+from .reference import bump_reference_version
+from .search import bump_jobs_version
+
+# facet labels come from these tables, so renames invalidate too
+FACET_MODELS = [add_job, Teams, Department, Location, Skills, Job_types]
+
+
+def invalidate_job_facets(sender, **kwargs):
+    # after commit, so a search in between cannot cache the old rows under the new version
+    transaction.on_commit(bump_jobs_version)
+    # the careers feed shows the same jobs and labels
+    transaction.on_commit(careers.regenerate)
+
+
+for model in FACET_MODELS:
+    post_save.connect(invalidate_job_facets, sender=model)
+    post_delete.connect(invalidate_job_facets, sender=model)
+
+
+@receiver(m2m_changed, sender=add_job.skills_required.through)
+@receiver(m2m_changed, sender=Department.Location_types.through)
+def invalidate_job_facets_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(bump_jobs_version)
+        transaction.on_commit(careers.regenerate)
+
+
+# ----- Reference bundle -----
+REFERENCE_MODELS = [Location, Skills, Job_types, Department, Teams]
+
+
+def invalidate_reference_bundle(sender, **kwargs):
+    # after commit, so a rebuild in between cannot cache the old rows under the new version
+    transaction.on_commit(bump_reference_version)
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(invalidate_reference_bundle, sender=model)
+    post_delete.connect(invalidate_reference_bundle, sender=model)
+
+
+@receiver(m2m_changed, sender=Department.Location_types.through)
+def invalidate_reference_bundle_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(bump_reference_version)
+
+
+# ----- TeamLocation -----
+@receiver(post_save, sender=Teams)
+def sync_team_locations(sender, instance, raw=False, **kwargs):
+    if not raw:
+        team_locations.sync_team(instance)
+
+
+@receiver(post_save, sender=Location)
+def rename_team_locations(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        team_locations.rename_location(instance)
+
+
+@receiver(m2m_changed, sender=Department.Location_types.through)
+def relink_team_locations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if action == "post_clear":
+        if reverse:
+            # location.departments.clear()
+            TeamLocation.objects.filter(location=instance).delete()
+        else:
+            team_locations.remove_links([instance.pk])
+        return
+    department_ids, location_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    if action == "post_add":
+        team_locations.add_links(department_ids, location_ids)
+    else:
+        team_locations.remove_links(department_ids, location_ids)
+
+
+# ----- Candidate skill profiles -----
+PROFILE_SOURCES = {
+    FormData: CandidateSkillProfile.SOURCE_FORM,
+    TypeformAnswer: CandidateSkillProfile.SOURCE_TYPEFORM,
+}
+
+
+def refresh_candidate_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        matching.refresh_profile(PROFILE_SOURCES[sender], instance)
+
+
+def remove_candidate_profile(sender, instance, **kwargs):
+    matching.remove_profile(PROFILE_SOURCES[sender], instance.pk)
+
+
+# ----- Application counters (saves are counted in FormData.save) -----
+@receiver(post_delete, sender=FormData)
+def uncount_application(sender, instance, **kwargs):
+    applications.record_transition((instance.job_id, instance.status), None)
+
+
+for model in PROFILE_SOURCES:
+    post_save.connect(refresh_candidate_profile, sender=model)
+    post_delete.connect(remove_candidate_profile, sender=model)
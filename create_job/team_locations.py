@@ -0,0 +1,61 @@
+"""
+Maintenance of the flattened TeamLocation table.
+
+A team's rows are exactly its department's locations, so every change comes
+down to one of: a team moved department (sync_team), locations added to or
+removed from departments (add_links / remove_links, where one side of the
+pair is always a single object), or a location renamed (rename_location).
+"""
+from .models import Location, TeamLocation, Teams
+
+
+def normalize(name):
+    return (name or "").lower()
+
+
+def sync_team(team):
+    """Make `team`'s rows match its current department's locations."""
+    wanted = dict(
+        Location.objects.filter(departments=team.department_types_id).values_list("id", "name")
+    ) if team.department_types_id else {}
+    have = set(TeamLocation.objects.filter(team=team).values_list("location_id", flat=True))
+
+    stale = have - wanted.keys()
+    if stale:
+        TeamLocation.objects.filter(team=team, location_id__in=stale).delete()
+    missing = wanted.keys() - have
+    if missing:
+        TeamLocation.objects.bulk_create(
+            [TeamLocation(team=team, location_id=pk, location_name=normalize(wanted[pk])) for pk in missing],
+            ignore_conflicts=True,
+        )
+
+
+def add_links(department_ids, location_ids):
+    team_ids = list(Teams.objects.filter(department_types_id__in=department_ids).values_list("id", flat=True))
+    if not team_ids:
+        return
+    names = dict(Location.objects.filter(pk__in=location_ids).values_list("id", "name"))
+    TeamLocation.objects.bulk_create(
+        [
+            TeamLocation(team_id=team_id, location_id=location_id, location_name=normalize(name))
+            for team_id in team_ids
+            for location_id, name in names.items()
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+def remove_links(department_ids, location_ids=None):
+    """location_ids=None drops every location of the departments (M2M clear)."""
+    rows = TeamLocation.objects.filter(team__department_types_id__in=department_ids)
+    if location_ids is not None:
+        rows = rows.filter(location_id__in=location_ids)
+    rows.delete()
+
+
+def rename_location(location):
+    name = normalize(location.name)
+    TeamLocation.objects.filter(location=location).exclude(location_name=name).update(location_name=name)
+
@@ -5,16 +5,15 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
-from .models import Teams
+from .models import TeamLocation, Teams
+from .team_locations import normalize
 from .serializers import TeamSerializer
 
 
 class teamsAPIView(APIView):
     def get(self, request, pk=None):
-        base_qs = (
-            Teams.objects.select_related("department_types")
-            .prefetch_related("department_types__Location_types")
-        )
+        # TeamSerializer only reads department_types_id: no joins or prefetches needed
+        base_qs = Teams.objects.all()
 
         if pk:
             team = get_object_or_404(base_qs, pk=pk)
@@ -36,18 +35,22 @@ class teamsAPIView(APIView):
         if department_id:
             qs = qs.filter(department_types_id=department_id)
 
-        # filter by location name (partial)
+        # Location filters are one indexed subquery on the flattened TeamLocation
+        # table, so a team matching several locations is still listed once
+
+        # filter by location name (prefix, case-insensitive)
         location = request.query_params.get("location")
         if location:
-            qs = qs.filter(department_types__Location_types__name__icontains=location)
+            qs = qs.filter(pk__in=TeamLocation.objects.filter(
+                location_name__startswith=normalize(location.strip())
+            ).values("team_id"))
 
         # filter by location id
         location_id = request.query_params.get("location_id")
         if location_id:
-            qs = qs.filter(department_types__Location_types__id=location_id)
+            qs = qs.filter(pk__in=TeamLocation.objects.filter(location_id=location_id).values("team_id"))
 
-        # Avoid duplicate rows when department matches multiple locations
-        qs = qs.distinct().order_by("id")
+        qs = qs.order_by("id")
 
         serializer = TeamSerializer(qs, many=True)
         return Response(
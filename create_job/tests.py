@@ -1,3 +1,587 @@
-from django.test import TestCase
+import json
+import warnings
+from itertools import count
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from form_data.models import FormData
+from restserver.testing import QueryBudgetMixin
+from superadmin.models import UserProfile
+
+from .applications import rebuild_counters
+from .bulk import create_jobs, validate_jobs
+from .job_ids import allocate_job_ids, next_free_number
+from .matching import clear_local_index
+from .search import jobs_version
+from .models import (
+    Department, JobApplicationCounter, JobIdCounter, Job_types, Location, Skills, TeamLocation, Teams, add_job,
+)
+
+_seq = count()
+
+
+def make_jobs(n, manager, hrs, skills, team, job_type):
+    for _ in range(n):
+        i = next(_seq)
+        job = add_job.objects.create(
+            title=f"Engineer {i}", Description="Build things", Salary_range="10-20 LPA",
+            Experience_required="3 years", no_opening=2, teams=team, employments_types=job_type,
+            manager=manager, posted_by=manager,
+        )
+        job.skills_required.set(skills)
+        job.hr_team_members.set(hrs)
+
+
+def make_departments(n, locations):
+    for _ in range(n):
+        Department.objects.create(name=f"Department {next(_seq)}").Location_types.set(locations)
+
+
+class CreateJobQueryBudgetTests(QueryBudgetMixin, TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        cls.hrs = [
+            UserProfile.objects.create(email=f"hr{i}@example.com", password="x", role=UserProfile.ROLE_HR,
+                                       created_by_manager=cls.manager)
+            for i in range(3)
+        ]
+        cls.skills = [Skills.objects.create(name=f"Skill {i}") for i in range(4)]
+        cls.locations = [Location.objects.create(name=f"City {i}") for i in range(3)]
+        department = Department.objects.create(name="Engineering")
+        cls.team = Teams.objects.create(name="Platform", department_types=department)
+        cls.job_type = Job_types.objects.create(name="Full time")
+        make_jobs(5, cls.manager, cls.hrs, cls.skills, cls.team, cls.job_type)
+        make_departments(3, cls.locations)
+
+    def grow_jobs(self):
+        make_jobs(15, self.manager, self.hrs, self.skills, self.team, self.job_type)
+
+    def test_addjob_list(self):
+        # count, page (with teams/job type/people joined), hr_team_members, skills_required, application_counters
+        self.assertQueryBudget(5, "/api/create_job/addjob/?page_size=50", grow=self.grow_jobs)
+
+    def test_department_list(self):
+        self.assertQueryBudget(2, "/api/create_job/department/", grow=lambda: make_departments(10, self.locations))
+
+    def test_teams_list(self):
+        self.assertQueryBudget(1, "/api/create_job/teams/")
+
+    def test_flat_lists(self):
+        for url in ("/api/create_job/skills/", "/api/create_job/locations/", "/api/create_job/jobtypes/"):
+            self.assertQueryBudget(1, url)
+
+    def test_job_search(self):
+        # count, page, hr_team_members, skills_required, application_counters, and every facet in one UNION ALL
+        self.assertQueryBudget(6, f"/api/create_job/jobs/search/?q=engineer&team={self.team.pk}", grow=self.grow_jobs)
+
+    def test_job_search_facets(self):
+        self.client.force_authenticate(self.user)
+        other = add_job.objects.create(
+            title="Analyst", Description="Spreadsheets", Salary_range="5 LPA", Experience_required="1 year",
+            no_opening=1, teams=self.team, employments_types=self.job_type, is_active=False,
+        )
+        other.skills_required.set(self.skills[:1])
+        response = self.client.get(f"/api/create_job/jobs/search/?skills={self.skills[1].pk}&is_active=true")
+        self.assertEqual(response.data["count"], 5)
+        facets = response.data["results"]["facets"]
+        # a dimension's counts ignore its own selection ...
+        self.assertEqual({e["value"]: e["count"] for e in facets["skills"]}[self.skills[0].pk], 5)
+        self.assertEqual({e["value"]: e["count"] for e in facets["is_active"]}, {True: 5})
+        # ... but not the others'
+        self.assertEqual({e["value"]: e["count"] for e in facets["experience"]}, {"3 years": 5})
+
+    def test_job_search_rejects_bad_ids(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get("/api/create_job/jobs/search/?team=abc")
+        self.assertEqual(response.status_code, 400)
+
+
+class JobFacetInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_bumped_only_after_commit(self):
+        before = jobs_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            job = new_job("Engineer")
+            skill = Skills.objects.create(name="Python")
+            job.skills_required.add(skill)
+            # a search inside the writer's transaction still caches under the old version
+            self.assertEqual(jobs_version(), before)
+        self.assertGreater(jobs_version(), before)
+
+        before = jobs_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            job.skills_required.remove(skill)
+            self.assertEqual(jobs_version(), before)
+        self.assertGreater(jobs_version(), before)
+
+    def test_rolled_back_write_keeps_the_version(self):
+        before = jobs_version()
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            new_job("Engineer")
+            transaction.set_rollback(True)
+        self.assertEqual(jobs_version(), before)
+
+
+class ReferenceBundleTests(TestCase):
+    client_class = APIClient
+    url = "/api/create_job/reference-bundle/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.location = Location.objects.create(name="Pune")
+        department = Department.objects.create(name="Engineering")
+        department.Location_types.set([cls.location])
+        Teams.objects.create(name="Platform", department_types=department)
+        Skills.objects.create(name="Python")
+        Job_types.objects.create(name="Full time")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_revalidation(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["departments"][0]["locations"], [{"id": self.location.pk, "name": "Pune"}])
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skills.objects.create(name="Go")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual([s["name"] for s in response.data["data"]["skills"]], ["Python", "Go"])
+
+    def test_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class TeamLocationTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.pune, cls.punjab, cls.delhi = (Location.objects.create(name=n) for n in ("Pune", "Punjab", "Delhi"))
+        cls.department = Department.objects.create(name="Engineering")
+        cls.department.Location_types.set([cls.pune, cls.punjab])
+        cls.team = Teams.objects.create(name="Platform", department_types=cls.department)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def links(self):
+        return set(TeamLocation.objects.values_list("team_id", "location_name"))
+
+    def test_kept_in_step(self):
+        self.assertEqual(self.links(), {(self.team.pk, "pune"), (self.team.pk, "punjab")})
+        self.department.Location_types.remove(self.punjab)
+        self.delhi.departments.add(self.department)
+        self.pune.name = "Pune City"
+        self.pune.save()
+        self.assertEqual(self.links(), {(self.team.pk, "pune city"), (self.team.pk, "delhi")})
+        self.team.department_types = Department.objects.create(name="Sales")
+        self.team.save()
+        self.assertEqual(self.links(), set())
+
+    def test_filter_by_location(self):
+        # both locations match the prefix; the team is listed once
+        response = self.client.get("/api/create_job/teams/?location=PUN")
+        self.assertEqual([t["id"] for t in response.data["data"]], [self.team.pk])
+        response = self.client.get(f"/api/create_job/teams/?location_id={self.delhi.pk}")
+        self.assertEqual(response.data["data"], [])
+
+
+class JobMatchingTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        department = Department.objects.create(name="Engineering")
+        team = Teams.objects.create(name="Platform", department_types=department)
+        job_type = Job_types.objects.create(name="Full time")
+        cls.job = add_job.objects.create(
+            title="Data engineer", Description="Pipelines", Salary_range="10-20 LPA", Experience_required="3 years",
+            no_opening=1, teams=team, employments_types=job_type,
+        )
+        cls.job.skills_required.set([Skills.objects.create(name="Python"), Skills.objects.create(name="RDBMS")])
+
+    def setUp(self):
+        cache.clear()
+        clear_local_index()
+        self.client.force_authenticate(self.user)
+
+    def submit(self, name, skills=(), tech=None):
+        return FormData.objects.create(submission_data={
+            "Name": name, "Email": f"{name.lower()}@example.com", "Skills": list(skills), "Tech_Experience": tech or {},
+        })
+
+    def matches(self):
+        response = self.client.get(f"/api/create_job/jobs/{self.job.pk}/matches/")
+        self.assertEqual(response.status_code, 200)
+        return [(c["name"], c["score"]) for c in response.data["data"]]
+
+    def test_ranked_by_rating(self):
+        self.submit("Asha", tech={"Python": {"experience": "Yes", "rating": 5}, "RDBMS": {"experience": "Yes", "rating": 4}})
+        self.submit("Ravi", skills=["Python"])
+        self.submit("Meera", tech={"R": {"experience": "Yes", "rating": 5}, "RDBMS": {"experience": "No", "rating": 3}})
+        # (1.0 + 0.8) / 2 and an unrated Python at 0.6 / 2; Meera matches nothing
+        self.assertEqual(self.matches(), [("Asha", 90.0), ("Ravi", 30.0)])
+
+    def test_refreshed_on_submission_changes(self):
+        form = self.submit("Ravi", skills=["Python"])
+        self.assertEqual(self.matches(), [("Ravi", 30.0)])
+
+        form.submission_data["Tech_Experience"] = {"RDBMS": {"experience": "Yes", "rating": 5}}
+        form.save()
+        self.assertEqual(self.matches(), [("Ravi", 80.0)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            form.delete()
+        self.assertEqual(self.matches(), [])
+
+
+class JobTransferTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        department = Department.objects.create(name="Engineering")
+        Teams.objects.create(name="Platform", department_types=department)
+        Job_types.objects.create(name="Full time")
+        Skills.objects.create(name="Python")
+        Skills.objects.create(name="Go")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, query=""):
+        return self.client.post(f"/api/create_job/addjob/import/{query}",
+                                {"file": SimpleUploadedFile(name, content.encode())}, format="multipart")
+
+    def test_round_trip(self):
+        csv_text = (
+            "title,Description,Salary_range,Experience_required,no_opening,team,employment_type,skills,manager\n"
+            'Backend engineer,"APIs, queues",10 LPA,3 years,2,platform,Full time,Python;Go,Manager@example.com\n'
+        )
+        response = self.upload("jobs.csv", csv_text)
+        self.assertEqual(response.status_code, 201, response.data)
+        job = add_job.objects.get(title="Backend engineer")
+        self.assertEqual(job.manager, self.manager)
+        self.assertEqual(sorted(job.skills_required.values_list("name", flat=True)), ["Go", "Python"])
+
+        response = self.client.get("/api/create_job/addjob/export/?type=jsonl")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(rows[0]["skills"], "Go;Python")
+        self.assertEqual(rows[0]["team"], "Platform")
+
+        rows[0]["title"] = "Backend engineer II"
+        response = self.upload("jobs.jsonl", json.dumps(rows[0]))
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(add_job.objects.count(), 2)
+
+    def test_all_or_nothing(self):
+        csv_text = (
+            "title,Description,Salary_range,Experience_required,no_opening,team,skills\n"
+            "Valid job,x,1,1,1,Platform,Python\n"
+            "Broken job,x,1,1,1,Nowhere,Rust\n"
+        )
+        response = self.upload("jobs.csv", csv_text)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertEqual(set(response.data["errors"][0]["errors"]), {"team", "skills"})
+        self.assertFalse(add_job.objects.exists())
+
+
+class AsgiExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        for i in range(5):
+            new_job(f"Job {i}")
+
+    async def export(self, file_format):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        with warnings.catch_warnings(record=True) as caught, mock.patch("create_job.transfer.EXPORT_CHUNK", 2):
+            warnings.simplefilter("always")
+            response = await AsyncClient().get(f"/api/create_job/addjob/export/?type={file_format}", headers=headers)
+            chunks = [chunk async for chunk in response]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([str(w.message) for w in caught if "synchronous iterators" in str(w.message)], [])
+        return response, chunks
+
+    async def test_streams_chunk_by_chunk(self):
+        response, chunks = await self.export("jsonl")
+        self.assertTrue(response.is_async)
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        self.assertEqual([row["title"] for row in rows], [f"Job {i}" for i in range(5)])
+
+    async def test_csv(self):
+        _, chunks = await self.export("csv")
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertTrue(lines[0].startswith("job_id,title"))
+        self.assertEqual(len(lines), 6)
+
+
+class DescriptionExcerptTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.job = add_job.objects.create(
+            title="Engineer", Salary_range="1", Experience_required="1", no_opening=1,
+            Description="<p>Build <b>data</b>&nbsp;pipelines</p><p>in&amp;out</p><script>alert(1)</script>",
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_summary_stored_on_save(self):
+        self.assertEqual(self.job.description_excerpt, "Build data pipelines in&out")
+        self.assertEqual(self.job.description_words, 4)
+        self.job.Description = "<p>" + "word " * 200 + "</p>"
+        self.job.save(update_fields=["Description"])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.description_words, 200)
+        self.assertTrue(self.job.description_excerpt.endswith("word…"))
+        self.assertLessEqual(len(self.job.description_excerpt), 281)
+
+    def test_list_ships_excerpt_only(self):
+        job = self.client.get("/api/create_job/addjob/").data["results"]["data"][0]
+        self.assertNotIn("Description", job)
+        self.assertEqual(job["description_words"], 4)
+        job = self.client.get("/api/create_job/addjob/?fields=Description").data["results"]["data"][0]
+        self.assertIn("<b>data</b>", job["Description"])
+        job = self.client.get(f"/api/create_job/addjob/{self.job.pk}/").data["data"]
+        self.assertIn("Description", job)
+
+
+class CareersFeedTests(TestCase):
+    feed_url = "/api/create_job/careers/jobs/"
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Engineering")
+        department.Location_types.set([Location.objects.create(name="Pune")])
+        cls.job = add_job.objects.create(
+            title="Engineer", Description="<p>Build things</p>", Salary_range="1", Experience_required="1",
+            no_opening=1, teams=Teams.objects.create(name="Platform", department_types=department),
+        )
+        cls.closed = add_job.objects.create(
+            title="Closed", Description="x", Salary_range="1", Experience_required="1", no_opening=1, is_active=False,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_served_from_snapshot(self):
+        response = self.client.get(self.feed_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job["title"] for job in response.json()["data"]], ["Engineer"])
+        self.assertEqual(response.json()["data"][0]["locations"], ["Pune"])
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn(f"careers-job-{self.job.pk}", response["Surrogate-Key"])
+
+        with self.assertNumQueries(0):
+            again = self.client.get(self.feed_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.closed.is_active = True
+            self.closed.save()
+        with self.assertNumQueries(0):
+            fresh = self.client.get(self.feed_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()["count"], 2)
+
+    def test_job_page(self):
+        response = self.client.get(f"{self.feed_url}{self.job.pk}/")
+        self.assertEqual(response.json()["data"]["description"], "<p>Build things</p>")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(f"{self.feed_url}{self.job.pk}/").status_code, 200)
+
+        self.assertEqual(self.client.get(f"{self.feed_url}{self.closed.pk}/").status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(f"{self.feed_url}{self.closed.pk}/").status_code, 404)
+
+
+class ApplicationCounterTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.job = add_job.objects.create(
+            title="SDET", Description="x", Salary_range="1", Experience_required="1", no_opening=1,
+        )
+
+    def counts(self):
+        self.client.force_authenticate(self.user)
+        return self.client.get(f"/api/create_job/addjob/{self.job.pk}/").data["data"]["pipeline_counts"]
+
+    def test_counts_follow_status_changes(self):
+        linked = FormData.objects.create(submission_data={"Name": "A", "Role_Type": "sdet"})
+        by_code = FormData.objects.create(submission_data={"Name": "B", "Role": "x", "job_id": self.job.job_id})
+        FormData.objects.create(submission_data={"Name": "C", "Role_Type": "Unknown role"})
+        self.assertEqual((linked.job_id, by_code.job_id), (self.job.pk, self.job.pk))
+        self.assertEqual(self.counts(), {"scouting": 2, "in_progress": 0, "hired": 0, "rejected": 0, "applications": 2})
+
+        linked.submission_data["status"] = "Ongoing"
+        linked.save()
+        linked.submission_data["status"] = "Hired"
+        linked.save(update_fields=["submission_data"])
+        by_code.delete()
+        self.assertEqual(self.counts(), {"scouting": 0, "in_progress": 0, "hired": 1, "rejected": 0, "applications": 1})
+
+    def test_rebuild(self):
+        FormData.objects.create(submission_data={"Name": "A", "Role_Type": "SDET", "status": "Reject"})
+        JobApplicationCounter.objects.all().delete()
+        self.assertEqual(rebuild_counters(), (0, 1))
+        self.assertEqual(self.counts()["rejected"], 1)
+
+
+def new_job(title, **fields):
+    return add_job.objects.create(
+        title=title, Description="x", Salary_range="1", Experience_required="1", no_opening=1, **fields
+    )
+
+
+class JobIdAllocationTests(TestCase):
+    def test_seeded_after_the_highest_existing_id(self):
+        # migration 0012 seeds the counter; without it the first allocation does
+        JobIdCounter.objects.all().delete()
+        new_job("Legacy", job_id="GXI1500")
+        new_job("Imported", job_id="EXT-9")
+        self.assertEqual(allocate_job_ids(2), ["GXI1501", "GXI1502"])
+        self.assertEqual(new_job("Next").job_id, "GXI1503")
+        self.assertEqual(allocate_job_ids(0), [])
+
+    def test_next_free_number(self):
+        self.assertEqual(next_free_number([]), 1001)
+        self.assertEqual(next_free_number(["GXI1009", "GXI12", "abc", "GXI10a"]), 1010)
+
+    def test_rolled_back_allocation_is_reused(self):
+        self.assertEqual(new_job("First").job_id, "GXI1001")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.assertEqual(allocate_job_ids(3), ["GXI1002", "GXI1003", "GXI1004"])
+            raise IntegrityError("insert failed")
+        self.assertEqual(JobIdCounter.objects.get().next_value, 1002)
+        self.assertEqual(new_job("Second").job_id, "GXI1002")
+
+    def test_failed_save_hands_its_number_back(self):
+        new_job("Taken")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            new_job("Taken")
+        self.assertEqual(new_job("Other").job_id, "GXI1002")
+
+
+class BulkJobTests(TestCase):
+    client_class = APIClient
+    url = "/api/create_job/addjob/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        cls.other_manager = UserProfile.objects.create(
+            email="other@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        cls.hr = UserProfile.objects.create(
+            email="hr@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=cls.manager
+        )
+        cls.skills = [Skills.objects.create(name=f"Skill {i}") for i in range(2)]
+        cls.team = Teams.objects.create(name="Platform", department_types=Department.objects.create(name="Eng"))
+        cls.job_type = Job_types.objects.create(name="Full time")
+        new_job("Existing")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def row(self, title, **fields):
+        return {
+            "title": title, "Description": "Build things", "Salary_range": "10-20 LPA", "Experience_required": "3",
+            "no_opening": 1, "teams": self.team.pk, "employments_types": self.job_type.pk,
+            "manager": self.manager.pk, "skills_required": [s.pk for s in self.skills],
+            "hr_team_members": [self.hr.pk], **fields,
+        }
+
+    def test_creates_jobs_with_consecutive_ids_and_links(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"jobs": [self.row("Backend"), self.row("Frontend")]}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([job["job_id"] for job in response.data["data"]], ["GXI1002", "GXI1003"])
+
+        job = add_job.objects.get(title="Backend")
+        self.assertEqual(job.posted_by, self.user)
+        self.assertEqual(set(job.skills_required.all()), set(self.skills))
+        self.assertEqual(list(job.hr_team_members.all()), [self.hr])
+        self.assertEqual(job.description_excerpt, "Build things")
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        def queries(titles):
+            with CaptureQueriesContext(connection) as captured, transaction.atomic():
+                valid, errors = validate_jobs([self.row(title) for title in titles])
+                self.assertEqual(errors, [])
+                create_jobs(valid)
+            return len(captured)
+
+        self.assertEqual(queries(["A", "B"]), queries([f"Job {i}" for i in range(20)]))
+
+    def test_any_invalid_row_creates_nothing(self):
+        response = self.client.post(self.url, [
+            self.row("Backend"),
+            self.row("Backend"),
+            self.row("Existing"),
+            self.row("Bad skill", skills_required=[999]),
+            self.row("Wrong manager", manager=self.other_manager.pk),
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["row"] for e in response.data["errors"]], [2, 3, 4, 5])
+        self.assertFalse(add_job.objects.filter(title="Backend").exists())
+        self.assertEqual(new_job("After").job_id, "GXI1002")
+
+    def test_failure_while_linking_rolls_back_jobs_and_ids(self):
+        valid, _ = validate_jobs([self.row("Backend"), self.row("Frontend")])
+        through = add_job._meta.get_field("hr_team_members").remote_field.through
+        with mock.patch.object(through.objects, "bulk_create", side_effect=IntegrityError("boom")):
+            with self.assertRaises(IntegrityError):
+                create_jobs(valid)
+        self.assertFalse(add_job.objects.filter(title__in=["Backend", "Frontend"]).exists())
+        self.assertEqual(new_job("After").job_id, "GXI1002")
+
+    def test_batch_limits(self):
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, 400)
+        with mock.patch("create_job.addjobviews.MAX_BULK_JOBS", 1):
+            response = self.client.post(self.url, [self.row("A"), self.row("B")], format="json")
+        self.assertEqual(response.status_code, 400)
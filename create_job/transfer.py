@@ -0,0 +1,248 @@
+"""
+Streaming job import and export, as CSV or JSONL. Both use the same columns,
+so an export can be edited and imported back.
+
+Import reads the upload line by line and works through it IMPORT_BATCH rows
+at a time. Team, job type and skill names are resolved through one map loaded
+up front; people are resolved by email once per batch. Each batch then goes
+through create_job.bulk.validate_jobs and is written with create_jobs (one
+bulk_create for the jobs, one bulk insert per M2M through table). The import
+is a single transaction: if any row is invalid nothing is kept and the errors
+are returned.
+
+Export walks the jobs with iterator(chunk_size=EXPORT_CHUNK), so memory stays
+flat however many jobs there are. Under ASGI the response gets
+astream_export(), which builds one chunk at a time in a worker thread: a sync
+generator would be read to the end before the first byte is sent.
+"""
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Prefetch
+
+from superadmin.models import UserProfile
+
+from .bulk import create_jobs, validate_jobs
+from .models import Job_types, Skills, Teams, add_job
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+COLUMNS = [
+    "job_id", "title", "Description", "Salary_range", "Experience_required", "no_opening", "last_hiring_date",
+    "is_active", "team", "employment_type", "skills", "manager", "hiring_manager", "hr_team_members",
+]
+PLAIN_FIELDS = [
+    "title", "Description", "Salary_range", "Experience_required", "no_opening", "last_hiring_date", "is_active",
+]
+LIST_SEPARATOR = ";"
+
+IMPORT_BATCH = 500
+MAX_IMPORT_ERRORS = 100
+EXPORT_CHUNK = 1000
+
+
+class JobImportError(Exception):
+    """The upload as a whole is unreadable."""
+
+
+# --------------------------
+# Import
+# --------------------------
+def read_rows(upload, file_format):
+    """Rows of an uploaded file as dicts, read lazily."""
+    lines = (line.decode("utf-8-sig") for line in upload)
+    try:
+        if file_format == "csv":
+            reader = csv.DictReader(lines)
+            if not reader.fieldnames or "title" not in [f.strip() for f in reader.fieldnames]:
+                raise JobImportError(f"CSV header must include 'title' (columns: {', '.join(COLUMNS)})")
+            for row in reader:
+                yield {k.strip(): (v or "").strip() for k, v in row.items() if k}
+            return
+
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise JobImportError(f"Line {number} is not valid JSON")
+            if not isinstance(row, dict):
+                raise JobImportError(f"Line {number} is not a JSON object")
+            yield row
+    except UnicodeDecodeError:
+        raise JobImportError("File must be UTF-8 encoded")
+
+
+def load_lookups():
+    """Casefolded name -> id for every team, job type and skill."""
+    return {
+        "team": {name.casefold(): pk for pk, name in Teams.objects.values_list("pk", "name")},
+        "employment_type": {name.casefold(): pk for pk, name in Job_types.objects.values_list("pk", "name")},
+        "skills": {name.casefold(): pk for pk, name in Skills.objects.values_list("pk", "name")},
+    }
+
+
+def _names(value):
+    if isinstance(value, (list, tuple)):
+        values = value
+    else:
+        values = str(value or "").split(LIST_SEPARATOR)
+    return [str(v).strip() for v in values if str(v).strip()]
+
+
+def resolve_batch(rows, lookups):
+    """(rows in addjobBulkRowSerializer shape, {index: errors}) for one batch."""
+    emails = set()
+    for row in rows:
+        emails.update(e.lower() for e in _names(row.get("manager")) + _names(row.get("hiring_manager")))
+        emails.update(e.lower() for e in _names(row.get("hr_team_members")))
+    people = {
+        email.lower(): pk for email, pk in UserProfile.objects.filter(email__in=emails).values_list("email", "pk")
+    } if emails else {}
+
+    resolved, errors = [], {}
+    for index, row in enumerate(rows):
+        data = {field: row[field] for field in PLAIN_FIELDS if row.get(field) not in (None, "")}
+        row_errors = {}
+
+        for column, field in (("team", "teams"), ("employment_type", "employments_types")):
+            name = str(row.get(column) or "").strip()
+            if name:
+                data[field] = lookups[column].get(name.casefold())
+                if data[field] is None:
+                    row_errors[column] = f"Unknown {column.replace('_', ' ')} '{name}'."
+
+        skills = _names(row.get("skills"))
+        unknown = [name for name in skills if name.casefold() not in lookups["skills"]]
+        if unknown:
+            row_errors["skills"] = f"Unknown skills: {', '.join(unknown)}"
+        data["skills_required"] = [lookups["skills"][name.casefold()] for name in skills if name not in unknown]
+
+        for column in ("manager", "hiring_manager"):
+            email = str(row.get(column) or "").strip().lower()
+            if email:
+                data[column] = people.get(email)
+                if data[column] is None:
+                    row_errors[column] = f"No user with email '{email}'."
+        hrs = [e.lower() for e in _names(row.get("hr_team_members"))]
+        missing = [e for e in hrs if e not in people]
+        if missing:
+            row_errors["hr_team_members"] = f"No users with emails: {', '.join(missing)}"
+        if hrs:
+            data["hr_team_members"] = [people[e] for e in hrs if e in people]
+
+        resolved.append(data)
+        if row_errors:
+            errors[index] = row_errors
+    return resolved, errors
+
+
+def import_jobs(rows, posted_by=None, dry_run=False):
+    """
+    Create jobs from `rows` (any iterable of dicts in the export layout).
+    Returns (jobs created, errors); nothing is kept if there are errors or on
+    a dry run. Errors are [{"row": n, "errors": {...}}], 1-based.
+    """
+    lookups = load_lookups()
+    rows = iter(rows)
+    created, errors, offset = 0, [], 0
+    with transaction.atomic():
+        while len(errors) < MAX_IMPORT_ERRORS:
+            batch = list(islice(rows, IMPORT_BATCH))
+            if not batch:
+                break
+            resolved, resolve_errors = resolve_batch(batch, lookups)
+            valid, validation_errors = validate_jobs(resolved, start=offset + 1)
+
+            batch_errors = defaultdict(dict)
+            for index, row_errors in resolve_errors.items():
+                batch_errors[offset + index + 1].update(row_errors)
+            for error in validation_errors:
+                batch_errors[error["row"]].update(error["errors"])
+            errors.extend({"row": number, "errors": batch_errors[number]} for number in sorted(batch_errors))
+
+            # once anything failed the import is rolled back; keep validating to report more rows
+            if not errors:
+                created += len(create_jobs(valid, posted_by=posted_by))
+            offset += len(batch)
+
+        if errors or dry_run:
+            transaction.set_rollback(True)
+    return (0 if errors else created), errors[:MAX_IMPORT_ERRORS]
+
+
+# --------------------------
+# Export
+# --------------------------
+def export_queryset():
+    return (
+        add_job.objects
+        .select_related("teams", "employments_types", "manager", "hiring_manager")
+        .prefetch_related(
+            Prefetch("skills_required", queryset=Skills.objects.only("id", "name")),
+            Prefetch("hr_team_members", queryset=UserProfile.objects.only("id", "email")),
+        )
+        .order_by("pk")
+    )
+
+
+def export_rows(queryset=None):
+    """One dict per job in COLUMNS layout; prefetches run once per chunk."""
+    for job in (queryset or export_queryset()).iterator(chunk_size=EXPORT_CHUNK):
+        yield {
+            "job_id": job.job_id,
+            "title": job.title,
+            "Description": job.Description,
+            "Salary_range": job.Salary_range,
+            "Experience_required": job.Experience_required,
+            "no_opening": job.no_opening,
+            "last_hiring_date": job.last_hiring_date.isoformat() if job.last_hiring_date else "",
+            "is_active": job.is_active,
+            "team": job.teams.name if job.teams else "",
+            "employment_type": job.employments_types.name if job.employments_types else "",
+            "skills": LIST_SEPARATOR.join(skill.name for skill in job.skills_required.all()),
+            "manager": job.manager.email if job.manager else "",
+            "hiring_manager": job.hiring_manager.email if job.hiring_manager else "",
+            "hr_team_members": LIST_SEPARATOR.join(user.email for user in job.hr_team_members.all()),
+        }
+
+
+class _Echo:
+    """File-like object whose write() hands the line back (csv writer -> generator)."""
+    def write(self, value):
+        return value
+
+
+def stream_export(file_format, queryset=None):
+    """Encoded chunks of the export, for a StreamingHttpResponse."""
+    rows = export_rows(queryset)
+    if file_format == "csv":
+        writer = csv.DictWriter(_Echo(), fieldnames=COLUMNS)
+        yield writer.writeheader().encode()
+        for row in rows:
+            yield writer.writerow(row).encode()
+    else:
+        for row in rows:
+            yield (json.dumps(row, ensure_ascii=False) + "\n").encode()
+
+
+async def astream_export(file_format, queryset=None):
+    """stream_export() as an async iterator, EXPORT_CHUNK lines per thread hop."""
+    lines = stream_export(file_format, queryset)
+    # thread-sensitive: every chunk is read on the thread (and connection) that opened the cursor
+    next_chunk = sync_to_async(lambda: b"".join(islice(lines, EXPORT_CHUNK)), thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk()
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(lines.close, thread_sensitive=True)()
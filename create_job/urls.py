@@ -4,7 +4,12 @@ from .departmentviews import DepartmentAPIView
 from .jobtypesviews import jobtypesAPIView
 from .locationViews import LocationAPIView
 from .teamsviews import teamsAPIView
-from .addjobviews import AddJobAPIView
+from .referenceviews import ReferenceBundleAPIView
+from .matchviews import JobMatchesAPIView
+from .careersviews import CareersFeedAPIView, CareersJobAPIView
+from .addjobviews import (
+    AddJobAPIView, AddJobBulkAPIView, AddJobExportAPIView, AddJobImportAPIView, JobSearchAPIView,
+)
 
 urlpatterns = [
     path('skills/', SkillsAPIView.as_view()),
@@ -24,6 +29,16 @@ urlpatterns = [
 
     path("teams/", teamsAPIView.as_view()),
     path("teams/<int:pk>/", teamsAPIView.as_view()),
+    path("reference-bundle/", ReferenceBundleAPIView.as_view()),
+
     path("addjob/", AddJobAPIView.as_view()),
+    path("addjob/bulk/", AddJobBulkAPIView.as_view()),
+    path("addjob/import/", AddJobImportAPIView.as_view()),
+    path("addjob/export/", AddJobExportAPIView.as_view()),
+    path("jobs/search/", JobSearchAPIView.as_view()),
+    path("jobs/<int:pk>/matches/", JobMatchesAPIView.as_view()),
+
+    path("careers/jobs/", CareersFeedAPIView.as_view()),
+    path("careers/jobs/<int:pk>/", CareersJobAPIView.as_view()),
     path("addjob/<int:pk>/", AddJobAPIView.as_view()),
 ]
\ No newline at end of file
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_status(apps, schema_editor):
+    # links and counters: manage.py rebuild_application_counters
+    FormData = apps.get_model('form_data', 'FormData')
+    forms = []
+    for form in FormData.objects.only('id', 'submission_data').iterator(chunk_size=1000):
+        data = form.submission_data if isinstance(form.submission_data, dict) else {}
+        form.status = data.get('status') or 'Scouting'
+        forms.append(form)
+        if len(forms) >= 1000:
+            FormData.objects.bulk_update(forms, ['status'])
+            forms = []
+    FormData.objects.bulk_update(forms, ['status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('create_job', '0016_jobapplicationcounter'),
+        ('form_data', '0004_alter_formdata_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formdata',
+            name='job',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='create_job.add_job'),
+        ),
+        migrations.AddField(
+            model_name='formdata',
+            name='status',
+            field=models.CharField(db_index=True, default='Scouting', editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='formdata',
+            index=models.Index(fields=['job', 'status'], name='form_data_f_job_id_62f555_idx'),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,17 @@
-from django.db import models
+from django.db import models, transaction
+
+DEFAULT_STATUS = 'Scouting'
+
 
 class FormData(models.Model):
     form_name = models.CharField(max_length=255 , default='gxi_form')
     submission_data = models.JSONField()
+    # resolved from submission_data when the row is saved; see create_job.applications
+    job = models.ForeignKey(
+        'create_job.add_job', on_delete=models.SET_NULL, null=True, blank=True, related_name='applications',
+        db_index=False,  # covered by the (job, status) index
+    )
+    status = models.CharField(max_length=20, default=DEFAULT_STATUS, db_index=True, editable=False)
     cv_upload = models.FileField(upload_to='cv_uploads/', blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
@@ -18,9 +27,29 @@ class FormData(models.Model):
             models.Index(fields=['form_name']),
             models.Index(fields=['submitted_at']),
             models.Index(fields=['candidate_email']),
+            models.Index(fields=['job', 'status']),
         ]
         ordering = ['-submitted_at']
 
+    def save(self, *args, **kwargs):
+        from create_job.applications import record_transition, resolve_job_id
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'job', 'status'}
+
+        # the row lock orders concurrent status changes, so the per-job counters never drift
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = None
+            if self.pk:
+                previous = FormData.objects.select_for_update().filter(pk=self.pk).values_list('job_id', 'status').first()
+            if isinstance(self.submission_data, dict):
+                self.status = self.submission_data.get('status') or DEFAULT_STATUS
+            if self.job_id is None:
+                self.job_id = resolve_job_id(self.submission_data)
+            super().save(*args, **kwargs)
+            record_transition(previous, (self.job_id, self.status))
+
 
     def __str__(self):
         return f"{self.form_name} submitted at {self.submitted_at}"
@@ -6,4 +6,5 @@ class FormDataSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = FormData
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+        read_only_fields = ("status",)
\ No newline at end of file
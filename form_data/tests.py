@@ -1,3 +1,23 @@
 from django.test import TestCase
 
-# Create your tests here.
+from restserver.testing import QueryBudgetMixin
+from superadmin.models import UserProfile
+
+from .models import FormData
+
+
+def make_forms(n):
+    FormData.objects.bulk_create(
+        FormData(form_name="gxi_form", submission_data={"Name": f"Candidate {i}", "Role_Type": "SDET"})
+        for i in range(n)
+    )
+
+
+class FormDataQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        make_forms(3)
+
+    def test_formdata_list(self):
+        self.assertQueryBudget(2, "/api/form_data/formdata/?page_size=50", grow=lambda: make_forms(20))
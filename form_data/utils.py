@@ -1,7 +1,8 @@
-import requests
 from django.conf import settings
 from datetime import datetime
 
+from restserver.utils.transport import http_session
+
 def get_ms_access_token():
     if settings.MS_GRAPH_ACCESS_TOKEN:
         return settings.MS_GRAPH_ACCESS_TOKEN
@@ -14,7 +15,7 @@ def get_ms_access_token():
         'grant_type': 'client_credentials'
     }
 
-    response = requests.post(url, data=data)
+    response = http_session().post(url, data=data)
     response.raise_for_status()
     token_data = response.json()
     access_token = token_data.get('access_token')
@@ -44,7 +45,7 @@ def create_teams_meeting(subject, start_time, end_time, organizer_email):
         }
     }
 
-    response = requests.post(
+    response = http_session().post(
         f"{settings.MS_GRAPH_API_URL}/users/{organizer_email}/onlineMeetings",
         headers=headers,
         json=payload
@@ -8,6 +8,7 @@ from django.core.mail import send_mail
 from .models import FormData
 from .serializers import FormDataSerializer
 import requests
+from restserver.utils.transport import http_session
 from functools import reduce
 from operator import or_
 
@@ -373,7 +374,7 @@ def send_whatsapp_message(phone, name_value):
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session().post(url, json=payload, headers=headers, timeout=10)
         response.raise_for_status()
         return {
             "success": True,
@@ -461,7 +462,7 @@ class SendWhatsappMessageAPIView(APIView):
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_session().get(url, headers=headers, timeout=10)
             response.raise_for_status()
             return {"success": True, "response": response.json()}
         except requests.exceptions.RequestException as e:
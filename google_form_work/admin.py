@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import GoogleSheet, GoogleFormResponse
+from .models import GoogleSheet, GoogleFormResponse, SheetColumn, SheetStatusWrite
 
 # Register your models here.
 admin.site.register(GoogleSheet)
 admin.site.register(GoogleFormResponse)
+admin.site.register(SheetColumn)
+admin.site.register(SheetStatusWrite)
@@ -1,13 +1,18 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import GoogleSheet, GoogleFormResponse
-from .serializers import GoogleFormResponseSerializer
-from .utils import fetch_google_form_responses
+from rest_framework.settings import api_settings
+from .models import GoogleSheet
+from .serializers import GoogleFormResponseSerializer, build_columnar_payload, columnar_rows
+from .renderers import ColumnarJSONRenderer
+from .utils import sync_sheet_responses
 
 
 class GoogleFormAllSheetsAPIView(APIView):
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [ColumnarJSONRenderer]
+
     def get(self, request):
+        columnar = request.accepted_renderer.format == ColumnarJSONRenderer.format
         sheet_id = request.query_params.get("sheet_id", None)
         all_data = []
         total_forms_count = 0  # Global total count
@@ -17,19 +22,21 @@ class GoogleFormAllSheetsAPIView(APIView):
 
         for sheet in sheets:
             try:
-                # Fetch data live from Google Sheet
-                responses_data = fetch_google_form_responses(sheet.sheet_id)
-                saved_responses = []
-
-                for r in responses_data:
-                    response_id = r.get('Timestamp') or str(hash(frozenset(r.items())))
-                    obj, _ = GoogleFormResponse.objects.get_or_create(
-                        sheet=sheet,
-                        response_id=response_id,
-                        defaults={'data': r}
-                    )
-                    saved_responses.append(obj)
+                # Pull the live sheet into the stored rows, then read every branch from the database
+                sync_sheet_responses(sheet)
+                responses_qs = sheet.responses.order_by("id")
+
+                if columnar:
+                    sheet_data = build_columnar_payload(sheet, columnar_rows(responses_qs))
+                    sheet_count = len(sheet_data["rows"])
+                    total_forms_count += sheet_count
+                    sheet_data["total_responses"] = sheet_count
+                    all_data.append(sheet_data)
+                    continue
 
+                saved_responses = list(responses_qs)
+                for obj in saved_responses:
+                    obj.sheet = sheet  # avoid a sheet lookup per row in the nested serializer
                 serializer = GoogleFormResponseSerializer(saved_responses, many=True)
                 responses = serializer.data
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GoogleFormWorkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'google_form_work'
+
+    def ready(self):
+        import google_form_work.signals  # noqa
@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from google_form_work.models import GoogleSheet
+from google_form_work.utils import sync_sheet_responses
+from restserver.standin.config import StandInConfig
+from restserver.utils.transport import TRANSPORT_STANDIN, use_transport
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Google Sheet, Typeform and WATI ingestion against the offline stand-ins. "
+        "Same --seed gives the same data, latency and failures on every run; DB writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--responses", type=int, default=100_000, help="Synthetic rows per sheet / form")
+        parser.add_argument("--latency-ms", type=float, default=0.0)
+        parser.add_argument("--jitter-ms", type=float, default=0.0)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--messages", type=int, default=200, help="WATI template sends")
+        parser.add_argument("--only", choices=["sheets", "typeform", "wati"], action="append",
+                            help="Run only these benchmarks (repeatable)")
+
+    def handle(self, *args, **options):
+        config = StandInConfig(
+            seed=options["seed"],
+            total_responses=options["responses"],
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+        )
+        selected = options["only"] or ["sheets", "typeform", "wati"]
+        self.stdout.write(
+            f"seed={config.seed} responses={config.total_responses} latency={config.latency_ms}ms "
+            f"jitter={config.jitter_ms}ms error_rate={config.error_rate}"
+        )
+
+        with use_transport(TRANSPORT_STANDIN, config):
+            for name in selected:
+                start = time.perf_counter()
+                try:
+                    summary = getattr(self, f"bench_{name}")(config, options)
+                except Exception as e:
+                    summary = f"failed: {e}"
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"{name:<9} {elapsed * 1000:>10.1f} ms  {summary}")
+
+    # ----- Benchmarks -----
+    def bench_sheets(self, config, options):
+        with transaction.atomic():
+            sheet = GoogleSheet.objects.create(name="stand-in benchmark", sheet_id=f"standin-bench-{config.seed}")
+            fetched, created = sync_sheet_responses(sheet)
+            typed = sheet.responses.first().typed_values.count() if created else 0
+            transaction.set_rollback(True)
+        return f"fetched={fetched} created={created} typed_values_per_row={typed}"
+
+    def bench_typeform(self, config, options):
+        from google_sheet.utils.typeform_utils import iter_typeform_responses
+        from google_sheet.views import map_answers_grouped
+
+        count = 0
+        for item in iter_typeform_responses(f"standin{config.seed}", "standin-token"):
+            map_answers_grouped(item.get("answers", []))
+            count += 1
+        return f"responses={count}"
+
+    def bench_wati(self, config, options):
+        from form_data.views import send_whatsapp_message
+
+        sent = failed = 0
+        for i in range(options["messages"]):
+            result = send_whatsapp_message(f"9198{i:08d}", f"Candidate {i}")
+            if result["success"]:
+                sent += 1
+            else:
+                failed += 1
+        return f"sent={sent} failed={failed}"
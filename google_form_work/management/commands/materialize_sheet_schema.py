@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from google_form_work.models import GoogleSheet
+from google_form_work.schema import materialize_responses, refresh_sheet_schema
+
+
+class Command(BaseCommand):
+    help = "Infer column types for Google Sheets and (re)materialize typed response values."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sheet-id", help="Only process this GoogleSheet.sheet_id")
+
+    def handle(self, *args, **options):
+        sheets = GoogleSheet.objects.all()
+        if options["sheet_id"]:
+            sheets = sheets.filter(sheet_id=options["sheet_id"])
+            if not sheets.exists():
+                raise CommandError(f"Sheet {options['sheet_id']} not found")
+
+        for sheet in sheets:
+            columns, _ = refresh_sheet_schema(sheet)
+            written = materialize_responses(sheet, columns=columns)
+            types = ", ".join(f"{c.header}={c.column_type}" for c in sorted(columns.values(), key=lambda c: c.position))
+            self.stdout.write(f"{sheet.sheet_id}: {len(columns)} columns, {written} values ({types})")
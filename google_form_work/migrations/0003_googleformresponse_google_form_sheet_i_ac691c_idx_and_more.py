@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:47
+
+from django.db import migrations, models
+
+
+GIN_INDEX_NAME = "google_form_response_data_gin"
+
+
+def create_data_gin_index(apps, schema_editor):
+    # jsonb containment (@>) index for ?data.<Header>= filters; Postgres only
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {GIN_INDEX_NAME} "
+        "ON google_form_work_googleformresponse USING gin (data jsonb_path_ops)"
+    )
+
+
+def drop_data_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_form_work', '0002_googleformresponse_current_sattus'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='googleformresponse',
+            index=models.Index(fields=['sheet', 'current_sattus'], name='google_form_sheet_i_ac691c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='googleformresponse',
+            index=models.Index(fields=['sheet', 'created_at'], name='google_form_sheet_i_7e43f7_idx'),
+        ),
+        migrations.RunPython(create_data_gin_index, drop_data_gin_index),
+    ]
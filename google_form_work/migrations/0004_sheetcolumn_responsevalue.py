@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_form_work', '0003_googleformresponse_google_form_sheet_i_ac691c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetColumn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('header', models.CharField(max_length=255)),
+                ('column_type', models.CharField(choices=[('number', 'Number'), ('date', 'Date'), ('enum', 'Enum'), ('email', 'Email'), ('phone', 'Phone'), ('text', 'Text')], default='text', max_length=20)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('enum_values', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sheet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='columns', to='google_form_work.googlesheet')),
+            ],
+            options={
+                'ordering': ['sheet', 'position'],
+                'unique_together': {('sheet', 'header')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ResponseValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('number_value', models.FloatField(blank=True, null=True)),
+                ('date_value', models.DateTimeField(blank=True, null=True)),
+                ('response', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='typed_values', to='google_form_work.googleformresponse')),
+                ('column', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='values', to='google_form_work.sheetcolumn')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['column', 'text_value'], name='google_form_column__674c76_idx'), models.Index(fields=['column', 'number_value'], name='google_form_column__6fd2af_idx'), models.Index(fields=['column', 'date_value'], name='google_form_column__0d5d36_idx')],
+                'unique_together': {('response', 'column')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_form_work', '0004_sheetcolumn_responsevalue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetStatusWrite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+                ('response', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='status_write', to='google_form_work.googleformresponse')),
+                ('sheet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_writes', to='google_form_work.googlesheet')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sheet', 'id'], name='google_form_sheet_i_4467e5_idx')],
+            },
+        ),
+    ]
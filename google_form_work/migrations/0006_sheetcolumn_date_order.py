@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_form_work', '0005_sheetstatuswrite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sheetcolumn',
+            name='date_order',
+            field=models.CharField(blank=True, choices=[('', 'ISO / year first only'), ('dmy', 'Day/Month/Year'), ('mdy', 'Month/Day/Year')], default='', max_length=3),
+        ),
+        migrations.AlterField(
+            model_name='responsevalue',
+            name='column',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='values', to='google_form_work.sheetcolumn'),
+        ),
+        migrations.AlterField(
+            model_name='responsevalue',
+            name='response',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='typed_values', to='google_form_work.googleformresponse'),
+        ),
+        migrations.AlterField(
+            model_name='sheetcolumn',
+            name='sheet',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='columns', to='google_form_work.googlesheet'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_form_work', '0006_sheetcolumn_date_order'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='googleformresponse',
+            name='sheet',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='google_form_work.googlesheet'),
+        ),
+        migrations.AlterField(
+            model_name='sheetstatuswrite',
+            name='sheet',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_writes', to='google_form_work.googlesheet'),
+        ),
+    ]
@@ -10,7 +10,8 @@ class GoogleSheet(models.Model):
 
 
 class GoogleFormResponse(models.Model):
-    sheet = models.ForeignKey(GoogleSheet, on_delete=models.CASCADE, related_name="responses")
+    # unique_together and the indexes below already lead with sheet_id
+    sheet = models.ForeignKey(GoogleSheet, on_delete=models.CASCADE, related_name="responses", db_index=False)
     response_id = models.CharField(max_length=255)
     data = models.JSONField()
     current_sattus = models.CharField(max_length=50, default='Scouting')
@@ -18,6 +19,107 @@ class GoogleFormResponse(models.Model):
 
     class Meta:
         unique_together = ('sheet', 'response_id')
+        indexes = [
+            models.Index(fields=['sheet', 'current_sattus']),
+            models.Index(fields=['sheet', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.sheet.name} - {self.response_id}"
+
+
+class SheetColumn(models.Model):
+    """
+    Inferred schema for one header of a GoogleSheet (see google_form_work.schema).
+    """
+    TYPE_NUMBER = 'number'
+    TYPE_DATE = 'date'
+    TYPE_ENUM = 'enum'
+    TYPE_EMAIL = 'email'
+    TYPE_PHONE = 'phone'
+    TYPE_TEXT = 'text'
+
+    TYPE_CHOICES = [
+        (TYPE_NUMBER, 'Number'),
+        (TYPE_DATE, 'Date'),
+        (TYPE_ENUM, 'Enum'),
+        (TYPE_EMAIL, 'Email'),
+        (TYPE_PHONE, 'Phone'),
+        (TYPE_TEXT, 'Text'),
+    ]
+
+    # how a date column writes numeric dates, inferred once for the whole column
+    DATE_ORDER_NONE = ''
+    DATE_ORDER_DMY = 'dmy'
+    DATE_ORDER_MDY = 'mdy'
+
+    DATE_ORDER_CHOICES = [
+        (DATE_ORDER_NONE, 'ISO / year first only'),
+        (DATE_ORDER_DMY, 'Day/Month/Year'),
+        (DATE_ORDER_MDY, 'Month/Day/Year'),
+    ]
+
+    # unique_together below already indexes sheet_id first
+    sheet = models.ForeignKey(GoogleSheet, on_delete=models.CASCADE, related_name="columns", db_index=False)
+    header = models.CharField(max_length=255)
+    column_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default=TYPE_TEXT)
+    position = models.PositiveIntegerField(default=0)
+    enum_values = models.JSONField(default=list, blank=True)
+    date_order = models.CharField(max_length=3, choices=DATE_ORDER_CHOICES, default=DATE_ORDER_NONE, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('sheet', 'header')
+        ordering = ['sheet', 'position']
+
+    def __str__(self):
+        return f"{self.sheet.name} - {self.header} ({self.column_type})"
+
+
+class ResponseValue(models.Model):
+    """
+    One normalized, typed cell of a GoogleFormResponse, materialized so that
+    equality and range filters hit an index instead of scanning the JSON data.
+    """
+    # both are leading columns of the unique_together / per-column indexes below
+    response = models.ForeignKey(GoogleFormResponse, on_delete=models.CASCADE, related_name="typed_values",
+                                 db_index=False)
+    column = models.ForeignKey(SheetColumn, on_delete=models.CASCADE, related_name="values", db_index=False)
+    text_value = models.CharField(max_length=255, null=True, blank=True)
+    number_value = models.FloatField(null=True, blank=True)
+    date_value = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('response', 'column')
+        indexes = [
+            models.Index(fields=['column', 'text_value']),
+            models.Index(fields=['column', 'number_value']),
+            models.Index(fields=['column', 'date_value']),
+        ]
+
+    def __str__(self):
+        return f"{self.column.header}={self.text_value}"
+
+
+class SheetStatusWrite(models.Model):
+    """
+    Pending status write-back for one response (see google_form_work.writeback).
+    One row per response: later changes overwrite `status` and bump `version`,
+    so a flush only ever sends the latest value.
+    """
+    # the (sheet, id) index below already indexes sheet_id first
+    sheet = models.ForeignKey(GoogleSheet, on_delete=models.CASCADE, related_name="status_writes", db_index=False)
+    response = models.OneToOneField(GoogleFormResponse, on_delete=models.CASCADE, related_name="status_write")
+    status = models.CharField(max_length=50)
+    version = models.PositiveIntegerField(default=1)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sheet', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.sheet.name} - {self.response.response_id} -> {self.status}"
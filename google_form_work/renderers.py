@@ -0,0 +1,9 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Plain JSON renderer selected with ?format=columnar.
+    Views check request.accepted_renderer.format to build the compact payload.
+    """
+    format = "columnar"
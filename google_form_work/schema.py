@@ -0,0 +1,376 @@
+"""
+Per-sheet schema registry for Google Form responses.
+
+refresh_sheet_schema() infers a type for every header from its name and a
+sample of stored values; materialize_responses() writes the normalized value
+of each cell into ResponseValue, which is indexed per column for equality and
+range queries (see filter_by_typed_columns).
+"""
+import re
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ResponseValue, SheetColumn
+
+SAMPLE_SIZE = 500
+MATCH_RATIO = 0.9          # share of non-empty samples that must parse as the type
+ENUM_MAX_DISTINCT = 20
+ENUM_MAX_RATIO = 0.5       # distinct / non-empty samples
+TEXT_MAX_LENGTH = 255      # ResponseValue.text_value
+
+# header substrings that suggest a type; still checked against the sample values
+HEADER_HINTS = [
+    (SheetColumn.TYPE_EMAIL, ("email", "e-mail", "mail id")),
+    (SheetColumn.TYPE_PHONE, ("phone", "mobile", "contact number", "whatsapp")),
+    (SheetColumn.TYPE_DATE, ("timestamp", "date", "dob")),
+    (SheetColumn.TYPE_NUMBER, ("experience", "ctc", "salary", "percentage", "notice period",
+                               "age", "years", "cgpa", "score", "rating")),
+]
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_RE = re.compile(r"^\+?[\d\s\-().]{7,20}$")
+NUMBER_RE = re.compile(
+    r"^\s*(?:₹|rs\.?|inr|\$)?\s*(-?\d[\d,]*(?:\.\d+)?)\s*\+?\s*(?:%|[a-z. ]{0,12})?\s*$",
+    re.IGNORECASE,
+)
+# day/month/year or month/day/year, with an optional time; which one is decided per column
+NUMERIC_DATE_RE = re.compile(r"^(\d{1,2})[/-](\d{1,2})[/-](\d{4})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?$")
+DATE_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y/%m/%d")   # year-first: never ambiguous
+
+RANGE_OPERATORS = ("gte", "gt", "lte", "lt")
+
+
+# --------------------------
+# Normalizers (return None when the value does not fit the type)
+# --------------------------
+def _clean(value):
+    if value is None:
+        return ""
+    return " ".join(str(value).split())
+
+
+def normalize_number(value):
+    match = NUMBER_RE.match(_clean(value))
+    if not match:
+        return None
+    try:
+        return float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def normalize_date(value, order=SheetColumn.DATE_ORDER_NONE):
+    """
+    ISO and year-first values always parse. Numeric day/month values parse only
+    with the column's `order` (SheetColumn.DATE_ORDER_*); see infer_date_order.
+    """
+    value = _clean(value)
+    if not value:
+        return None
+    parsed = None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        for fmt in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+    if parsed is None and order in (SheetColumn.DATE_ORDER_DMY, SheetColumn.DATE_ORDER_MDY):
+        match = NUMERIC_DATE_RE.match(value)
+        if match:
+            first, second, year, hour, minute, sec = (int(g) if g else 0 for g in match.groups())
+            day, month = (first, second) if order == SheetColumn.DATE_ORDER_DMY else (second, first)
+            try:
+                parsed = datetime(year, month, day, hour, minute, sec)
+            except ValueError:
+                parsed = None
+    if parsed is None:
+        return None
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def normalize_email(value):
+    value = _clean(value).lower()
+    return value if EMAIL_RE.match(value) else None
+
+
+def normalize_phone(value):
+    value = _clean(value)
+    if not PHONE_RE.match(value):
+        return None
+    digits = re.sub(r"\D", "", value)
+    if not 7 <= len(digits) <= 15:
+        return None
+    return ("+" if value.startswith("+") else "") + digits
+
+
+def normalize_text(value):
+    value = _clean(value).casefold()
+    return value[:TEXT_MAX_LENGTH] or None
+
+
+NORMALIZERS = {
+    SheetColumn.TYPE_NUMBER: normalize_number,
+    SheetColumn.TYPE_DATE: normalize_date,
+    SheetColumn.TYPE_EMAIL: normalize_email,
+    SheetColumn.TYPE_PHONE: normalize_phone,
+    SheetColumn.TYPE_ENUM: normalize_text,
+    SheetColumn.TYPE_TEXT: normalize_text,
+}
+
+
+def normalize_value(column, value):
+    """The typed value of one cell of `column`, or None."""
+    if column.column_type == SheetColumn.TYPE_DATE:
+        return normalize_date(value, column.date_order)
+    return NORMALIZERS[column.column_type](value)
+
+
+# --------------------------
+# Inference
+# --------------------------
+def infer_date_order(values):
+    """
+    How a column writes numeric dates, decided once from all its values:
+    DATE_ORDER_DMY if some first field is over 12, DATE_ORDER_MDY if some second
+    field is, DATE_ORDER_NONE if no value is a numeric day/month date. None when
+    it cannot be told (every field <= 12) or the values contradict each other;
+    such a column is not a date column.
+    """
+    numeric = first_over = second_over = False
+    for value in values:
+        match = NUMERIC_DATE_RE.match(_clean(value))
+        if not match:
+            continue
+        numeric = True
+        first_over |= int(match.group(1)) > 12
+        second_over |= int(match.group(2)) > 12
+    if not numeric:
+        return SheetColumn.DATE_ORDER_NONE
+    if first_over == second_over:
+        return None
+    return SheetColumn.DATE_ORDER_DMY if first_over else SheetColumn.DATE_ORDER_MDY
+
+
+def _matches(column_type, values, date_order=SheetColumn.DATE_ORDER_NONE):
+    if column_type == SheetColumn.TYPE_DATE:
+        ok = sum(1 for v in values if normalize_date(v, date_order) is not None)
+    else:
+        normalize = NORMALIZERS[column_type]
+        ok = sum(1 for v in values if normalize(v) is not None)
+    return ok >= MATCH_RATIO * len(values)
+
+
+def infer_column_type(header, values):
+    """
+    Returns (column_type, enum_values, date_order) for a header and its sample values.
+    """
+    values = [v for v in values if _clean(v)]
+    if not values:
+        return SheetColumn.TYPE_TEXT, [], SheetColumn.DATE_ORDER_NONE
+
+    date_order = infer_date_order(values)
+
+    def fits(column_type):
+        if column_type == SheetColumn.TYPE_DATE:
+            return date_order is not None and _matches(column_type, values, date_order)
+        return _matches(column_type, values)
+
+    def result(column_type):
+        order = date_order if column_type == SheetColumn.TYPE_DATE else SheetColumn.DATE_ORDER_NONE
+        return column_type, [], order
+
+    lowered = header.lower()
+    for column_type, hints in HEADER_HINTS:
+        if any(h in lowered for h in hints) and fits(column_type):
+            return result(column_type)
+
+    # phone before number: a 10 digit value is far more likely a phone than a count
+    for column_type in (SheetColumn.TYPE_EMAIL, SheetColumn.TYPE_PHONE, SheetColumn.TYPE_DATE, SheetColumn.TYPE_NUMBER):
+        if column_type == SheetColumn.TYPE_PHONE and not all(
+            len(re.sub(r"\D", "", _clean(v))) >= 7 for v in values
+        ):
+            continue
+        if fits(column_type):
+            return result(column_type)
+
+    distinct = {normalize_text(v) for v in values}
+    if len(values) >= 4 and len(distinct) <= ENUM_MAX_DISTINCT and len(distinct) <= ENUM_MAX_RATIO * len(values):
+        return SheetColumn.TYPE_ENUM, sorted(distinct), SheetColumn.DATE_ORDER_NONE
+
+    return SheetColumn.TYPE_TEXT, [], SheetColumn.DATE_ORDER_NONE
+
+
+def refresh_sheet_schema(sheet, sample_size=SAMPLE_SIZE):
+    """
+    (Re)infer column types from the most recent responses.
+    Returns (columns_by_header, changed) where changed is True if any type moved,
+    in which case stored values should be re-materialized.
+    """
+    samples = sheet.responses.order_by("-id").values_list("data", flat=True)[:sample_size]
+
+    headers = {}
+    for data in samples:
+        if not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            headers.setdefault(key, []).append(value)
+
+    existing = {c.header: c for c in sheet.columns.all()}
+    changed = False
+    to_create, to_update = [], []
+
+    for position, (header, values) in enumerate(headers.items()):
+        column_type, enum_values, date_order = infer_column_type(header, values)
+        column = existing.get(header)
+        if column is None:
+            column = SheetColumn(sheet=sheet, header=header, column_type=column_type,
+                                 position=position, enum_values=enum_values, date_order=date_order)
+            to_create.append(column)
+            existing[header] = column
+            changed = True
+            continue
+        if (column.column_type, column.date_order) != (column_type, date_order):
+            changed = True
+        new = (column_type, position, enum_values, date_order)
+        if (column.column_type, column.position, column.enum_values, column.date_order) != new:
+            column.column_type, column.position, column.enum_values, column.date_order = new
+            to_update.append(column)
+
+    with transaction.atomic():
+        SheetColumn.objects.bulk_create(to_create)
+        SheetColumn.objects.bulk_update(to_update, ["column_type", "position", "enum_values", "date_order"])
+
+    if to_create and to_create[0].pk is None:
+        existing = {c.header: c for c in sheet.columns.all()}
+    return existing, changed
+
+
+# --------------------------
+# Materialization
+# --------------------------
+def build_typed_values(response_pk, data, columns):
+    rows = []
+    for header, value in (data or {}).items():
+        column = columns.get(header)
+        if column is None or not _clean(value):
+            continue
+        typed = normalize_value(column, value)
+        row = ResponseValue(response_id=response_pk, column=column, text_value=normalize_text(value))
+        if column.column_type == SheetColumn.TYPE_NUMBER:
+            row.number_value = typed
+        elif column.column_type == SheetColumn.TYPE_DATE:
+            row.date_value = typed
+        elif column.column_type in (SheetColumn.TYPE_EMAIL, SheetColumn.TYPE_PHONE) and typed:
+            row.text_value = typed
+        rows.append(row)
+    return rows
+
+
+def materialize_responses(sheet, responses=None, columns=None, batch_size=1000):
+    """
+    Replace the typed values of `responses` (default: every response of the sheet).
+    Returns the number of ResponseValue rows written.
+    """
+    if columns is None:
+        columns = {c.header: c for c in sheet.columns.all()}
+    if responses is None:
+        responses = sheet.responses.all()
+
+    written = 0
+    batch = []
+    pks = []
+
+    def flush():
+        nonlocal written, batch, pks
+        with transaction.atomic():
+            ResponseValue.objects.filter(response_id__in=pks).delete()
+            ResponseValue.objects.bulk_create(batch, batch_size=batch_size)
+        written += len(batch)
+        batch, pks = [], []
+
+    for pk, data in responses.values_list("id", "data").iterator(chunk_size=batch_size):
+        pks.append(pk)
+        batch.extend(build_typed_values(pk, data, columns))
+        if len(pks) >= batch_size:
+            flush()
+    if pks:
+        flush()
+    return written
+
+
+def sync_sheet_schema(sheet, responses=None):
+    """
+    Refresh the schema and materialize typed values. When inferred types moved,
+    the whole sheet is re-materialized; otherwise only `responses`.
+    """
+    columns, changed = refresh_sheet_schema(sheet)
+    return materialize_responses(sheet, None if changed else responses, columns)
+
+
+# --------------------------
+# Querying
+# --------------------------
+def _parse_typed(column, raw):
+    if column.column_type == SheetColumn.TYPE_NUMBER:
+        value = normalize_number(raw)
+        field = "number_value"
+    elif column.column_type == SheetColumn.TYPE_DATE:
+        value = normalize_date(raw, column.date_order)
+        field = "date_value"
+    elif column.column_type == SheetColumn.TYPE_EMAIL:
+        value = normalize_email(raw)
+        field = "text_value"
+    elif column.column_type == SheetColumn.TYPE_PHONE:
+        value = normalize_phone(raw)
+        field = "text_value"
+    else:
+        value = normalize_text(raw)
+        field = "text_value"
+    if value is None:
+        raise ValueError(f"'{raw}' is not a valid {column.column_type} for '{column.header}'")
+    return field, value
+
+
+def filter_by_typed_columns(sheet, qs, filters):
+    """
+    filters: iterable of (header, operator, raw_value); operator is None for equality
+    or one of RANGE_OPERATORS. Each filter becomes an indexed
+    (column_id, <typed value>) lookup on ResponseValue.
+    """
+    filters = list(filters)
+    if not filters:
+        return qs
+
+    columns = {c.header: c for c in sheet.columns.all()}
+    for header, operator, raw in filters:
+        column = columns.get(header)
+        if column is None:
+            raise ValueError(f"Unknown column '{header}'")
+        field, value = _parse_typed(column, raw)
+
+        if operator is None:
+            if field == "date_value" and len(str(raw).strip()) <= 10:
+                # bare date: match the whole day
+                lookup = {"date_value__gte": value, "date_value__lt": value + timedelta(days=1)}
+            else:
+                lookup = {field: value}
+        else:
+            if operator not in RANGE_OPERATORS:
+                raise ValueError(f"Unsupported operator '{operator}'")
+            if field == "text_value":
+                raise ValueError(f"Range filters need a number or date column, '{header}' is {column.column_type}")
+            lookup = {f"{field}__{operator}": value}
+
+        qs = qs.filter(pk__in=ResponseValue.objects.filter(column=column, **lookup).values("response_id"))
+    return qs
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import GoogleSheet, GoogleFormResponse
+from .models import GoogleSheet, GoogleFormResponse, SheetColumn
 
 class GoogleSheetSerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,3 +13,54 @@ class GoogleFormResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = GoogleFormResponse
         fields = '__all__'
+
+
+class SheetColumnSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SheetColumn
+        fields = ['id', 'header', 'column_type', 'date_order', 'position', 'enum_values', 'updated_at']
+
+
+# ============================
+# Columnar (?format=columnar)
+# ============================
+COLUMNAR_FIELDS = ["id", "response_id", "current_sattus", "created_at"]
+
+_datetime_field = serializers.DateTimeField()
+
+
+def columnar_rows(responses):
+    """values_list rows for a GoogleFormResponse queryset, in COLUMNAR_FIELDS order plus data."""
+    return responses.values_list(*COLUMNAR_FIELDS, "data")
+
+
+def build_columnar_payload(sheet, rows):
+    """
+    Sheet metadata once, one header array and one array per row.
+    `rows` are tuples from columnar_rows() (a queryset or a paginated slice of it),
+    so no model instances or nested serializers are built.
+    """
+    rows = list(rows)
+
+    headers = {}
+    for row in rows:
+        if isinstance(row[-1], dict):
+            for key in row[-1]:
+                headers.setdefault(key, None)
+    headers = list(headers)
+
+    to_datetime = _datetime_field.to_representation
+    data_rows = []
+    for pk, response_id, current_status, created_at, data in rows:
+        data = data if isinstance(data, dict) else {}
+        data_rows.append(
+            [pk, response_id, current_status, to_datetime(created_at) if created_at else None]
+            + [data.get(h) for h in headers]
+        )
+
+    return {
+        "sheet": GoogleSheetSerializer(sheet).data,
+        "columns": COLUMNAR_FIELDS,
+        "headers": headers,
+        "rows": data_rows,
+    }
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from .models import GoogleFormResponse
+from .writeback import enqueue_status_write
+
+
+# ----- Status write-back -----
+# Remember the loaded status so saves that do not change it queue nothing.
+# A deferred status is remembered as None: save() does not write deferred
+# fields, so such saves are skipped too.
+
+@receiver(post_init, sender=GoogleFormResponse)
+def remember_response_status(sender, instance, **kwargs):
+    instance._loaded_status = instance.__dict__.get("current_sattus")
+
+
+@receiver(post_save, sender=GoogleFormResponse)
+def queue_response_status(sender, instance, created, **kwargs):
+    if created or instance._loaded_status in (None, instance.current_sattus):
+        return
+    enqueue_status_write(instance, instance.current_sattus)
+    instance._loaded_status = instance.current_sattus
+
+
+@receiver(post_init, sender="profile_details.CandidateDetails")
+def remember_candidate_status(sender, instance, **kwargs):
+    instance._loaded_status = instance.__dict__.get("current_status")
+
+
+@receiver(post_save, sender="profile_details.CandidateDetails")
+def queue_candidate_status(sender, instance, created, **kwargs):
+    if not created and instance._loaded_status in (None, instance.current_status):
+        return
+    enqueue_status_write(instance.TypeformAnswer, instance.get_current_status_display())
+    instance._loaded_status = instance.current_status
@@ -0,0 +1,77 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from .models import GoogleSheet
+from .utils import sync_sheet_responses
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def sync_google_sheet_responses(self, sheet_pk):
+    try:
+        sheet = GoogleSheet.objects.get(pk=sheet_pk)
+        fetched, created = sync_sheet_responses(sheet)
+        return {"status": "success", "sheet_id": sheet.sheet_id, "fetched": fetched, "created": created}
+
+    except GoogleSheet.DoesNotExist:
+        logger.warning(f"Google sheet {sheet_pk} no longer exists, skipping sync")
+        return {"status": "missing", "sheet_pk": sheet_pk}
+    except Exception as exc:
+        logger.error(f"Error syncing google sheet {sheet_pk}: {exc}")
+        self.retry(exc=exc, countdown=10)
+
+
+def sync_marker(sheet_pk):
+    return f"sheet_sync_queued:{sheet_pk}"
+
+
+def sync_if_stale(sheet):
+    """
+    Queue sync_google_sheet_responses unless the sheet was synced or queued in the
+    last SHEET_SYNC_TTL seconds. Callers keep serving the stored rows meanwhile.
+    """
+    key = sync_marker(sheet.pk)
+    if not cache.add(key, 1, timeout=settings.SHEET_SYNC_TTL):
+        return False
+    try:
+        sync_google_sheet_responses.delay(sheet.pk)
+    except Exception as exc:
+        # broker unavailable: let the next request try again
+        cache.delete(key)
+        logger.error(f"Could not queue sync for google sheet {sheet.sheet_id}: {exc}")
+        return False
+    return True
+
+
+@shared_task(bind=True, max_retries=3)
+def flush_sheet_status_writes(self, sheet_pk=None):
+    """
+    Periodic (CELERY_BEAT_SCHEDULE) flush of queued status write-backs, one
+    values.batchUpdate per sheet. Writes are absolute values, so retrying is safe.
+    """
+    from django.core.cache import cache
+    from .writeback import MAX_ATTEMPTS, flush_sheet
+
+    sheets = GoogleSheet.objects.filter(status_writes__attempts__lt=MAX_ATTEMPTS).distinct()
+    if sheet_pk is not None:
+        sheets = sheets.filter(pk=sheet_pk)
+
+    reports, failed = [], []
+    for sheet in sheets:
+        lock = f"sheet_writeback_lock:{sheet.pk}"
+        if not cache.add(lock, 1, timeout=300):
+            continue
+        try:
+            reports.append(flush_sheet(sheet))
+        except Exception as exc:
+            logger.error(f"Error flushing status write-back for sheet {sheet.sheet_id}: {exc}")
+            failed.append(sheet.pk)
+        finally:
+            cache.delete(lock)
+
+    # failed rows stay queued; the periodic run picks them up again, a targeted call retries now
+    if failed and sheet_pk is not None:
+        self.retry(countdown=10)
+    return {"status": "success" if not failed else "partial", "flushed": reports, "failed": failed}
@@ -1,3 +1,319 @@
+from itertools import count
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from restserver.standin import services as standin_services
+from restserver.standin.config import StandInConfig
+from restserver.testing import QueryBudgetMixin
+from restserver.utils.transport import use_transport
+from superadmin.models import UserProfile
+
+from . import writeback
+from .models import GoogleFormResponse, GoogleSheet, ResponseValue, SheetColumn, SheetStatusWrite
+from .schema import (
+    infer_column_type, infer_date_order, materialize_responses, normalize_date, normalize_number, normalize_phone,
+    refresh_sheet_schema, sync_sheet_schema,
+)
+from .serializers import build_columnar_payload, columnar_rows
+from .tasks import flush_sheet_status_writes, sync_google_sheet_responses
+from .utils import sync_sheet_responses
+from .writeback import enqueue_status_write, flush_sheet
+
+_seq = count()
+
+
+def make_sheets(n):
+    for _ in range(n):
+        i = next(_seq)
+        GoogleSheet.objects.create(name=f"Sheet {i}", sheet_id=f"sheet-{i}")
+
+
+class GoogleSheetQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        make_sheets(3)
+
+    def test_sheets_list(self):
+        self.assertQueryBudget(1, "/api/google_form_work/sheets/", grow=lambda: make_sheets(10))
+
+
+class ColumnarResponsesTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.sheet = GoogleSheet.objects.create(name="Backend", sheet_id="sheet-columnar")
+        GoogleFormResponse.objects.create(sheet=cls.sheet, response_id="r1", data={"Name": "Asha", "Email": "a@x.in"})
+        GoogleFormResponse.objects.create(sheet=cls.sheet, response_id="r2", data={"Name": "Ravi", "City": "Pune"},
+                                          current_sattus="Ongoing")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        # GET queues a background sync; keep it off the broker
+        patcher = mock.patch.object(sync_google_sheet_responses, "delay")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_payload_shape(self):
+        payload = build_columnar_payload(self.sheet, columnar_rows(self.sheet.responses.order_by("id")))
+        self.assertEqual(payload["sheet"]["sheet_id"], "sheet-columnar")
+        self.assertEqual(payload["columns"], ["id", "response_id", "current_sattus", "created_at"])
+        # headers in first-seen order across rows; missing cells are None
+        self.assertEqual(payload["headers"], ["Name", "Email", "City"])
+        first, second = payload["rows"]
+        self.assertEqual(first[1:3] + first[4:], ["r1", "Scouting", "Asha", "a@x.in", None])
+        self.assertEqual(second[1:3] + second[4:], ["r2", "Ongoing", "Ravi", None, "Pune"])
+
+    def test_columnar_format_param(self):
+        response = self.client.get("/api/google_form_work/sheets/sheet-columnar/?format=columnar")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]["rows"]), 2)
+
+    def test_default_format_unchanged(self):
+        response = self.client.get("/api/google_form_work/sheets/sheet-columnar/")
+        self.assertEqual(response.status_code, 200)
+        row = response.data["results"][0]
+        self.assertEqual(row["sheet"]["sheet_id"], "sheet-columnar")
+        self.assertEqual(row["data"], {"Name": "Asha", "Email": "a@x.in"})
+
+
+class ResponseSyncTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.sheet = GoogleSheet.objects.create(name="Backend", sheet_id="sheet-sync")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = "/api/google_form_work/sheets/sheet-sync/"
+
+    def test_get_queues_sync_once_per_ttl(self):
+        with mock.patch.object(sync_google_sheet_responses, "delay") as delay:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.client.get(self.url)
+        delay.assert_called_once_with(self.sheet.pk)
+
+    def test_get_retries_queueing_when_broker_is_down(self):
+        with mock.patch.object(sync_google_sheet_responses, "delay", side_effect=ConnectionError("no broker")) as delay:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.client.get(self.url)
+        self.assertEqual(delay.call_count, 2)
+
+    def test_post_syncs_and_resets_ttl(self):
+        with use_transport("standin", StandInConfig(total_responses=5)):
+            response = self.client.post(self.url)
+            again = self.client.post(self.url)
+        self.assertEqual((response.data["fetched"], response.data["created"]), (5, 5))
+        self.assertEqual(again.data["created"], 0)
+        with mock.patch.object(sync_google_sheet_responses, "delay") as delay:
+            self.client.get(self.url)
+        delay.assert_not_called()
+
+    def test_task_stores_new_responses(self):
+        with use_transport("standin", StandInConfig(total_responses=4)):
+            result = sync_google_sheet_responses.apply(args=[self.sheet.pk]).get()
+        self.assertEqual(result["created"], 4)
+        self.assertEqual(self.sheet.responses.count(), 4)
+
+    def test_filters_and_pagination(self):
+        for i, state in enumerate(["Scouting", "Ongoing", "Ongoing"]):
+            GoogleFormResponse.objects.create(sheet=self.sheet, response_id=f"f{i}", data={"Role": f"R{i % 2}"},
+                                              current_sattus=state)
+        with mock.patch.object(sync_google_sheet_responses, "delay"):
+            by_status = self.client.get(self.url, {"status": "Ongoing"})
+            by_header = self.client.get(self.url, {"data.Role": "R0"})
+            paged = self.client.get(self.url, {"page_size": 2})
+            bad = self.client.get(self.url, {"created_after": "yesterday"})
+        self.assertEqual(by_status.data["count"], 2)
+        self.assertEqual({r["response_id"] for r in by_header.data["results"]}, {"f0", "f2"})
+        self.assertEqual((paged.data["count"], len(paged.data["results"])), (3, 2))
+        self.assertEqual(bad.status_code, 400)
+
+    def test_all_sheets_reads_stored_rows_in_both_formats(self):
+        GoogleFormResponse.objects.create(sheet=self.sheet, response_id="kept", data={"Role": "SDET"})
+        with use_transport("standin", StandInConfig(total_responses=3)):
+            plain = self.client.get("/api/google_form_work/google_forms/", {"sheet_id": "sheet-sync"})
+            columnar = self.client.get("/api/google_form_work/google_forms/",
+                                       {"sheet_id": "sheet-sync", "format": "columnar"})
+        self.assertEqual(plain.data["total_form_fills"], 4)
+        self.assertEqual(columnar.data["total_form_fills"], 4)
+        self.assertEqual([r["id"] for r in plain.data["data"][0]["responses"]],
+                         [row[0] for row in columnar.data["data"][0]["rows"]])
+
+
+class SheetSchemaTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.sheet = GoogleSheet.objects.create(name="Backend", sheet_id="sheet-schema")
+
+    def add(self, *rows):
+        for row in rows:
+            GoogleFormResponse.objects.create(sheet=self.sheet, response_id=f"r{next(_seq)}", data=row)
+
+    def test_normalizers(self):
+        self.assertEqual(normalize_number("₹ 12,50,000"), 1250000.0)
+        self.assertEqual(normalize_number("7.5 LPA"), 7.5)
+        self.assertEqual(normalize_number("3+ years"), 3.0)
+        self.assertIsNone(normalize_number("fresher"))
+        self.assertEqual(normalize_phone("+91 98765-43210"), "+919876543210")
+        self.assertIsNone(normalize_phone("12345"))
+
+    def test_date_order_is_decided_per_column(self):
+        self.assertEqual(infer_date_order(["05/03/2024 14:22:10", "25/03/2024 09:00:00"]), SheetColumn.DATE_ORDER_DMY)
+        self.assertEqual(infer_date_order(["05/03/2024", "03/25/2024"]), SheetColumn.DATE_ORDER_MDY)
+        self.assertEqual(infer_date_order(["2024-03-05"]), SheetColumn.DATE_ORDER_NONE)
+        # every field <= 12, or both orders seen: cannot tell
+        self.assertIsNone(infer_date_order(["05/03/2024", "01/02/2024"]))
+        self.assertIsNone(infer_date_order(["25/03/2024", "03/25/2024"]))
+
+        day = normalize_date("05/03/2024 14:22:10", SheetColumn.DATE_ORDER_DMY)
+        self.assertEqual((day.year, day.month, day.day, day.hour), (2024, 3, 5, 14))
+        self.assertEqual(normalize_date("05/03/2024", SheetColumn.DATE_ORDER_MDY).month, 5)
+        self.assertIsNone(normalize_date("05/03/2024"))
+        self.assertEqual(normalize_date("2024-03-05").day, 5)
+
+    def test_inference(self):
+        self.assertEqual(infer_column_type("Timestamp", ["05/03/2024 10:00:00", "25/03/2024 11:00:00"]),
+                         (SheetColumn.TYPE_DATE, [], SheetColumn.DATE_ORDER_DMY))
+        self.assertEqual(infer_column_type("Timestamp", ["05/03/2024 10:00:00", "01/02/2024 11:00:00"])[0],
+                         SheetColumn.TYPE_TEXT)
+        self.assertEqual(infer_column_type("Email Address", ["a@x.in", "B@Y.COM"])[0], SheetColumn.TYPE_EMAIL)
+        self.assertEqual(infer_column_type("Mobile", ["9876543210", "+91 9123456789"])[0], SheetColumn.TYPE_PHONE)
+        self.assertEqual(infer_column_type("Current CTC", ["7 LPA", "12.5 LPA", "₹9,00,000"])[0],
+                         SheetColumn.TYPE_NUMBER)
+        self.assertEqual(infer_column_type("Location", ["Pune", "Delhi", "pune", "Delhi", "Pune"])[:2],
+                         (SheetColumn.TYPE_ENUM, ["delhi", "pune"]))
+        self.assertEqual(infer_column_type("Comments", ["ok", "", None])[0], SheetColumn.TYPE_TEXT)
+
+    def test_materialize_and_typed_filters(self):
+        self.add(
+            {"Timestamp": "05/03/2024 10:00:00", "Experience": "2 years", "Email": "A@X.in"},
+            {"Timestamp": "25/03/2024 10:00:00", "Experience": "6 years", "Email": "b@x.in"},
+            {"Timestamp": "02/04/2024 10:00:00", "Experience": "9", "Email": "c@x.in"},
+        )
+        sync_sheet_schema(self.sheet)
+        timestamp = self.sheet.columns.get(header="Timestamp")
+        self.assertEqual((timestamp.column_type, timestamp.date_order), (SheetColumn.TYPE_DATE, "dmy"))
+        self.assertEqual(ResponseValue.objects.filter(column__sheet=self.sheet).count(), 9)
+
+        self.client.force_authenticate(self.user)
+        url = "/api/google_form_work/sheets/sheet-schema/"
+        with mock.patch.object(sync_google_sheet_responses, "delay"):
+            march = self.client.get(url, {"field.Timestamp__gte": "2024-03-01", "field.Timestamp__lt": "2024-04-01"})
+            senior = self.client.get(url, {"field.Experience__gte": "5"})
+            email = self.client.get(url, {"field.Email": "a@x.in"})
+            day = self.client.get(url, {"field.Timestamp": "2024-03-05"})
+            bad = self.client.get(url, {"field.Email__gte": "a"})
+        self.assertEqual(march.data["count"], 2)
+        self.assertEqual(senior.data["count"], 2)
+        self.assertEqual(email.data["count"], 1)
+        self.assertEqual(day.data["count"], 1)
+        self.assertEqual(bad.status_code, 400)
+
+    def test_order_change_rematerializes(self):
+        self.add({"Date": "05/03/2024"}, {"Date": "03/25/2024"})
+        columns, changed = refresh_sheet_schema(self.sheet)
+        self.assertTrue(changed)
+        materialize_responses(self.sheet, columns=columns)
+        self.assertEqual(columns["Date"].date_order, SheetColumn.DATE_ORDER_MDY)
+
+        self.sheet.responses.filter(data__Date="03/25/2024").update(data={"Date": "25/03/2024"})
+        columns, changed = refresh_sheet_schema(self.sheet)
+        self.assertTrue(changed)
+        self.assertEqual(columns["Date"].date_order, SheetColumn.DATE_ORDER_DMY)
+
+
+class StatusWriteBackTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.sheet = GoogleSheet.objects.create(name="Backend", sheet_id="sheet-writeback")
+        with use_transport("standin", StandInConfig(total_responses=6)):
+            sync_sheet_responses(cls.sheet)
+
+    def setUp(self):
+        standin_services.SHEET_WRITES.clear()
+        self.responses = list(self.sheet.responses.order_by("id"))
+
+    def set_status(self, index, value):
+        response = GoogleFormResponse.objects.get(pk=self.responses[index].pk)
+        response.current_sattus = value
+        response.save()
+
+    def flush(self, **config):
+        with use_transport("standin", StandInConfig(total_responses=6, **config)):
+            return flush_sheet(self.sheet)
+
+    def test_only_changes_are_queued_latest_wins(self):
+        self.responses[0].save()                      # unchanged status
+        self.assertFalse(SheetStatusWrite.objects.exists())
+
+        self.set_status(0, "Ongoing")
+        self.set_status(0, "Hired")
+        write = SheetStatusWrite.objects.get()
+        self.assertEqual((write.status, write.version), ("Hired", 2))
+
+    def test_flush_sends_one_batch_with_merged_ranges(self):
+        for index in (0, 1, 2, 4):
+            self.set_status(index, "Ongoing")
+        report = self.flush()
+
+        self.assertEqual((report["batch_size"], report["unmatched"]), (4, 0))
+        [body] = standin_services.SHEET_WRITES["sheet-writeback"]
+        # no Status column yet: header in K1, then rows 2-4 as one range (merged with K1) and row 6
+        self.assertEqual([entry["range"] for entry in body["data"]],
+                         ["Form Responses 1!K1:K4", "Form Responses 1!K6:K6"])
+        self.assertEqual(body["data"][0]["values"], [["Status"], ["Ongoing"], ["Ongoing"], ["Ongoing"]])
+        self.assertFalse(SheetStatusWrite.objects.exists())
+        self.assertEqual(self.flush()["batch_size"], 0)
+
+    def test_change_during_flush_stays_queued(self):
+        self.set_status(0, "Ongoing")
+        real_runs = writeback._row_runs
+
+        def change_mid_flush(cells):
+            self.set_status(0, "Hired")
+            return real_runs(cells)
+
+        with mock.patch.object(writeback, "_row_runs", side_effect=change_mid_flush):
+            self.flush()
+        write = SheetStatusWrite.objects.get()
+        self.assertEqual((write.status, write.version), ("Hired", 2))
+
+    def test_failures_are_recorded_and_capped(self):
+        self.set_status(0, "Ongoing")
+        # googleapiclient backs off between its num_retries attempts
+        with mock.patch("googleapiclient.http.time.sleep"):
+            for _ in range(writeback.MAX_ATTEMPTS):
+                with self.assertRaises(Exception):
+                    self.flush(error_rate=1.0)
+        write = SheetStatusWrite.objects.get()
+        self.assertEqual(write.attempts, writeback.MAX_ATTEMPTS)
+        self.assertIn("503", write.last_error)
+        # exhausted rows are no longer sent
+        self.assertEqual(self.flush()["batch_size"], 0)
+
+    def test_unmatched_rows_count_an_attempt(self):
+        orphan = GoogleFormResponse.objects.create(sheet=self.sheet, response_id="not-in-sheet", data={})
+        enqueue_status_write(orphan, "Ongoing")
+        report = self.flush()
+        self.assertEqual(report["unmatched"], 1)
+        self.assertEqual(SheetStatusWrite.objects.get().attempts, 1)
 
-# Create your tests here.
+    def test_periodic_task(self):
+        self.set_status(3, "Reject")
+        with use_transport("standin", StandInConfig(total_responses=6)):
+            result = flush_sheet_status_writes.apply().get()
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["flushed"][0]["batch_size"], 1)
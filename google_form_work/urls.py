@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import GoogleSheetAPIView, GoogleFormResponsesAPIView
+from .views import GoogleSheetAPIView, GoogleFormResponsesAPIView, GoogleSheetSchemaAPIView
 from .allviews import GoogleFormAllSheetsAPIView
 
 urlpatterns = [
     path('sheets/', GoogleSheetAPIView.as_view(), name='sheets-list-create'),
     path('sheets/<str:sheet_id>/', GoogleFormResponsesAPIView.as_view(), name='google-form-responses'),
+    path('sheets/<str:sheet_id>/schema/', GoogleSheetSchemaAPIView.as_view(), name='google-sheet-schema'),
     path("google_forms/", GoogleFormAllSheetsAPIView.as_view(), name="google_form_all_sheets"),
 ]
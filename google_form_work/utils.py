@@ -1,13 +1,13 @@
 import os
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+
+from restserver.utils.transport import sheets_service
 
 SERVICE_ACCOUNT_FILE = "gxihiring-d7185498ec0f.json"
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+WRITE_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
 def fetch_google_form_responses(sheet_id, range_name='Form Responses 1!A:Z'):
-    creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    service = build('sheets', 'v4', credentials=creds)
+    service = sheets_service(SERVICE_ACCOUNT_FILE, SCOPES)
     sheet = service.spreadsheets()
     result = sheet.values().get(spreadsheetId=sheet_id, range=range_name).execute()
     values = result.get('values', [])
@@ -23,3 +23,32 @@ def fetch_google_form_responses(sheet_id, range_name='Form Responses 1!A:Z'):
         responses.append(response_data)
 
     return responses
+
+
+def sync_sheet_responses(sheet, batch_size=500):
+    """
+    Pull the sheet and insert responses we have not stored yet.
+    Existing rows are left untouched (same semantics as get_or_create with defaults).
+    Returns (fetched, created).
+    """
+    from .models import GoogleFormResponse
+    from .schema import sync_sheet_schema
+
+    responses_raw = fetch_google_form_responses(sheet.sheet_id)
+    existing = set(sheet.responses.values_list("response_id", flat=True))
+
+    new_objs = []
+    for r in responses_raw:
+        resp_id = r.get('Timestamp') or str(hash(frozenset(r.items())))
+        if resp_id in existing:
+            continue
+        existing.add(resp_id)
+        new_objs.append(GoogleFormResponse(sheet=sheet, response_id=resp_id, data=r))
+
+    GoogleFormResponse.objects.bulk_create(new_objs, batch_size=batch_size, ignore_conflicts=True)
+
+    if new_objs:
+        # ignore_conflicts leaves pks unset, so select the new rows back by response_id
+        new_ids = [obj.response_id for obj in new_objs]
+        sync_sheet_schema(sheet, sheet.responses.filter(response_id__in=new_ids))
+    return len(responses_raw), len(new_objs)
@@ -1,9 +1,25 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 from .models import GoogleSheet, GoogleFormResponse
-from .serializers import GoogleSheetSerializer, GoogleFormResponseSerializer
-from .utils import fetch_google_form_responses
+from rest_framework.pagination import PageNumberPagination
+from django.db import connection
+from django.db.models.fields.json import KeyTransform
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time
+from .serializers import (
+    GoogleSheetSerializer, GoogleFormResponseSerializer, SheetColumnSerializer,
+    build_columnar_payload, columnar_rows,
+)
+from .schema import RANGE_OPERATORS, filter_by_typed_columns, materialize_responses, refresh_sheet_schema
+from .renderers import ColumnarJSONRenderer
+from .tasks import sync_if_stale, sync_marker
+from .utils import sync_sheet_responses
+from django.conf import settings
+from django.core.cache import cache
 
 class GoogleSheetAPIView(APIView):
     def get(self, request):
@@ -24,37 +40,134 @@ class GoogleSheetAPIView(APIView):
 
 
 
-from django.core.cache import cache
+class GoogleFormResponsesPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
 class GoogleFormResponsesAPIView(APIView):
+    """
+    GET reads stored responses and, at most once per SHEET_SYNC_TTL, queues the
+    sync_google_sheet_responses celery task so they catch up with the Google Sheet.
+    POST syncs immediately.
+
+    Filters: ?response_id=  ?status=  ?created_after=  ?created_before=  ?data.<Header>=<value>
+    Typed filters on the inferred sheet schema: ?field.<Header>=<value>  ?field.<Header>__gte=<value>
+    (also __gt, __lte, __lt for number and date columns)
+    """
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [ColumnarJSONRenderer]
+    pagination_class = GoogleFormResponsesPagination
+    HEADER_FILTER_PREFIX = "data."
+    TYPED_FILTER_PREFIX = "field."
+
     def get(self, request, sheet_id):
+        columnar = request.accepted_renderer.format == ColumnarJSONRenderer.format
         response_id = request.query_params.get("response_id", None)
 
+        # Single response: one query on (sheet_id unique, pk)
+        if response_id:
+            if not str(response_id).isdigit():
+                return Response({'error': 'response_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            qs = GoogleFormResponse.objects.select_related("sheet").filter(sheet__sheet_id=sheet_id, pk=response_id)
+            obj = qs.first()
+            if obj is None:
+                return Response({'error': 'Response not found'}, status=status.HTTP_404_NOT_FOUND)
+            if columnar:
+                return Response(build_columnar_payload(obj.sheet, columnar_rows(qs)), status=status.HTTP_200_OK)
+            return Response(GoogleFormResponseSerializer([obj], many=True).data, status=status.HTTP_200_OK)
+
+        sheet = get_object_or_404(GoogleSheet, sheet_id=sheet_id)
+        sync_if_stale(sheet)
         try:
-            sheet = GoogleSheet.objects.get(sheet_id=sheet_id)
+            qs = self.filter_queryset(request, sheet, sheet.responses.all())
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.order_by("id")
 
-            # Fetch live data from Google Sheet
-            responses_raw = fetch_google_form_responses(sheet.sheet_id)
-            saved_responses = []
+        paginator = self.pagination_class()
+        if columnar:
+            page = paginator.paginate_queryset(columnar_rows(qs), request, view=self)
+            return paginator.get_paginated_response(build_columnar_payload(sheet, page))
 
-            for r in responses_raw:
-                resp_id = r.get('Timestamp') or str(hash(frozenset(r.items())))
-                obj, _ = GoogleFormResponse.objects.get_or_create(
-                    sheet=sheet,
-                    response_id=resp_id,
-                    defaults={'data': r}
-                )
-                saved_responses.append(obj)
+        page = paginator.paginate_queryset(qs, request, view=self)
+        for obj in page:
+            obj.sheet = sheet  # avoid a sheet lookup per row in the nested serializer
+        serializer = GoogleFormResponseSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-            serializer = GoogleFormResponseSerializer(saved_responses, many=True)
-            responses = serializer.data
+    def post(self, request, sheet_id):
+        """Sync stored responses with the live Google Sheet."""
+        sheet = get_object_or_404(GoogleSheet, sheet_id=sheet_id)
+        try:
+            fetched, created = sync_sheet_responses(sheet)
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+        cache.set(sync_marker(sheet.pk), 1, timeout=settings.SHEET_SYNC_TTL)
+        return Response({"sheet_id": sheet.sheet_id, "fetched": fetched, "created": created}, status=status.HTTP_200_OK)
 
-            # Filter by response_id if provided
-            if response_id:
-                responses = [r for r in responses if str(r.get("id")) == str(response_id)]
+    def filter_queryset(self, request, sheet, qs):
+        params = request.query_params
 
-            return Response(responses, status=status.HTTP_200_OK)
+        status_q = params.get("status")
+        if status_q:
+            qs = qs.filter(current_sattus=status_q)
 
-        except GoogleSheet.DoesNotExist:
-            return Response({'error': 'Sheet not found'}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        for param, lookup in (("created_after", "created_at__gte"), ("created_before", "created_at__lte")):
+            raw = params.get(param)
+            if not raw:
+                continue
+            value = parse_datetime(raw) or parse_date(raw)
+            if value is None:
+                raise ValueError(f"{param} must be an ISO date or datetime")
+            if isinstance(value, datetime):
+                if timezone.is_naive(value):
+                    value = timezone.make_aware(value)
+            else:
+                # bare dates: include the whole day for the upper bound
+                value = datetime.combine(value, time.max if param == "created_before" else time.min)
+                value = timezone.make_aware(value)
+            qs = qs.filter(**{lookup: value})
+
+        header_filters = [
+            (key[len(self.HEADER_FILTER_PREFIX):], value)
+            for key, value in params.items()
+            if key.startswith(self.HEADER_FILTER_PREFIX)
+        ]
+        for i, (header, value) in enumerate(header_filters):
+            if connection.features.supports_json_field_contains:
+                # jsonb @> -- served by the GIN index on data (Postgres)
+                qs = qs.filter(data__contains={header: value})
+            else:
+                alias = f"_header_{i}"
+                qs = qs.alias(**{alias: KeyTransform(header, "data")}).filter(**{alias: value})
+
+        typed_filters = []
+        for key, value in params.items():
+            if not key.startswith(self.TYPED_FILTER_PREFIX):
+                continue
+            header, operator = key[len(self.TYPED_FILTER_PREFIX):], None
+            name, _, suffix = header.rpartition("__")
+            if name and suffix in RANGE_OPERATORS:
+                header, operator = name, suffix
+            typed_filters.append((header, operator, value))
+
+        return filter_by_typed_columns(sheet, qs, typed_filters)
+
+
+class GoogleSheetSchemaAPIView(APIView):
+    """
+    GET  -> inferred column types for a sheet
+    POST -> re-infer the schema and re-materialize every stored response
+    """
+    def get(self, request, sheet_id):
+        sheet = get_object_or_404(GoogleSheet, sheet_id=sheet_id)
+        serializer = SheetColumnSerializer(sheet.columns.all(), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def post(self, request, sheet_id):
+        sheet = get_object_or_404(GoogleSheet, sheet_id=sheet_id)
+        columns, _ = refresh_sheet_schema(sheet)
+        written = materialize_responses(sheet, columns=columns)
+        serializer = SheetColumnSerializer(sorted(columns.values(), key=lambda c: c.position), many=True)
+        return Response({"values_written": written, "columns": serializer.data}, status=status.HTTP_200_OK)
@@ -0,0 +1,173 @@
+"""
+Batched write-back of candidate status to the source Google Sheet.
+
+Status changes are queued in SheetStatusWrite (one row per response, latest
+value wins) and flushed per sheet as a single spreadsheets.values.batchUpdate.
+Each flush writes absolute cell values, so re-sending a batch after a failure
+or a crash is harmless; queue rows are only removed when the version that was
+sent is still the current one.
+"""
+import logging
+import time
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from restserver.utils.transport import sheets_service
+
+from .models import SheetStatusWrite
+from .utils import SERVICE_ACCOUNT_FILE, WRITE_SCOPES
+
+logger = logging.getLogger(__name__)
+
+SHEET_TAB = "Form Responses 1"
+KEY_HEADER = "Timestamp"        # GoogleFormResponse.response_id comes from this column
+STATUS_HEADER = "Status"
+MAX_BATCH = 5000
+MAX_ATTEMPTS = 5
+DELETE_CHUNK = 500
+
+
+# --------------------------
+# Queue
+# --------------------------
+def enqueue_status_write(response, status):
+    """Queue (or overwrite) the status to write back for one GoogleFormResponse."""
+    updated = SheetStatusWrite.objects.filter(response_id=response.pk).update(
+        status=status, version=F("version") + 1, attempts=0, last_error=""
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            SheetStatusWrite.objects.create(sheet_id=response.sheet_id, response_id=response.pk, status=status)
+    except IntegrityError:
+        # queued concurrently; overwrite it instead
+        SheetStatusWrite.objects.filter(response_id=response.pk).update(
+            status=status, version=F("version") + 1, attempts=0, last_error=""
+        )
+
+
+# --------------------------
+# Flush
+# --------------------------
+def column_letter(number):
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    while number:
+        number, rem = divmod(number - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _row_runs(cells):
+    """Group {row: value} into runs of consecutive rows -> [(first_row, [values])]."""
+    runs = []
+    for row in sorted(cells):
+        if runs and runs[-1][0] + len(runs[-1][1]) == row:
+            runs[-1][1].append(cells[row])
+        else:
+            runs.append((row, [cells[row]]))
+    return runs
+
+
+def _locate_rows(values_api, spreadsheet_id):
+    """Returns (status column number, header missing?, {response_id: sheet row})."""
+    header_range = f"{SHEET_TAB}!1:1"
+    headers = values_api.get(spreadsheetId=spreadsheet_id, range=header_range).execute(num_retries=3)
+    headers = (headers.get("values") or [[]])[0]
+
+    if KEY_HEADER not in headers:
+        raise ValueError(f"'{KEY_HEADER}' column not found in {SHEET_TAB}")
+    key_col = column_letter(headers.index(KEY_HEADER) + 1)
+    if STATUS_HEADER in headers:
+        status_col, header_missing = headers.index(STATUS_HEADER) + 1, False
+    else:
+        status_col, header_missing = len(headers) + 1, True
+
+    keys = values_api.get(spreadsheetId=spreadsheet_id, range=f"{SHEET_TAB}!{key_col}:{key_col}").execute(num_retries=3)
+    rows = {}
+    for row, cell in enumerate(keys.get("values", []), start=1):
+        if row > 1 and cell and cell[0] not in rows:
+            rows[cell[0]] = row
+    return status_col, header_missing, rows
+
+
+def _mark_failed(pending, error):
+    SheetStatusWrite.objects.filter(pk__in=[p["pk"] for p in pending]).update(
+        attempts=F("attempts") + 1, last_error=str(error)[:1000]
+    )
+
+
+def flush_sheet(sheet, max_batch=MAX_BATCH):
+    """
+    Send every queued status of `sheet` in one values.batchUpdate.
+    Returns a report dict (batch size, ranges, latency); raises on API errors
+    after recording the attempt, so the caller can retry.
+    """
+    pending = list(
+        SheetStatusWrite.objects.filter(sheet=sheet, attempts__lt=MAX_ATTEMPTS)
+        .order_by("id")
+        .values("pk", "version", "status", "response__response_id")[:max_batch]
+    )
+    report = {"sheet_id": sheet.sheet_id, "batch_size": 0, "ranges": 0, "unmatched": 0, "latency_ms": 0.0}
+    if not pending:
+        return report
+
+    start = time.perf_counter()
+    values_api = sheets_service(SERVICE_ACCOUNT_FILE, WRITE_SCOPES).spreadsheets().values()
+    try:
+        status_col, header_missing, rows = _locate_rows(values_api, sheet.sheet_id)
+    except Exception as e:
+        _mark_failed(pending, e)
+        raise
+
+    cells, sent, unmatched = {}, [], []
+    for p in pending:
+        row = rows.get(p["response__response_id"])
+        if row is None:
+            unmatched.append(p)
+            continue
+        cells[row] = [p["status"]]
+        sent.append(p)
+    if header_missing:
+        cells[1] = [STATUS_HEADER]
+
+    col = column_letter(status_col)
+    data = [
+        {"range": f"{SHEET_TAB}!{col}{first}:{col}{first + len(values) - 1}", "values": values}
+        for first, values in _row_runs(cells)
+    ]
+
+    if sent:
+        try:
+            values_api.batchUpdate(
+                spreadsheetId=sheet.sheet_id,
+                body={"valueInputOption": "RAW", "data": data},
+            ).execute(num_retries=3)
+        except Exception as e:
+            _mark_failed(sent, e)
+            raise
+
+        # drop only what was sent unchanged; newer versions stay queued for the next flush
+        for i in range(0, len(sent), DELETE_CHUNK):
+            chunk = sent[i:i + DELETE_CHUNK]
+            SheetStatusWrite.objects.filter(reduce(or_, (Q(pk=p["pk"], version=p["version"]) for p in chunk))).delete()
+
+    if unmatched:
+        # the row may not be synced into the sheet yet; give up after MAX_ATTEMPTS
+        _mark_failed(unmatched, f"No sheet row with {KEY_HEADER} matching response_id")
+
+    report.update(
+        batch_size=len(sent),
+        ranges=len(data) if sent else 0,
+        unmatched=len(unmatched),
+        latency_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+    logger.info(
+        f"Sheet write-back {sheet.sheet_id}: {report['batch_size']} statuses in {report['ranges']} ranges, "
+        f"{report['unmatched']} unmatched, {report['latency_ms']} ms"
+    )
+    return report
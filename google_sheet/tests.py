@@ -1,3 +1,26 @@
+from itertools import count
+
 from django.test import TestCase
 
-# Create your tests here.
+from restserver.testing import QueryBudgetMixin
+from superadmin.models import UserProfile
+
+from .models import Hiring_process
+
+_seq = count()
+
+
+def make_integrations(n):
+    for _ in range(n):
+        i = next(_seq)
+        Hiring_process.objects.create(integration_type="google_sheet", name=f"Sheet {i}", identifier=f"sheet-{i}")
+
+
+class HiringProcessQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        make_integrations(3)
+
+    def test_hiring_list(self):
+        self.assertQueryBudget(1, "/api/google_sheet/hiring/", grow=lambda: make_integrations(10))
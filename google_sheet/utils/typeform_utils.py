@@ -1,6 +1,8 @@
 import requests
 import logging
 
+from restserver.utils.transport import http_session
+
 TYPEFORM_API_BASE = "https://api.typeform.com"
 logger = logging.getLogger(__name__)
 
@@ -14,7 +16,7 @@ def get_typeform_details(form_id, token):
     print(f"[Typeform] Fetching form details: {url}")
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session().get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -35,7 +37,7 @@ def fetch_typeform_data(form_id, token):
     print(f"[Typeform] Fetching responses: {url}")
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session().get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -44,3 +46,30 @@ def fetch_typeform_data(form_id, token):
     except Exception as e:
         logger.error(f"Unexpected error fetching Typeform responses: {e}")
         return {"error": str(e)}
+
+
+def iter_typeform_responses(form_id, token, page_size=1000, retries=3):
+    """
+    Yield every response, newest first, walking Typeform's `before` token
+    pagination (page_size is capped at 1000 by the API). 5xx pages are retried.
+    """
+    url = f"{TYPEFORM_API_BASE}/forms/{form_id}/responses"
+    headers = {"Authorization": f"Bearer {token.strip()}"}
+    session = http_session()
+    before = None
+
+    while True:
+        params = {"page_size": page_size}
+        if before:
+            params["before"] = before
+        for attempt in range(retries + 1):
+            response = session.get(url, headers=headers, params=params, timeout=10)
+            if response.status_code < 500 or attempt == retries:
+                break
+            logger.warning(f"Typeform page failed ({response.status_code}), retrying")
+        response.raise_for_status()
+        items = response.json().get("items", [])
+        yield from items
+        if len(items) < page_size:
+            return
+        before = items[-1]["token"]
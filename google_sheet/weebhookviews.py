@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.cache import cache
-from django_ratelimit.decorators import ratelimit
+from restserver.utils.ratelimit import rate_limit
 from .models import Hiring_process
 from .tasks import process_integration_data
 from restserver.utils.webhook_security import verify_webhook_signature
@@ -10,7 +10,7 @@ from restserver.utils.webhook_security import verify_webhook_signature
 
 class TypeformWebhookView(APIView):
 
-    @ratelimit(key="ip", rate="100/m", block=True)
+    @rate_limit("100/m", key="ip", name="typeform_webhook")
     def post(self, request):
         signature = request.headers.get("Typeform-Signature")
         secret = "YOUR_TYPEFORM_SECRET"
@@ -30,7 +30,7 @@ class TypeformWebhookView(APIView):
 class SurveyMonkeyWebhookView(APIView):
     """Receive SurveyMonkey webhook events"""
 
-    @ratelimit(key="ip", rate="100/m", block=True)  # Rate limit: 100 requests/min
+    @rate_limit("100/m", key="ip", name="surveymonkey_webhook")  # Rate limit: 100 requests/min
     def post(self, request):
         signature = request.headers.get("SurveyMonkey-Signature")
         secret = "YOUR_SURVEYMONKEY_SECRET"
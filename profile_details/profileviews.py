@@ -60,6 +60,8 @@ from .serializers import CandidateDetailsSerializer
 
 class CandidateListView(APIView):
     def get(self, request):
-        candidates = CandidateDetails.objects.all().order_by('-created_at')
+        candidates = CandidateDetailsSerializer.setup_eager_loading(
+            CandidateDetails.objects.all().order_by('-created_at')
+        )
         serializer = CandidateDetailsSerializer(candidates, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -24,6 +24,10 @@ class CandidateDetailsSerializer(serializers.ModelSerializer):
             'history'
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.prefetch_related('history')
+
     def validate(self, data):
         instance = getattr(self, 'instance', None)
         old_status = getattr(instance, 'current_status', 'scouting')
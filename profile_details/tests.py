@@ -1,3 +1,42 @@
+from itertools import count
+
 from django.test import TestCase
 
-# Create your tests here.
+from google_form_work.models import GoogleFormResponse, GoogleSheet
+from restserver.testing import QueryBudgetMixin
+from superadmin.models import UserProfile
+
+from .models import CandidateDetails, CandidateStatusHistory
+
+_seq = count()
+
+
+def make_candidates(n, sheet):
+    for _ in range(n):
+        i = next(_seq)
+        response = GoogleFormResponse.objects.create(sheet=sheet, response_id=f"r{i}", data={"Name": f"Candidate {i}"})
+        candidate = CandidateDetails.objects.create(TypeformAnswer=response)
+        CandidateStatusHistory.objects.create(candidate=candidate, previous_status="scouting", new_status="ongoing")
+        CandidateStatusHistory.objects.create(candidate=candidate, previous_status="ongoing", new_status="hired")
+
+
+class CandidateQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.sheet = GoogleSheet.objects.create(name="Applicants", sheet_id="sheet-1")
+        make_candidates(3, cls.sheet)
+
+    def grow(self):
+        make_candidates(10, self.sheet)
+
+    def test_candidates_list(self):
+        # count, page, history
+        self.assertQueryBudget(3, "/api/profile_details/candidates/", grow=self.grow)
+
+    def test_list_candidates(self):
+        self.assertQueryBudget(2, "/api/profile_details/listcandidates/", grow=self.grow)
+
+    def test_candidate_history(self):
+        candidate = CandidateDetails.objects.first()
+        self.assertQueryBudget(1, f"/api/profile_details/candidates/{candidate.pk}/history/", grow=self.grow)
@@ -67,7 +67,9 @@ class CandidateDetailsAPIView(APIView):
                 logger.debug(f"Cache hit for {cache_key}")
                 return Response(cached_data, status=status.HTTP_200_OK)
 
-            candidates = CandidateDetails.objects.all().order_by('-created_at')
+            candidates = CandidateDetailsSerializer.setup_eager_loading(
+                CandidateDetails.objects.all().order_by('-created_at')
+            )
             if status_filter != "all":
                 candidates = candidates.filter(current_status=status_filter)
 
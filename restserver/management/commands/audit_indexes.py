@@ -0,0 +1,119 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, migrations
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from restserver.utils.indexes import (
+    UNUSED, audit, collect_indexes, removal_operations, stats_reset, write_amplification,
+)
+
+
+def human_size(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class Command(BaseCommand):
+    help = ("Report duplicate, redundant-prefix and (Postgres) unused indexes across the project apps, "
+            "with the write amplification they cost, and optionally write migrations dropping them.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("app_labels", nargs="*", help="Only audit these apps (default: all project apps)")
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--no-unused", action="store_true", help="Skip the pg_stat_user_indexes check")
+        parser.add_argument("--json", action="store_true", help="Machine-readable output")
+        parser.add_argument("--emit-migration", action="store_true",
+                            help="Write a migration per app removing duplicate and prefix indexes")
+        parser.add_argument("--drop-unused", action="store_true",
+                            help="With --emit-migration, also drop unused indexes")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if using not in connections:
+            raise CommandError(f"Unknown database '{using}'")
+
+        indexes = collect_indexes(using, options["app_labels"] or None)
+        findings = audit(indexes, include_unused=not options["no_unused"])
+        amplification = write_amplification(indexes, findings)
+
+        if options["json"]:
+            self.stdout.write(json.dumps({
+                "vendor": connections[using].vendor,
+                "stats_reset": str(stats_reset(using) or "") or None,
+                "findings": [
+                    {"kind": f.kind, "table": f.index.table, "index": f.index.name, "columns": f.index.columns,
+                     "source": f.index.source, "covered_by": f.covered_by.name if f.covered_by else None,
+                     "size": f.index.size, "scans": f.index.scans, "reason": f.reason}
+                    for f in findings
+                ],
+                "tables": amplification,
+            }, indent=2))
+        else:
+            self.report(using, indexes, findings, amplification)
+
+        if options["emit_migration"]:
+            dropping = [f for f in findings if f.kind != UNUSED or options["drop_unused"]]
+            self.emit_migrations(using, dropping)
+
+    def report(self, using, indexes, findings, amplification):
+        self.stdout.write(f"{len(indexes)} indexes on {len(amplification)} tables ({connections[using].vendor})")
+        reset = stats_reset(using)
+        if reset:
+            self.stdout.write(f"Index statistics collected since {reset}")
+
+        if not findings:
+            self.stdout.write(self.style.SUCCESS("No duplicate, redundant or unused indexes found."))
+            return
+
+        self.stdout.write("")
+        for f in sorted(findings, key=lambda f: (f.index.table, f.kind, f.index.name)):
+            self.stdout.write(
+                f"{f.kind:<10} {f.index.table}.{f.index.name} ({', '.join(f.index.columns)}) "
+                f"[{f.index.source}, {human_size(f.index.size)}]: {f.reason}"
+            )
+
+        self.stdout.write("")
+        self.stdout.write(f"{'table':<40} {'indexes':>7} {'drop':>5} {'writes/insert':>14} {'saving':>7} {'reclaim':>9}")
+        for table, row in amplification.items():
+            if not row["removable"]:
+                continue
+            self.stdout.write(
+                f"{table:<40} {row['indexes']:>7} {row['removable']:>5} "
+                f"{row['writes_per_insert']:>6} -> {row['writes_per_insert_after']:<4} "
+                f"{row['saving_pct']:>6}% {human_size(row['reclaimable_bytes']):>9}"
+            )
+
+    def emit_migrations(self, using, findings):
+        operations, edits = removal_operations(findings)
+        if not operations:
+            self.stdout.write("Nothing to drop; no migration written.")
+            return
+
+        loader = MigrationLoader(connections[using], ignore_no_migrations=True)
+        for app_label, ops in sorted(operations.items()):
+            leaves = loader.graph.leaf_nodes(app_label)
+            if not leaves:
+                self.stderr.write(f"{app_label} has no migrations; skipped")
+                continue
+            number = max(int(name.split("_", 1)[0]) for _, name in leaves) + 1
+            migration = type("Migration", (migrations.Migration,), {"dependencies": leaves, "operations": ops})(
+                f"{number:04d}_remove_redundant_indexes", app_label
+            )
+            writer = MigrationWriter(migration)
+            os.makedirs(os.path.dirname(writer.path), exist_ok=True)
+            with open(writer.path, "w", encoding="utf-8") as fh:
+                fh.write(writer.as_string())
+            self.stdout.write(self.style.SUCCESS(f"Wrote {writer.path} ({len(ops)} operations)"))
+
+        if edits:
+            self.stdout.write("\nUpdate the models to match, or makemigrations will add the indexes back:")
+            for app_label, message in edits:
+                self.stdout.write(f"  {app_label}: {message}")
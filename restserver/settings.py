@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'django_summernote',
     'rest_framework',
     'corsheaders',
+    'restserver',  # project-wide management commands (audit_indexes)
     'superadmin',
     'google_sheet',
     'profile_details',
@@ -133,7 +134,7 @@ SIMPLE_JWT = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'superadmin.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -156,15 +157,41 @@ IMPORT_EXPORT_USE_TRANSACTIONS = True
 
 
 
+# Loggers only enqueue; a listener thread writes JSON lines to LOG_DIR/app.log (rotated),
+# echoes to the console and emails deduplicated CRITICAL alerts (restserver.utils.log).
+LOG_DIR = os.getenv('LOG_DIR') or os.path.join(BASE_DIR, 'logs')
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'sampling': {
+            '()': 'restserver.utils.log.SamplingFilter',
+            'max_level': 'DEBUG',
+            'rates': {
+                'django.db.backends': 0.01,
+                'django.template': 0.01,
+                'django.utils.autoreload': 0,
+                'asyncio': 0.1,
+                'urllib3': 0.1,
+                'googleapiclient': 0.1,
+            },
+        },
+    },
     'handlers': {
-        'console': {'class': 'logging.StreamHandler'},
+        'queue': {
+            '()': 'restserver.utils.log.QueueLogHandler',
+            'filters': ['sampling'],
+            'filename': os.path.join(LOG_DIR, 'app.log'),
+            'max_bytes': int(os.getenv('LOG_MAX_BYTES', 50 * 1024 * 1024)),
+            'when': os.getenv('LOG_ROTATE_WHEN') or None,   # e.g. "midnight" for daily files
+            'backup_count': int(os.getenv('LOG_BACKUP_COUNT', 10)),
+            'console': True,
+            'alert_recipients': [os.getenv('ERROR_RECIPIENT', 'admin@gxinetworks.com')],
+        },
     },
     'root': {
-        'handlers': ['console'],
-        'level': 'DEBUG',
+        'handlers': ['queue'],
+        'level': os.getenv('LOG_LEVEL', 'INFO'),
     },
 }
 
@@ -207,6 +234,18 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# GET on a sheet's responses queues a background sync at most this often (seconds)
+SHEET_SYNC_TTL = int(os.getenv("SHEET_SYNC_TTL", 300))
+
+# Batched status write-back to the source Google Sheets (google_form_work.writeback)
+SHEET_WRITEBACK_INTERVAL = int(os.getenv("SHEET_WRITEBACK_INTERVAL", 60))
+CELERY_BEAT_SCHEDULE = {
+    "flush-sheet-status-writes": {
+        "task": "google_form_work.tasks.flush_sheet_status_writes",
+        "schedule": SHEET_WRITEBACK_INTERVAL,
+    },
+}
+
 LANGUAGE_CODE = 'en-us'
 USE_I18N = True
 TIME_ZONE = 'Asia/Kolkata'
@@ -291,6 +330,16 @@ WATI_API_TOKEN = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJqdGkiOiJlNWIxNDQ0My05Z
 WATI_API_ENDPOINT = "https://live-server.wati.io/388428/api/v1/sendSessionMessage"
 TENANT_ID = "388428"
 
+# Outbound integrations (Typeform, Sheets, WATI, Graph): "live", "standin" or "record".
+# See restserver/standin for the offline stand-ins and their options.
+INTEGRATION_TRANSPORT = os.getenv("INTEGRATION_TRANSPORT", "live")
+STANDIN = {}
+
+# restserver.utils.ratelimit: backend "redis" / "memory" (default: redis when the cache is django_redis)
+# and per-scope overrides, e.g. {"login": "5/m", "otp_send_ip": "30/10m"}
+RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND") or None
+RATELIMIT_RATES = {}
+
 
 
 # MICROSOFT_CONFIG = {
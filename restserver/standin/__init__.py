@@ -0,0 +1,8 @@
+"""
+Offline stand-ins for the third-party APIs we integrate with.
+
+Enabled with INTEGRATION_TRANSPORT=standin (see restserver.utils.transport).
+Requests are answered from recorded fixtures under STANDIN_FIXTURE_DIR when one
+matches, otherwise from deterministic synthetic data (services.py). Latency and
+error injection are configured through StandInConfig.
+"""
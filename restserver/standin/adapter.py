@@ -0,0 +1,144 @@
+import hashlib
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import httplib2
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .services import ROUTES
+
+
+# --------------------------
+# Fixtures
+# --------------------------
+def fixture_path(config, method, url):
+    """fixtures/<host>/<METHOD>_<path>[__<query hash>].json"""
+    parts = urlsplit(url)
+    name = method.upper() + unquote(parts.path).replace("/", "_").replace(":", "_")
+    query = sorted(parse_qsl(parts.query))
+    if query:
+        name += "__" + hashlib.sha1(urlencode(query).encode()).hexdigest()[:10]
+    return config.fixture_dir / parts.hostname / f"{name}.json"
+
+
+def load_fixture(config, method, url):
+    path = fixture_path(config, method, url)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        recorded = json.load(f)
+    return recorded.get("status", 200), recorded.get("body")
+
+
+def save_fixture(config, method, url, status, body):
+    path = fixture_path(config, method, url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"status": status, "body": body}, f, ensure_ascii=False, indent=2)
+
+
+# --------------------------
+# Dispatch
+# --------------------------
+def _decode_body(body):
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return dict(parse_qsl(body))
+
+
+def dispatch(config, method, url, body=None):
+    """Answer a request: injected failure, else recorded fixture, else synthetic route."""
+    method = method.upper()
+    if config.simulate_network():
+        return config.error_status, {"error": {"code": config.error_status, "message": "stand-in injected failure"}}
+
+    recorded = load_fixture(config, method, url)
+    if recorded is not None:
+        return recorded
+
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+    query = {}
+    for key, value in parse_qsl(parts.query):
+        query.setdefault(key, []).append(value)
+    # single values stay plain strings; repeated ones (values:batchGet ranges) stay lists
+    query = {key: values[0] if len(values) == 1 else values for key, values in query.items()}
+    for host, route_method, pattern, handler in ROUTES:
+        if route_method != method or not (parts.hostname or "").endswith(host):
+            continue
+        match = pattern.fullmatch(path)
+        if match:
+            return handler(config, match, query, _decode_body(body))
+
+    return 404, {"error": f"No stand-in route for {method} {parts.hostname}{path}"}
+
+
+# --------------------------
+# requests transport
+# --------------------------
+def _build_response(request, status, body):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = HTTPStatus(status).phrase
+    response._content = json.dumps(body).encode("utf-8")
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class StandInAdapter(BaseAdapter):
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status, body = dispatch(self.config, request.method, request.url, request.body)
+        return _build_response(request, status, body)
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Live HTTP that also saves JSON responses as fixtures for later replay."""
+
+    def __init__(self, config, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config = config
+
+    def send(self, request, *args, **kwargs):
+        response = super().send(request, *args, **kwargs)
+        if "json" in response.headers.get("Content-Type", ""):
+            try:
+                save_fixture(self.config, request.method, request.url, response.status_code, response.json())
+            except ValueError:
+                pass
+        return response
+
+
+# --------------------------
+# httplib2 transport (googleapiclient)
+# --------------------------
+class StandInHttp:
+    """Just enough of httplib2.Http for googleapiclient's HttpRequest.execute()."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        status, payload = dispatch(self.config, method, uri, body)
+        response = httplib2.Response({"status": str(status), "content-type": "application/json"})
+        return response, json.dumps(payload).encode("utf-8")
+
+    def close(self):
+        pass
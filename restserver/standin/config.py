@@ -0,0 +1,50 @@
+import os
+import random
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class StandInConfig:
+    """
+    seed            -> synthetic data, latency jitter and error injection are all derived from it
+    total_responses -> synthetic Typeform responses / sheet rows per form
+    latency_ms      -> added to every call (+/- jitter_ms, uniform)
+    error_rate      -> share of calls answered with error_status
+    """
+
+    def __init__(self, seed=1, total_responses=100_000, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, error_status=503, fixture_dir=DEFAULT_FIXTURE_DIR):
+        self.seed = int(seed)
+        self.total_responses = int(total_responses)
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+        self.fixture_dir = Path(fixture_dir)
+        self.rng = random.Random(self.seed)
+
+    @classmethod
+    def from_settings(cls):
+        conf = getattr(settings, "STANDIN", {}) or {}
+        return cls(
+            seed=conf.get("SEED", os.getenv("STANDIN_SEED", 1)),
+            total_responses=conf.get("TOTAL_RESPONSES", os.getenv("STANDIN_TOTAL_RESPONSES", 100_000)),
+            latency_ms=conf.get("LATENCY_MS", os.getenv("STANDIN_LATENCY_MS", 0)),
+            jitter_ms=conf.get("JITTER_MS", os.getenv("STANDIN_JITTER_MS", 0)),
+            error_rate=conf.get("ERROR_RATE", os.getenv("STANDIN_ERROR_RATE", 0)),
+            error_status=conf.get("ERROR_STATUS", os.getenv("STANDIN_ERROR_STATUS", 503)),
+            fixture_dir=conf.get("FIXTURE_DIR", os.getenv("STANDIN_FIXTURE_DIR", DEFAULT_FIXTURE_DIR)),
+        )
+
+    def simulate_network(self):
+        """Sleep for the configured latency; return True if this call should fail."""
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
@@ -0,0 +1,296 @@
+"""
+Synthetic Typeform, Google Sheets, WATI and Microsoft Graph endpoints.
+
+Every handler takes (config, match, query, body) and returns (status, json_body).
+Generated data depends only on config.seed and the request, so two runs with the
+same config see byte-identical payloads.
+"""
+import hashlib
+import math
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Ananya", "Kabir", "Meera", "Rohan", "Sara", "Vivaan", "Zoya"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Khan", "Gupta", "Nair", "Das", "Singh", "Reddy", "Jha"]
+LOCATIONS = ["Delhi", "Noida", "Pune", "Bengaluru", "Hyderabad", "Mumbai", "Chennai", "Remote"]
+ROLES = ["Python Developer", "SDET", "Data Scientist", "RAVE Developer", "DevOps Engineer"]
+DEGREES = ["B.Tech", "M.Tech", "MCA", "B.Sc", "M.Sc"]
+NOTICE_PERIODS = ["Immediate", "15 days", "30 days", "60 days", "90 days"]
+
+# Typeform field ids match google_sheet FIELD_NAME_MAP so mapped answers are realistic
+TYPEFORM_FIELDS = [
+    ("GSdr0vI52V2H", "short_text", "text", "first_name"),
+    ("K4rp3rvgL1jg", "short_text", "text", "last_name"),
+    ("PljYRNxTMKTb", "email", "email", "email"),
+    ("skkeXrAQqfxg", "phone_number", "phone_number", "phone"),
+    ("hfVE1X2KrFdp", "dropdown", "choice", "location"),
+    ("ifsjUpya0xNx", "number", "number", "experience"),
+    ("QDVKrprS7Vah", "multiple_choice", "choice", "notice_period"),
+    ("3hxg9RZ07fY7", "multiple_choice", "choice", "degree"),
+    ("GaNy7pqrsc8t", "yes_no", "boolean", "python"),
+    ("XsUaFdm29tiW", "opinion_scale", "number", "python_rate"),
+    ("TOGLRSygikj7", "yes_no", "boolean", "rdbms"),
+    ("BEvfgv95crJY", "opinion_scale", "number", "rdbms_rate"),
+    ("Btbfn7tEo2De", "yes_no", "boolean", "machine_learning"),
+    ("1LNTgu0cJQ4z", "opinion_scale", "number", "machine_learning_rate"),
+]
+
+SHEET_HEADERS = ["Timestamp", "Email Address", "Full Name", "Phone Number", "Experience",
+                 "Location", "Role", "Current CTC", "Notice Period", "Comments"]
+
+# values:batchUpdate payloads received, per spreadsheet id (inspect from tests/benchmarks)
+SHEET_WRITES = {}
+
+
+def _candidate(config, namespace, index):
+    rng = random.Random(f"{config.seed}:{namespace}:{index}")
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "first_name": first,
+        "last_name": last,
+        "email": f"{first}.{last}.{index}@example.com".lower(),
+        "phone": f"+91{rng.randint(7000000000, 9999999999)}",
+        "location": rng.choice(LOCATIONS),
+        "experience": rng.randint(0, 15),
+        "notice_period": rng.choice(NOTICE_PERIODS),
+        "degree": rng.choice(DEGREES),
+        "role": rng.choice(ROLES),
+        "ctc": round(rng.uniform(3, 40), 1),
+        "python": rng.random() < 0.7,
+        "python_rate": rng.randint(1, 5),
+        "rdbms": rng.random() < 0.6,
+        "rdbms_rate": rng.randint(1, 5),
+        "machine_learning": rng.random() < 0.4,
+        "machine_learning_rate": rng.randint(1, 5),
+        "submitted_at": BASE_TIME + timedelta(minutes=7 * index + rng.randint(0, 6)),
+    }
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# --------------------------
+# Typeform
+# --------------------------
+def _typeform_item(config, form_id, index):
+    c = _candidate(config, f"typeform:{form_id}", index)
+    answers = []
+    for field_id, field_type, answer_type, key in TYPEFORM_FIELDS:
+        answer = {"field": {"id": field_id, "type": field_type}, "type": answer_type}
+        value = c[key]
+        if answer_type == "choice":
+            answer["choice"] = {"label": value}
+        else:
+            answer[answer_type] = value
+        answers.append(answer)
+    return {
+        "landing_id": f"{form_id}{index:08d}",
+        "token": f"{form_id}{index:08d}",
+        "response_id": f"{form_id}{index:08d}",
+        "landed_at": _iso(c["submitted_at"] - timedelta(minutes=4)),
+        "submitted_at": _iso(c["submitted_at"]),
+        "answers": answers,
+    }
+
+
+def _token_index(form_id, token):
+    if token and token.startswith(form_id) and token[len(form_id):].isdigit():
+        return int(token[len(form_id):])
+    return None
+
+
+def typeform_form(config, match, query, body):
+    form_id = match.group("form_id")
+    return 200, {
+        "id": form_id,
+        "title": f"Stand-in form {form_id}",
+        "fields": [{"id": fid, "ref": key, "type": ftype, "title": key.replace("_", " ").title()}
+                   for fid, ftype, _, key in TYPEFORM_FIELDS],
+    }
+
+
+def typeform_responses(config, match, query, body):
+    """Newest first, page_size <= 1000, `before`/`after` response tokens like the real API."""
+    form_id = match.group("form_id")
+    total = config.total_responses
+    page_size = max(1, min(int(query.get("page_size", 25)), 1000))
+
+    newest = total - 1
+    oldest = 0
+    before = _token_index(form_id, query.get("before"))
+    after = _token_index(form_id, query.get("after"))
+    if before is not None:
+        newest = min(newest, before - 1)
+    if after is not None:
+        oldest = max(oldest, after + 1)
+
+    remaining = max(0, newest - oldest + 1)
+    indexes = range(newest, max(oldest, newest - page_size + 1) - 1, -1) if remaining else []
+    return 200, {
+        "total_items": remaining,
+        "page_count": math.ceil(remaining / page_size) if remaining else 0,
+        "items": [_typeform_item(config, form_id, i) for i in indexes],
+    }
+
+
+# --------------------------
+# Google Sheets
+# --------------------------
+def sheet_row(config, spreadsheet_id, index):
+    c = _candidate(config, f"sheet:{spreadsheet_id}", index)
+    return [
+        c["submitted_at"].strftime("%m/%d/%Y %H:%M:%S"),
+        c["email"],
+        f"{c['first_name']} {c['last_name']}",
+        c["phone"],
+        f"{c['experience']} years",
+        c["location"],
+        c["role"],
+        f"{c['ctc']} LPA",
+        c["notice_period"],
+        f"Applied for {c['role']}",
+    ]
+
+
+def sheets_metadata(config, match, query, body):
+    spreadsheet_id = match.group("spreadsheet_id")
+    return 200, {
+        "spreadsheetId": spreadsheet_id,
+        "properties": {"title": f"Stand-in sheet {spreadsheet_id}"},
+        "sheets": [{"properties": {"sheetId": 0, "title": "Form Responses 1", "index": 0}}],
+    }
+
+
+A1_RE = re.compile(r"^(?P<c1>[A-Z]*)(?P<r1>\d*)(?::(?P<c2>[A-Z]*)(?P<r2>\d*))?$")
+
+
+def _column_number(letters):
+    number = 0
+    for ch in letters:
+        number = number * 26 + ord(ch) - 64
+    return number
+
+
+def _sheet_range(config, spreadsheet_id, a1):
+    """Rows of the synthetic sheet covered by an A1 range like 'Tab!A:Z', 'Tab!1:1' or 'Tab!A2:B9'."""
+    cells = a1.rsplit("!", 1)[-1].upper()
+    match = A1_RE.match(cells)
+    if not match:
+        return []
+    c1, r1, c2, r2 = match.group("c1", "r1", "c2", "r2")
+    c2 = c2 if match.group(0).count(":") else c1
+    r2 = r2 if match.group(0).count(":") else r1
+    total_rows = config.total_responses + 1
+    first_row = int(r1) if r1 else 1
+    last_row = min(int(r2) if r2 else total_rows, total_rows)
+    first_col = _column_number(c1) - 1 if c1 else 0
+    last_col = _column_number(c2) if c2 else len(SHEET_HEADERS)
+
+    values = []
+    for row in range(first_row, last_row + 1):
+        full = SHEET_HEADERS if row == 1 else sheet_row(config, spreadsheet_id, row - 2)
+        values.append(full[first_col:last_col])
+    return values
+
+
+def sheets_values_get(config, match, query, body):
+    spreadsheet_id = match.group("spreadsheet_id")
+    values = _sheet_range(config, spreadsheet_id, match.group("range"))
+    return 200, {"range": match.group("range"), "majorDimension": "ROWS", "values": values}
+
+
+def sheets_values_batch_get(config, match, query, body):
+    spreadsheet_id = match.group("spreadsheet_id")
+    ranges = query.get("ranges", [])
+    if isinstance(ranges, str):
+        ranges = [ranges]
+    return 200, {
+        "spreadsheetId": spreadsheet_id,
+        "valueRanges": [{"range": r, "majorDimension": "ROWS", "values": _sheet_range(config, spreadsheet_id, r)}
+                        for r in ranges],
+    }
+
+
+def sheets_values_batch_update(config, match, query, body):
+    spreadsheet_id = match.group("spreadsheet_id")
+    data = (body or {}).get("data", [])
+    SHEET_WRITES.setdefault(spreadsheet_id, []).append(body)
+    responses = []
+    for entry in data:
+        cells = sum(len(row) for row in entry.get("values", []))
+        responses.append({"spreadsheetId": spreadsheet_id, "updatedRange": entry.get("range"), "updatedCells": cells})
+    return 200, {
+        "spreadsheetId": spreadsheet_id,
+        "totalUpdatedRanges": len(responses),
+        "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+        "responses": responses,
+    }
+
+
+# --------------------------
+# WATI
+# --------------------------
+def wati_send_template(config, match, query, body):
+    return 200, {
+        "result": True,
+        "phone_number": query.get("whatsappNumber"),
+        "template_name": (body or {}).get("template_name"),
+        "receivers": [{"waId": query.get("whatsappNumber"), "isValidWhatsAppNumber": True}],
+    }
+
+
+def wati_send_session(config, match, query, body):
+    return 200, {"result": True, "phone_number": match.group("phone"), "message": query.get("messageText")}
+
+
+def wati_get_messages(config, match, query, body):
+    phone = match.group("phone")
+    rng = random.Random(f"{config.seed}:wati:{phone}")
+    items = [{
+        "id": f"{phone}-{i}",
+        "text": f"Stand-in message {i}",
+        "owner": rng.random() < 0.5,
+        "created": _iso(BASE_TIME + timedelta(hours=i)),
+    } for i in range(rng.randint(1, 10))]
+    return 200, {"result": "success", "messages": {"items": items, "total": len(items)}}
+
+
+# --------------------------
+# Microsoft Graph
+# --------------------------
+def graph_token(config, match, query, body):
+    return 200, {"token_type": "Bearer", "expires_in": 3599, "access_token": "standin-graph-token"}
+
+
+def graph_online_meeting(config, match, query, body):
+    body = body or {}
+    digest = hashlib.sha1(f"{match.group('user')}|{body.get('startDateTime')}".encode()).hexdigest()
+    meeting_id = f"standin-{digest[:12]}"
+    return 201, {
+        "id": meeting_id,
+        "subject": body.get("subject"),
+        "startDateTime": body.get("startDateTime"),
+        "endDateTime": body.get("endDateTime"),
+        "joinWebUrl": f"https://teams.microsoft.com/l/meetup-join/{meeting_id}",
+    }
+
+
+# (host suffix, method, path regex, handler)
+ROUTES = [
+    ("api.typeform.com", "GET", r"/forms/(?P<form_id>[^/]+)", typeform_form),
+    ("api.typeform.com", "GET", r"/forms/(?P<form_id>[^/]+)/responses", typeform_responses),
+    ("sheets.googleapis.com", "GET", r"/v4/spreadsheets/(?P<spreadsheet_id>[^/]+)", sheets_metadata),
+    ("sheets.googleapis.com", "GET", r"/v4/spreadsheets/(?P<spreadsheet_id>[^/]+)/values:batchGet", sheets_values_batch_get),
+    ("sheets.googleapis.com", "GET", r"/v4/spreadsheets/(?P<spreadsheet_id>[^/]+)/values/(?P<range>.+)", sheets_values_get),
+    ("sheets.googleapis.com", "POST", r"/v4/spreadsheets/(?P<spreadsheet_id>[^/]+)/values:batchUpdate", sheets_values_batch_update),
+    ("wati.io", "POST", r"/(?P<tenant>[^/]+)/api/v1/sendTemplateMessage", wati_send_template),
+    ("wati.io", "POST", r"/(?P<tenant>[^/]+)/api/v1/sendSessionMessage/(?P<phone>[^/]+)", wati_send_session),
+    ("wati.io", "GET", r"/(?P<tenant>[^/]+)/api/v1/getMessages/(?P<phone>[^/]+)", wati_get_messages),
+    ("login.microsoftonline.com", "POST", r"/(?P<tenant>[^/]+)/oauth2/v2.0/token", graph_token),
+    ("graph.microsoft.com", "POST", r"/v1.0/users/(?P<user>[^/]+)/onlineMeetings", graph_online_meeting),
+]
+ROUTES = [(host, method, re.compile(path), handler) for host, method, path, handler in ROUTES]
@@ -0,0 +1,39 @@
+"""
+Query budgets for list endpoints.
+
+    class JobListQueryTests(QueryBudgetMixin, TestCase):
+        def test_addjob_list(self):
+            self.assertQueryBudget(4, "/api/create_job/addjob/?page_size=50", grow=lambda: make_jobs(20))
+
+assertQueryBudget() requests the URL, lets `grow` add more rows, requests it
+again and fails if the second request ran more queries than the first (an
+N+1: a query per row) or more than `budget`. The cache is cleared before
+each request so cached list responses do not hide the queries.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+class QueryBudgetMixin:
+    user = None  # set in setUpTestData; requests are authenticated as this user
+
+    def count_queries(self, url, user=None):
+        client = APIClient()
+        if user or self.user:
+            client.force_authenticate(user or self.user)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, f"GET {url} -> {response.status_code}: {response.content[:300]}")
+        return len(queries), queries
+
+    def assertQueryBudget(self, budget, url, grow=None, user=None):
+        first, _ = self.count_queries(url, user)
+        if grow:
+            grow()
+        second, queries = self.count_queries(url, user)
+        listing = "\n".join(f"  {q['sql'][:160]}" for q in queries.captured_queries)
+        self.assertEqual(first, second, f"GET {url}: {first} queries, then {second} with more rows (N+1)\n{listing}")
+        self.assertLessEqual(second, budget, f"GET {url}: {second} queries, budget {budget}\n{listing}")
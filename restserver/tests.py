@@ -0,0 +1,306 @@
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import migrations
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from restserver.standin.config import StandInConfig
+from google_form_work.models import SheetStatusWrite
+from restserver.utils.indexes import (
+    DUPLICATE, PREFIX, SOURCE_FK, SOURCE_META, UNUSED, Finding, IndexInfo, audit, removal_operations,
+    write_amplification,
+)
+from restserver.utils.log import CriticalAlertHandler, JSONFormatter, QueueLogHandler, SamplingFilter
+from restserver.utils.ratelimit import (
+    FIXED, SLIDING, LuaRateThrottle, MemoryBackend, RateLimiter, parse_rate, rate_limit, set_backend,
+)
+from restserver.utils.transport import http_session, use_transport
+
+PING = "https://api.typeform.com/forms/ping/unknown"
+
+
+def failures(calls):
+    session = http_session()
+    return sum(session.get(PING).status_code == 503 for _ in range(calls))
+
+
+class StandInTransportTests(SimpleTestCase):
+    @override_settings(STANDIN={"ERROR_RATE": 0.3, "SEED": 7})
+    def test_error_rate_across_sessions(self):
+        # a new session (and sheets_service) per call is how the integrations use it
+        with use_transport("standin"):
+            failed = sum(failures(1) for _ in range(1000))
+        self.assertAlmostEqual(failed / 1000, 0.3, delta=0.05)
+
+    @override_settings(STANDIN={"ERROR_RATE": 0.5, "SEED": 1})
+    def test_failures_are_mixed_not_all_or_nothing(self):
+        with use_transport("standin"):
+            failed = sum(failures(1) for _ in range(20))
+        self.assertTrue(0 < failed < 20, failed)
+
+    def test_same_seed_same_sequence(self):
+        runs = []
+        for _ in range(2):
+            with use_transport("standin", StandInConfig(seed=3, error_rate=0.5)):
+                runs.append([http_session().get(PING).status_code for _ in range(30)])
+        self.assertEqual(runs[0], runs[1])
+
+    @override_settings(STANDIN={"ERROR_RATE": 0})
+    def test_unknown_route_without_errors(self):
+        with use_transport("standin"):
+            self.assertEqual(http_session().get(PING).status_code, 404)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class PingThrottle(LuaRateThrottle):
+    scope = "test_ping"
+    rate = "2/m"
+
+
+class ThrottledPing(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [PingThrottle]
+
+    def get(self, request):
+        return Response({"ok": True})
+
+
+class DecoratedPing(APIView):
+    permission_classes = [AllowAny]
+
+    @rate_limit("2/m", key="ip", name="test_decorated")
+    def get(self, request):
+        return Response({"ok": True})
+
+
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        previous = set_backend(MemoryBackend(clock=self.clock))
+        self.addCleanup(set_backend, previous)
+        self.factory = APIRequestFactory()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("100/m"), (100, 60))
+        self.assertEqual(parse_rate("5/5m"), (5, 300))
+        self.assertEqual(parse_rate("1000/day"), (1000, 86400))
+        with self.assertRaises(ValueError):
+            parse_rate("often")
+
+    def test_fixed_window_limit_and_reset(self):
+        limiter = RateLimiter("fixed", "3/m", mode=FIXED)
+        self.assertTrue(all(limiter.hit("a").allowed for _ in range(3)))
+        self.clock.now += 20
+        blocked = limiter.hit("a")
+        self.assertFalse(blocked.allowed)
+        self.assertEqual(blocked.count, 4)
+        self.assertEqual(blocked.retry_after, 40)
+        # other identities have their own window
+        self.assertTrue(limiter.hit("b").allowed)
+
+        self.clock.now += 40
+        self.assertTrue(limiter.hit("a").allowed)
+
+    def test_sliding_window_frees_oldest_hit(self):
+        limiter = RateLimiter("sliding", "2/m", mode=SLIDING)
+        self.assertTrue(limiter.hit("a").allowed)
+        self.clock.now += 30
+        self.assertTrue(limiter.hit("a").allowed)
+        blocked = limiter.hit("a")
+        self.assertFalse(blocked.allowed)
+        self.assertEqual(blocked.retry_after, 30)
+
+        # the first hit leaves the window; the second is still counted
+        self.clock.now += 30
+        self.assertTrue(limiter.hit("a").allowed)
+        self.assertFalse(limiter.hit("a").allowed)
+
+    def test_rejected_sliding_hits_are_not_recorded(self):
+        limiter = RateLimiter("sliding", "1/m", mode=SLIDING)
+        limiter.hit("a")
+        for _ in range(5):
+            self.clock.now += 10
+            self.assertFalse(limiter.hit("a").allowed)
+        self.clock.now += 10
+        self.assertTrue(limiter.hit("a").allowed)
+
+    def test_backend_failure_fails_open(self):
+        class Broken:
+            def hit(self, *args):
+                raise ConnectionError("down")
+
+        set_backend(Broken())
+        self.assertTrue(RateLimiter("broken", "1/m").hit("a").allowed)
+
+    def test_throttle_sets_retry_after(self):
+        view = ThrottledPing.as_view()
+        for _ in range(2):
+            self.assertEqual(view(self.factory.get("/ping")).status_code, 200)
+        self.clock.now += 15
+        response = view(self.factory.get("/ping"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "45")
+
+        self.clock.now += 45
+        self.assertEqual(view(self.factory.get("/ping")).status_code, 200)
+
+    @override_settings(RATELIMIT_RATES={"test_ping": "1/m"})
+    def test_rate_overridden_per_scope(self):
+        view = ThrottledPing.as_view()
+        self.assertEqual(view(self.factory.get("/ping")).status_code, 200)
+        self.assertEqual(view(self.factory.get("/ping")).status_code, 429)
+
+    def test_decorator_returns_429_with_retry_after(self):
+        view = DecoratedPing.as_view()
+        for _ in range(2):
+            self.assertEqual(view(self.factory.get("/ping")).status_code, 200)
+        self.clock.now += 59.6
+        response = view(self.factory.get("/ping"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(response.data["retry_after"], 1)
+
+        # per client IP
+        other = self.factory.get("/ping", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(view(other).status_code, 200)
+
+        self.clock.now += 1
+        self.assertEqual(view(self.factory.get("/ping")).status_code, 200)
+
+
+def make_record(name="app", level=logging.INFO, msg="hello", args=(), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class LoggingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        previous = set_backend(MemoryBackend())
+        self.addCleanup(set_backend, previous)
+
+    def test_json_formatter_includes_extra_and_traceback(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("app", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+        record.request_id = "r1"
+        payload = json.loads(JSONFormatter().format(record))
+        self.assertEqual(payload["message"], "failed x")
+        self.assertEqual(payload["level"], "ERROR")
+        self.assertEqual(payload["request_id"], "r1")
+        self.assertIn("ValueError: boom", payload["exc"])
+
+    def test_sampling_keeps_exact_share_below_max_level(self):
+        sampler = SamplingFilter({"django.db": 0.25, "django.db.backends.schema": 0})
+        kept = sum(sampler.filter(make_record("django.db.backends", logging.DEBUG)) for _ in range(100))
+        self.assertEqual(kept, 25)
+        self.assertFalse(sampler.filter(make_record("django.db.backends.schema", logging.DEBUG)))
+        self.assertTrue(sampler.filter(make_record("django.db.backends", logging.WARNING)))
+        self.assertTrue(sampler.filter(make_record("django.dbx", logging.DEBUG)))
+
+    @mock.patch("restserver.utils.log.threading.Thread")
+    def test_alerts_are_deduplicated_and_rate_limited(self, thread):
+        handler = CriticalAlertHandler(["ops@example.com"], rate="2/h")
+        for _ in range(3):
+            handler.emit(make_record(level=logging.CRITICAL, msg="db down %s", args=("primary",)))
+        self.assertEqual(thread.call_count, 1)
+        subject, body, _ = thread.call_args.kwargs["args"]
+        self.assertEqual(body, "db down primary")
+
+        handler.emit(make_record(level=logging.CRITICAL, msg="disk full"))
+        handler.emit(make_record(level=logging.CRITICAL, msg="queue stuck"))
+        self.assertEqual(thread.call_count, 2)
+
+    def test_failed_alert_goes_to_handle_error(self):
+        handler = CriticalAlertHandler(["ops@example.com"])
+        record = make_record(level=logging.CRITICAL)
+        with mock.patch("django.core.mail.send_mail", side_effect=ConnectionError("smtp down")), \
+                mock.patch.object(handler, "handleError") as handle_error:
+            handler.send("subject", "body", record)
+        handle_error.assert_called_once_with(record)
+
+    def test_queue_handler_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "app", "app.log")
+            handler = QueueLogHandler(filename=filename, console=False)
+            logger = logging.getLogger("restserver.tests.queue")
+            logger.addHandler(handler)
+            logger.propagate = False
+            try:
+                logger.warning("saved %s rows", 3, extra={"sheet": 7})
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+            with open(filename, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["message"], "saved 3 rows")
+        self.assertEqual(lines[0]["sheet"], 7)
+
+
+def index(name, columns, source=SOURCE_META, unique=False, scans=None, model=SheetStatusWrite):
+    info = IndexInfo(model, name, columns, None, unique=unique, primary=False, scans=scans)
+    info.source = source
+    return info
+
+
+class IndexAuditTests(TestCase):
+    def test_duplicate_keeps_the_constraint(self):
+        unique = index("uniq", ["sheet_id", "status"], source="unique", unique=True)
+        copy = index("copy", ["sheet_id", "status"])
+        findings = audit([unique, copy])
+        self.assertEqual([(f.kind, f.index.name, f.covered_by.name) for f in findings], [(DUPLICATE, "copy", "uniq")])
+
+    def test_prefix_and_unused(self):
+        wide = index("wide", ["sheet_id", "id"])
+        narrow = index("narrow", ["sheet_id"])
+        other_order = index("other", ["id", "sheet_id"], scans=5)
+        idle = index("idle", ["status"], scans=0)
+        findings = audit([wide, narrow, other_order, idle])
+        self.assertEqual({(f.kind, f.index.name) for f in findings}, {(PREFIX, "narrow"), (UNUSED, "idle")})
+        self.assertEqual(audit([wide, narrow, other_order, idle], include_unused=False)[0].index.name, "narrow")
+
+        amplification = write_amplification([wide, narrow, other_order, idle], findings)
+        table = amplification[SheetStatusWrite._meta.db_table]
+        self.assertEqual((table["writes_per_insert"], table["writes_per_insert_after"]), (5, 3))
+
+    def test_removal_operations(self):
+        fk = index("fk", ["sheet_id"], source=SOURCE_FK)
+        fk.field = SheetStatusWrite._meta.get_field("sheet")
+        meta = index("meta", ["sheet_id"])
+        meta.meta_index = SheetStatusWrite._meta.indexes[0]
+        wide = index("wide", ["sheet_id", "id"])
+        operations, edits = removal_operations([Finding(PREFIX, fk, wide, ""), Finding(DUPLICATE, meta, fk, "")])
+        alter, remove = operations["google_form_work"]
+        self.assertIsInstance(alter, migrations.AlterField)
+        self.assertFalse(alter.field.db_index)
+        self.assertIsInstance(remove, migrations.RemoveIndex)
+        self.assertEqual(remove.name, "meta")
+        self.assertEqual(len(edits), 2)
+
+    def test_series_models_have_no_redundant_indexes(self):
+        out = io.StringIO()
+        call_command("audit_indexes", "google_form_work", "form_data", "--no-unused", "--json", stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["findings"], [])
+        self.assertIn("google_form_work_sheetstatuswrite", report["tables"])
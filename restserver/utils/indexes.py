@@ -0,0 +1,324 @@
+"""
+Index audit: compares what the models declare with what the database has.
+
+collect_indexes() reads the live schema (Django introspection, plus the system
+catalogs on Postgres for operator classes, predicates, sizes and scan counts)
+and tags every index with where it comes from: the primary key, a unique
+constraint, a field's db_index / ForeignKey, a Meta.indexes entry, or SQL the
+ORM does not manage. audit() then reports
+
+    duplicate   same table, method, columns and order as another index
+    prefix      its columns are a leading prefix of a wider index
+    unused      never scanned since the statistics were reset (Postgres only)
+
+Unique and primary-key indexes enforce constraints and are never proposed for
+removal. removal_operations() turns findings into migration operations.
+"""
+import logging
+from collections import defaultdict, namedtuple
+
+from django.apps import apps
+from django.db import connections, migrations
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE = "duplicate"
+PREFIX = "prefix"
+UNUSED = "unused"
+
+SOURCE_PK = "primary key"
+SOURCE_UNIQUE = "unique"
+SOURCE_FIELD = "db_index"
+SOURCE_FK = "ForeignKey"
+SOURCE_META = "Meta.indexes"
+SOURCE_LIKE = "LIKE twin"           # Postgres *_pattern_ops index Django adds next to a varchar/text index
+SOURCE_UNMANAGED = "unmanaged"
+
+# which of two identical indexes to keep: lower wins
+KEEP_PRIORITY = {SOURCE_PK: 0, SOURCE_UNIQUE: 1, SOURCE_FIELD: 2, SOURCE_FK: 2, SOURCE_META: 3, SOURCE_LIKE: 3,
+                 SOURCE_UNMANAGED: 4}
+
+Finding = namedtuple("Finding", ["kind", "index", "covered_by", "reason"])
+
+
+class IndexInfo:
+    def __init__(self, model, name, columns, orders, unique, primary, method="btree",
+                 partial=False, definition=None, size=None, scans=None):
+        self.model = model
+        self.table = model._meta.db_table
+        self.name = name
+        self.columns = tuple(columns)
+        self.orders = tuple(orders or ("ASC",) * len(columns))
+        self.unique = unique
+        self.primary = primary
+        self.method = method          # access method, plus the operator class if not the default
+        self.partial = partial
+        self.definition = definition  # CREATE INDEX statement when known
+        self.size = size              # bytes; None when the backend cannot tell
+        self.scans = scans            # Postgres idx_scan
+        self.source = SOURCE_UNMANAGED
+        self.field = None             # model field behind a db_index / ForeignKey index
+        self.meta_index = None        # models.Index behind a Meta.indexes entry
+
+    @property
+    def comparable(self):
+        """Plain column indexes only: expression and partial indexes are left alone."""
+        return bool(self.columns) and not self.partial
+
+    @property
+    def key(self):
+        return self.method, self.columns, self.orders
+
+    @property
+    def droppable(self):
+        # LIKE twins come and go with their field's index
+        return not (self.primary or self.unique or self.source == SOURCE_LIKE)
+
+    def __repr__(self):
+        return f"<IndexInfo {self.table}.{self.name} ({', '.join(self.columns)})>"
+
+
+# --------------------------
+# Collection
+# --------------------------
+def audited_models(app_labels=None):
+    """Concrete, managed models of the project apps (or of `app_labels`)."""
+    configs = [apps.get_app_config(label) for label in app_labels] if app_labels else [
+        config for config in apps.get_app_configs() if not config.name.startswith(("django.", "rest_framework"))
+        and "site-packages" not in (config.path or "")
+    ]
+    for config in configs:
+        for model in config.get_models(include_auto_created=True):
+            if model._meta.managed and not model._meta.proxy:
+                yield model
+
+
+def _postgres_details(connection):
+    """{index name: (definition, partial, size, scans)} for the current schema."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname, pg_get_indexdef(i.indexrelid), i.indpred IS NOT NULL,
+                   pg_relation_size(i.indexrelid), s.idx_scan
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+            WHERE pg_catalog.pg_table_is_visible(c.oid)
+        """)
+        return {name: (definition, partial, size, scans) for name, definition, partial, size, scans in cursor.fetchall()}
+
+
+def _sqlite_details(connection):
+    details = {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index'")
+        for name, sql in cursor.fetchall():
+            partial = bool(sql) and " WHERE " in sql.upper()
+            details[name] = (sql, partial, None, None)
+        try:
+            # only when SQLite is built with SQLITE_ENABLE_DBSTAT_VTAB
+            cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+            for name, size in cursor.fetchall():
+                if name in details:
+                    details[name] = (*details[name][:2], size, None)
+        except Exception:
+            pass
+    return details
+
+
+def _opclass_suffix(definition):
+    """'..._pattern_ops' style operator classes make an index a different kind of index."""
+    if not definition:
+        return ""
+    ops = sorted({word.strip("(),") for word in definition.split() if word.strip("(),").endswith("_ops")})
+    return f":{','.join(ops)}" if ops else ""
+
+
+def _tag_source(info):
+    meta = info.model._meta
+    for index in meta.indexes:
+        if index.name == info.name:
+            info.source, info.meta_index = SOURCE_META, index
+            return
+    if info.primary:
+        info.source = SOURCE_PK
+        return
+    if info.unique:
+        info.source = SOURCE_UNIQUE
+        return
+    if len(info.columns) == 1 and not info.partial:
+        if "_pattern_ops" in info.method and info.name.endswith("_like"):
+            info.source = SOURCE_LIKE
+            return
+        for field in meta.local_fields:
+            if field.column == info.columns[0] and field.db_index and not field.unique:
+                info.field = field
+                info.source = SOURCE_FK if field.is_relation else SOURCE_FIELD
+                return
+
+
+def collect_indexes(using="default", app_labels=None):
+    """Every index on the audited models' tables, as IndexInfo."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        details = _postgres_details(connection)
+    elif connection.vendor == "sqlite":
+        details = _sqlite_details(connection)
+    else:
+        details = {}
+
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+        result = []
+        for model in audited_models(app_labels):
+            if model._meta.db_table not in tables:
+                logger.warning(f"Table {model._meta.db_table} does not exist; run migrate first")
+                continue
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+            for name, c in constraints.items():
+                if not (c.get("index") or c.get("primary_key") or c.get("unique")):
+                    continue
+                definition, partial, size, scans = details.get(name, (None, False, None, None))
+                method = (c.get("type") or "btree")
+                if method == "idx":
+                    # SQLite reports plain b-tree indexes as "idx"
+                    method = "btree"
+                info = IndexInfo(
+                    model, name, c.get("columns") or [], c.get("orders"),
+                    unique=bool(c.get("unique")), primary=bool(c.get("primary_key")),
+                    method=method + _opclass_suffix(definition), partial=partial,
+                    definition=definition, size=size, scans=scans,
+                )
+                _tag_source(info)
+                result.append(info)
+    return result
+
+
+# --------------------------
+# Analysis
+# --------------------------
+def audit(indexes, include_unused=True):
+    """Findings for `indexes` (from collect_indexes); each droppable index is reported once."""
+    findings = []
+    flagged = set()
+    by_table = defaultdict(list)
+    for info in indexes:
+        by_table[info.table].append(info)
+
+    for table, infos in by_table.items():
+        comparable = [i for i in infos if i.comparable]
+
+        groups = defaultdict(list)
+        for info in comparable:
+            groups[info.key].append(info)
+        for same in groups.values():
+            if len(same) < 2:
+                continue
+            same.sort(key=lambda i: (KEEP_PRIORITY[i.source], i.name))
+            keep = same[0]
+            for info in same[1:]:
+                if info.droppable:
+                    findings.append(Finding(DUPLICATE, info, keep, f"same columns as {keep.name} ({keep.source})"))
+                    flagged.add(info.name)
+
+        remaining = [i for i in comparable if i.name not in flagged]
+        for info in remaining:
+            if not info.droppable:
+                continue
+            width = len(info.columns)
+            for wider in remaining:
+                if (wider is not info and wider.method == info.method and len(wider.columns) > width
+                        and wider.columns[:width] == info.columns and wider.orders[:width] == info.orders):
+                    findings.append(Finding(PREFIX, info, wider,
+                                            f"leading columns of {wider.name} ({', '.join(wider.columns)})"))
+                    flagged.add(info.name)
+                    break
+
+    if include_unused:
+        for info in indexes:
+            if info.scans == 0 and info.droppable and info.name not in flagged:
+                findings.append(Finding(UNUSED, info, None, "0 scans since statistics were reset"))
+                flagged.add(info.name)
+    return findings
+
+
+def write_amplification(indexes, findings):
+    """
+    Per table: index entries written per INSERT now and after dropping the
+    findings (every index gets one entry per row, on top of the table write).
+    """
+    removable = defaultdict(int)
+    reclaim = defaultdict(int)
+    for finding in findings:
+        removable[finding.index.table] += 1
+        reclaim[finding.index.table] += finding.index.size or 0
+
+    tables = defaultdict(lambda: {"indexes": 0, "index_bytes": 0})
+    for info in indexes:
+        tables[info.table]["indexes"] += 1
+        tables[info.table]["index_bytes"] += info.size or 0
+
+    report = {}
+    for table, stats in sorted(tables.items()):
+        before = stats["indexes"]
+        after = before - removable[table]
+        report[table] = {
+            "indexes": before,
+            "removable": removable[table],
+            "writes_per_insert": 1 + before,
+            "writes_per_insert_after": 1 + after,
+            "saving_pct": round(100 * (before - after) / (1 + before), 1),
+            "index_bytes": stats["index_bytes"] or None,
+            "reclaimable_bytes": reclaim[table] or None,
+        }
+    return report
+
+
+def stats_reset(using="default"):
+    """When Postgres index statistics were last reset (the window 'unused' covers)."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+# --------------------------
+# Migration operations
+# --------------------------
+def removal_operations(findings):
+    """
+    {app_label: [operation, ...]} dropping the findings, plus the model edits
+    that keep makemigrations in step: [(app_label, message), ...].
+    """
+    operations = defaultdict(list)
+    edits = []
+    altered = set()
+    for finding in findings:
+        info = finding.index
+        meta = info.model._meta
+        if meta.auto_created:
+            edits.append((meta.app_label, f"{info.name} on auto-created table {info.table}: drop it by hand"))
+            continue
+
+        if info.source == SOURCE_META:
+            operations[meta.app_label].append(migrations.RemoveIndex(model_name=meta.model_name, name=info.name))
+            edits.append((meta.app_label, f"{meta.object_name}: remove Meta.indexes entry "
+                                          f"{info.meta_index.fields or info.meta_index.expressions}"))
+        elif info.source in (SOURCE_FIELD, SOURCE_FK):
+            if (meta.label, info.field.name) in altered:
+                continue
+            altered.add((meta.label, info.field.name))
+            field = info.field.clone()
+            field.db_index = False
+            operations[meta.app_label].append(
+                migrations.AlterField(model_name=meta.model_name, name=info.field.name, field=field)
+            )
+            edits.append((meta.app_label, f"{meta.object_name}.{info.field.name}: set db_index=False"))
+        elif info.source == SOURCE_UNMANAGED:
+            operations[meta.app_label].append(migrations.RunSQL(
+                f'DROP INDEX IF EXISTS "{info.name}";',
+                reverse_sql=f"{info.definition};" if info.definition else migrations.RunSQL.noop,
+            ))
+    return dict(operations), edits
@@ -0,0 +1,201 @@
+"""
+Non-blocking logging.
+
+QueueLogHandler is the only handler loggers write to: emit() puts the record
+on an in-memory queue and returns. A QueueListener thread formats records as
+JSON and writes them to a rotating file (size- or time-based), optionally to
+the console, and hands CRITICAL records to CriticalAlertHandler, which
+deduplicates and rate-limits alert emails and sends them on their own thread.
+
+SamplingFilter keeps only a share of low-level records from noisy loggers
+(e.g. django.db.backends at DEBUG) before they are queued.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+# attributes every LogRecord has; anything else came in through `extra=`
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+# --------------------------
+# Formatting / filtering
+# --------------------------
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    rates: {logger name prefix: share to keep, 0..1}. Only records at or below
+    `max_level` are sampled; the longest matching prefix wins. Sampling is
+    1-in-N per prefix, so the kept share is exact rather than random.
+    """
+
+    def __init__(self, rates=None, max_level="DEBUG"):
+        super().__init__()
+        self.max_level = max_level if isinstance(max_level, int) else logging.getLevelName(max_level)
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.counters = {prefix: itertools.count() for prefix, _ in self.rates}
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if rate <= 0:
+                    return False
+                every = max(1, round(1 / rate))
+                return next(self.counters[prefix]) % every == 0
+        return True
+
+
+# --------------------------
+# Critical alerts
+# --------------------------
+class CriticalAlertHandler(logging.Handler):
+    """
+    Emails CRITICAL records. Identical alerts (same logger + message template)
+    are sent once per `dedupe_seconds` across processes (shared cache), at most
+    `rate` alerts go out overall, and each email is sent on a short-lived thread.
+    """
+
+    def __init__(self, recipients=None, dedupe_seconds=900, rate="10/h", subject_prefix="CRITICAL"):
+        super().__init__(level=logging.CRITICAL)
+        self.recipients = [r for r in (recipients or []) if r]
+        self.dedupe_seconds = dedupe_seconds
+        self.rate = rate
+        self.subject_prefix = subject_prefix
+        self._limiter = None
+
+    def emit(self, record):
+        if not self.recipients:
+            return
+        try:
+            from django.core.cache import cache
+
+            template = getattr(record, "_msg_template", record.msg)
+            fingerprint = hashlib.sha1(f"{record.name}|{template}".encode()).hexdigest()
+            if not cache.add(f"log_alert:{fingerprint}", 1, timeout=self.dedupe_seconds):
+                return
+            if not self.limiter().hit("all").allowed:
+                return
+
+            subject = f"{self.subject_prefix}: {record.name} error"
+            body = record.getMessage()
+            if record.exc_text:
+                body = f"{body}\n\n{record.exc_text}"
+            threading.Thread(target=self.send, args=(subject, body, record), name="log-alert", daemon=True).start()
+        except Exception:
+            self.handleError(record)
+
+    def limiter(self):
+        if self._limiter is None:
+            from restserver.utils.ratelimit import RateLimiter
+
+            self._limiter = RateLimiter("log_alerts", self.rate)
+        return self._limiter
+
+    def send(self, subject, body, record):
+        from django.conf import settings
+        from django.core.mail import send_mail
+
+        try:
+            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, self.recipients, fail_silently=False)
+        except Exception:
+            # not through logging: a failing alert must not raise another alert
+            self.handleError(record)
+
+
+# --------------------------
+# Queue handler
+# --------------------------
+class QueueLogHandler(QueueHandler):
+    """
+    dictConfig-friendly queue handler that owns its listener and targets:
+
+        'queue': {
+            '()': 'restserver.utils.log.QueueLogHandler',
+            'filename': 'logs/app.log',     # JSON lines; None for console only
+            'max_bytes': 50 * 1024 * 1024,  # size rotation ...
+            'when': None,                   # ... or time rotation, e.g. 'midnight'
+            'backup_count': 10,
+            'console': True,
+            'alert_recipients': ['ops@example.com'],
+        }
+    """
+
+    def __init__(self, filename=None, max_bytes=50 * 1024 * 1024, when=None, backup_count=10,
+                 console=True, alert_recipients=None, queue_size=10000, **alert_options):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        targets = []
+
+        if filename:
+            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+            if when:
+                file_handler = TimedRotatingFileHandler(filename, when=when, backupCount=backup_count,
+                                                        encoding="utf-8", delay=True)
+            else:
+                file_handler = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                                   encoding="utf-8", delay=True)
+            file_handler.setFormatter(JSONFormatter())
+            targets.append(file_handler)
+
+        if console:
+            stream = logging.StreamHandler()
+            stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)8s %(name)s %(message)s"))
+            targets.append(stream)
+
+        if alert_recipients:
+            targets.append(CriticalAlertHandler(alert_recipients, **alert_options))
+
+        self.listener = QueueListener(self.queue, *targets, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record):
+        # render message and traceback now; args / exc_info may not survive the thread hop
+        record = logging.makeLogRecord(vars(record))
+        record._msg_template = str(record.msg)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # never block the request thread; dropping is preferable
+            pass
+
+    def close(self):
+        # logging.shutdown() closes handlers at exit: flush the queue once, then stop
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
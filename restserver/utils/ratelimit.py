@@ -0,0 +1,250 @@
+"""
+Atomic rate limiting: one Redis round trip per check (Lua script), fixed or
+sliding window, with an in-memory backend for tests and non-Redis caches.
+
+    limiter = RateLimiter("otp_send", "5/5m", mode=SLIDING)
+    result = limiter.hit(email)          # RateLimitResult(allowed, count, limit, retry_after)
+
+Views use either the DRF throttle (LuaRateThrottle subclasses with a `scope`)
+or the @rate_limit decorator on APIView methods. Rates may be overridden per
+scope in settings.RATELIMIT_RATES; settings.RATELIMIT_BACKEND is "redis",
+"memory" or unset (Redis when the default cache is django_redis).
+"""
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import deque, namedtuple
+from functools import wraps
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+FIXED = "fixed"
+SLIDING = "sliding"
+
+RateLimitResult = namedtuple("RateLimitResult", ["allowed", "count", "limit", "retry_after"])
+
+RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\w*\s*$")
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'100/m' -> (100, 60), '5/5m' -> (5, 300), '1000/day' -> (1000, 86400)"""
+    match = RATE_RE.match(rate or "")
+    if not match:
+        raise ValueError(f"Invalid rate '{rate}'")
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * UNIT_SECONDS[unit]
+
+
+# --------------------------
+# Backends
+# --------------------------
+# KEYS[1] counter key; ARGV[1] limit, ARGV[2] window ms
+FIXED_WINDOW_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    ttl = tonumber(ARGV[2])
+end
+local allowed = 0
+if count <= tonumber(ARGV[1]) then allowed = 1 end
+return {allowed, count, ttl}
+"""
+
+# KEYS[1] sorted set of hit timestamps; ARGV[1] limit, ARGV[2] window ms, ARGV[3] unique member.
+# Rejected hits are not recorded, so a client hammering the limit is let back in on time.
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, count + 1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if oldest[2] == nil then return {0, count, window} end
+return {0, count, tonumber(oldest[2]) + window - now}
+"""
+
+
+class RedisBackend:
+    def __init__(self, alias="default"):
+        from django_redis import get_redis_connection
+
+        client = get_redis_connection(alias)
+        # register_script runs EVALSHA and falls back to EVAL after a SCRIPT FLUSH
+        self.scripts = {
+            FIXED: client.register_script(FIXED_WINDOW_LUA),
+            SLIDING: client.register_script(SLIDING_WINDOW_LUA),
+        }
+
+    def hit(self, key, limit, window, mode):
+        allowed, count, retry_ms = self.scripts[mode](
+            keys=[key], args=[limit, int(window * 1000), uuid.uuid4().hex]
+        )
+        return RateLimitResult(bool(allowed), int(count), limit, 0 if allowed else int(retry_ms) / 1000)
+
+
+class MemoryBackend:
+    """Same semantics as RedisBackend, per process. `clock` is injectable for tests."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.fixed = {}      # key -> (window end, count)
+        self.sliding = {}    # key -> deque of hit times
+
+    def hit(self, key, limit, window, mode):
+        now = self.clock()
+        with self.lock:
+            if mode == FIXED:
+                end, count = self.fixed.get(key, (0, 0))
+                if now >= end:
+                    end, count = now + window, 0
+                count += 1
+                self.fixed[key] = (end, count)
+                allowed = count <= limit
+                return RateLimitResult(allowed, count, limit, 0 if allowed else end - now)
+
+            hits = self.sliding.setdefault(key, deque())
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) < limit:
+                hits.append(now)
+                return RateLimitResult(True, len(hits), limit, 0)
+            return RateLimitResult(False, len(hits), limit, hits[0] + window - now)
+
+    def reset(self):
+        with self.lock:
+            self.fixed.clear()
+            self.sliding.clear()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                choice = getattr(settings, "RATELIMIT_BACKEND", None)
+                if choice is None:
+                    choice = "redis" if "django_redis" in settings.CACHES["default"]["BACKEND"] else "memory"
+                _backend = RedisBackend() if choice == "redis" else MemoryBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """Swap the process-wide backend (tests); returns the previous one."""
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+# --------------------------
+# Limiter
+# --------------------------
+class RateLimiter:
+    KEY_PREFIX = "rl"
+
+    def __init__(self, name, rate, mode=FIXED):
+        if mode not in (FIXED, SLIDING):
+            raise ValueError(f"Unknown rate limit mode '{mode}'")
+        self.name = name
+        self.rate = rate
+        self.mode = mode
+        self.limit, self.window = parse_rate(rate)
+
+    def hit(self, identity):
+        """Count one request for `identity`. Fails open if the backend is unreachable."""
+        key = f"{self.KEY_PREFIX}:{self.name}:{self.mode}:{identity}"
+        try:
+            return get_backend().hit(key, self.limit, self.window, self.mode)
+        except Exception as e:
+            logger.warning(f"Rate limiter '{self.name}' unavailable, allowing request: {e}")
+            return RateLimitResult(True, 0, self.limit, 0)
+
+
+def configured_rate(scope, default):
+    return getattr(settings, "RATELIMIT_RATES", {}).get(scope, default)
+
+
+# --------------------------
+# DRF throttle / decorator
+# --------------------------
+def client_ip(request):
+    return BaseThrottle().get_ident(request)
+
+
+class LuaRateThrottle(BaseThrottle):
+    """
+    Subclass with `scope`, `rate` (overridable via settings.RATELIMIT_RATES),
+    `mode`, and optionally get_identity() (default: client IP).
+    """
+    scope = None
+    rate = None
+    mode = FIXED
+
+    def __init__(self):
+        self.limiter = RateLimiter(self.scope, configured_rate(self.scope, self.rate), self.mode)
+        self.result = None
+
+    def get_identity(self, request, view):
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        identity = self.get_identity(request, view)
+        if identity is None:
+            return True
+        self.result = self.limiter.hit(identity)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after if self.result else None
+
+
+def rate_limit(rate, key="ip", mode=FIXED, name=None):
+    """
+    Decorator for APIView handlers (self, request, ...). `key` is "ip", "user"
+    or a callable(request) -> identity. Over the limit returns 429 with Retry-After.
+    """
+    def decorator(func):
+        scope = name or f"{func.__module__}.{func.__qualname__}"
+        limiter = RateLimiter(scope, configured_rate(scope, rate), mode)
+
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if callable(key):
+                identity = key(request)
+            elif key == "user" and request.user and request.user.is_authenticated:
+                identity = f"user:{request.user.pk}"
+            else:
+                identity = client_ip(request)
+
+            result = limiter.hit(identity)
+            if not result.allowed:
+                retry_after = max(1, round(result.retry_after))
+                return Response(
+                    {"error": "Too many requests. Try again later.", "retry_after": retry_after},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(retry_after)},
+                )
+            return func(self, request, *args, **kwargs)
+        return wrapper
+    return decorator
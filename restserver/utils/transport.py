@@ -0,0 +1,97 @@
+"""
+Single entry point for outbound third-party HTTP (Typeform, Google Sheets, WATI, Graph).
+
+settings.INTEGRATION_TRANSPORT selects where calls go:
+    "live"    -> the real APIs (default)
+    "standin" -> restserver.standin: recorded fixtures + synthetic data, no network
+    "record"  -> the real APIs, saving JSON responses of requests-based calls as
+                 stand-in fixtures (the googleapiclient Sheets calls are not recorded)
+"""
+import threading
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+
+TRANSPORT_LIVE = "live"
+TRANSPORT_STANDIN = "standin"
+TRANSPORT_RECORD = "record"
+
+_override = None
+# settings-built StandInConfig, shared by every call in the process so its RNG
+# keeps advancing; a fresh one per call would repeat the seed's first draw
+_config = None
+_config_lock = threading.Lock()
+
+
+def current_transport():
+    if _override is not None:
+        return _override[0]
+    return getattr(settings, "INTEGRATION_TRANSPORT", TRANSPORT_LIVE)
+
+
+def _standin_config():
+    global _config
+    from restserver.standin.config import StandInConfig
+
+    if _override is not None and _override[1] is not None:
+        return _override[1]
+    with _config_lock:
+        if _config is None:
+            _config = StandInConfig.from_settings()
+        return _config
+
+
+def reset_standin_config():
+    """Drop the cached config; the next call re-reads settings.STANDIN and reseeds."""
+    global _config
+    with _config_lock:
+        _config = None
+
+
+@contextmanager
+def use_transport(transport, config=None):
+    """Temporarily switch transports (benchmarks, tests); config is a StandInConfig."""
+    global _override
+    previous = _override
+    _override = (transport, config)
+    reset_standin_config()
+    try:
+        yield
+    finally:
+        _override = previous
+        reset_standin_config()
+
+
+def http_session():
+    """requests.Session routed according to the active transport."""
+    session = requests.Session()
+    transport = current_transport()
+    if transport == TRANSPORT_STANDIN:
+        from restserver.standin.adapter import StandInAdapter
+
+        adapter = StandInAdapter(_standin_config())
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    elif transport == TRANSPORT_RECORD:
+        from restserver.standin.adapter import RecordingAdapter
+
+        adapter = RecordingAdapter(_standin_config())
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
+
+
+def sheets_service(credentials_file, scopes):
+    """Google Sheets v4 service; the stand-in needs no credentials."""
+    from googleapiclient.discovery import build
+
+    if current_transport() == TRANSPORT_STANDIN:
+        from restserver.standin.adapter import StandInHttp
+
+        return build("sheets", "v4", http=StandInHttp(_standin_config()), cache_discovery=False)
+
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_file(credentials_file, scopes=scopes)
+    return build("sheets", "v4", credentials=creds, cache_discovery=False)
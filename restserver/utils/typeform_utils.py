@@ -1,6 +1,8 @@
 import requests
 import logging
 
+from restserver.utils.transport import http_session
+
 TYPEFORM_API_BASE = "https://api.typeform.com"
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ def get_typeform_details(form_id, token):
     print(f"Header: {headers}")  # ✅ fixed printing
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session().get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -43,7 +45,7 @@ def fetch_typeform_data(form_id, token):
     print(f"Header: {headers}")  # ✅ fixed printing
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_session().get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.json()
 
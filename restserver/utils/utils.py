@@ -79,27 +79,21 @@ def send_welcome_email(self, email):
 
 
 import os
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from django.conf import settings
 
+from restserver.utils.transport import sheets_service
+
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
 def get_sheet_names(spreadsheet_id):
-    creds = service_account.Credentials.from_service_account_file(
-        settings.GOOGLE_SHEETS_CREDENTIALS_FILE, scopes=SCOPES
-    )
-    service = build("sheets", "v4", credentials=creds)
+    service = sheets_service(settings.GOOGLE_SHEETS_CREDENTIALS_FILE, SCOPES)
     sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
     sheet_titles = [sheet['properties']['title'] for sheet in sheet_metadata.get('sheets', [])]
     return sheet_titles
 
 
 def fetch_sheet_data(spreadsheet_id, sheet_name=None, range_cols="A:Z"):
-    creds = service_account.Credentials.from_service_account_file(
-        settings.GOOGLE_SHEETS_CREDENTIALS_FILE, scopes=SCOPES
-    )
-    service = build("sheets", "v4", credentials=creds)
+    service = sheets_service(settings.GOOGLE_SHEETS_CREDENTIALS_FILE, SCOPES)
 
     if not sheet_name:
         sheet_names = get_sheet_names(spreadsheet_id)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SuperadminConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'superadmin'
+
+    def ready(self):
+        import superadmin.signals  # noqa
@@ -18,5 +18,17 @@ class Config:
     OTP_TTL_SECONDS = int(os.getenv('OTP_TTL_SECONDS', 300))  # 5 minutes
     OTP_RATE_LIMIT_WINDOW = int(os.getenv('OTP_RATE_LIMIT_WINDOW', 300))  # 5 min rate window
     OTP_RATE_LIMIT_MAX = int(os.getenv('OTP_RATE_LIMIT_MAX', 5))  # max 5 per window
+    # OTP mail goes through the Celery worker (superadmin.tasks); False sends it before the API answers
+    OTP_ASYNC_DELIVERY = os.getenv('OTP_ASYNC_DELIVERY', 'True').lower() in ('1', 'true', 'yes')
+    MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', 4))  # background sends, first try included
+    MAIL_RETRY_BACKOFF = float(os.getenv('MAIL_RETRY_BACKOFF', 2))  # seconds before the 2nd try, doubling
+    MAIL_RETRY_BACKOFF_MAX = float(os.getenv('MAIL_RETRY_BACKOFF_MAX', 60))
+    MAIL_STATUS_TTL = int(os.getenv('MAIL_STATUS_TTL', 86400))  # how long delivery_status() remembers a message
+    SMTP_IDLE_SECONDS = int(os.getenv('SMTP_IDLE_SECONDS', 60))  # close the warm SMTP connection after this
+    AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 1024))  # per-process LRU entries
+    AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 3600))  # seconds a user stays in Redis
+    PROVISION_MAX_ROWS = int(os.getenv('PROVISION_MAX_ROWS', 1000))  # users per bulk request
+    PROVISION_HASH_WORKERS = int(os.getenv('PROVISION_HASH_WORKERS', 0))  # 0 = one per CPU
+    PROVISION_POOL_MIN = int(os.getenv('PROVISION_POOL_MIN', 16))  # fewer passwords are hashed inline
     ERROR_RECIPIENT = os.getenv('ERROR_RECIPIENT', 'admin@gxinetworks.com')
     REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1')
@@ -0,0 +1,133 @@
+"""
+Org hierarchy closure table (UserHierarchy) over the creator links.
+
+A user's parent is created_by_manager, else created_by_superadmin. Every user
+has a depth-0 self row plus one row per ancestor, so subtree membership and
+scoped listing are single indexed lookups on (ancestor, depth).
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import UserHierarchy, UserProfile
+
+
+def parent_id(user):
+    return user.created_by_manager_id or user.created_by_superadmin_id
+
+
+# --------------------------
+# Queries
+# --------------------------
+def subtree(user, include_self=False):
+    """Everyone under `user`, transitively, in one query."""
+    return UserProfile.objects.filter(
+        ancestor_links__ancestor=user,
+        ancestor_links__depth__gte=0 if include_self else 1,
+    )
+
+
+def in_subtree(ancestor, descendant_id, include_self=False):
+    return UserHierarchy.objects.filter(
+        ancestor=ancestor, descendant_id=descendant_id, depth__gte=0 if include_self else 1
+    ).exists()
+
+
+# --------------------------
+# Maintenance
+# --------------------------
+def check_parent(user, new_parent_id):
+    """Reject a parent that lies inside the user's own subtree (would create a cycle)."""
+    if user.pk and new_parent_id and in_subtree(user, new_parent_id, include_self=True):
+        raise ValidationError("A user cannot be created by one of their own reports.")
+
+
+@transaction.atomic
+def insert_node(user):
+    """New user: self row + one row per ancestor of the parent."""
+    rows = [UserHierarchy(ancestor_id=user.pk, descendant_id=user.pk, depth=0)]
+    parent = parent_id(user)
+    if parent:
+        rows += [
+            UserHierarchy(ancestor_id=ancestor, descendant_id=user.pk, depth=depth + 1)
+            for ancestor, depth in UserHierarchy.objects.filter(descendant_id=parent).values_list("ancestor_id", "depth")
+        ]
+    UserHierarchy.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+@transaction.atomic
+def insert_nodes(users):
+    """insert_node() for many new users (bulk_create bypasses the signals) in two queries."""
+    parents = {parent_id(u) for u in users} - {None}
+    ancestors = {}
+    for ancestor, descendant, depth in UserHierarchy.objects.filter(descendant_id__in=parents).values_list(
+            "ancestor_id", "descendant_id", "depth"):
+        ancestors.setdefault(descendant, []).append((ancestor, depth))
+
+    rows = []
+    for user in users:
+        rows.append(UserHierarchy(ancestor_id=user.pk, descendant_id=user.pk, depth=0))
+        rows += [
+            UserHierarchy(ancestor_id=ancestor, descendant_id=user.pk, depth=depth + 1)
+            for ancestor, depth in ancestors.get(parent_id(user), [])
+        ]
+    UserHierarchy.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+@transaction.atomic
+def move_node(user):
+    """Parent changed: re-link the user's whole subtree under the new parent's ancestors."""
+    nodes = list(UserHierarchy.objects.filter(ancestor=user).values_list("descendant_id", "depth"))
+    node_ids = [pk for pk, _ in nodes]
+
+    # cut links from the old ancestors into the subtree
+    UserHierarchy.objects.filter(descendant_id__in=node_ids).exclude(ancestor_id__in=node_ids).delete()
+
+    parent = parent_id(user)
+    if parent:
+        ancestors = list(UserHierarchy.objects.filter(descendant_id=parent).values_list("ancestor_id", "depth"))
+        UserHierarchy.objects.bulk_create([
+            UserHierarchy(ancestor_id=ancestor, descendant_id=node, depth=up + down + 1)
+            for ancestor, up in ancestors
+            for node, down in nodes
+        ], ignore_conflicts=True)
+
+
+@transaction.atomic
+def detach_node(user):
+    """
+    Before delete: cut every link from `user` and its ancestors into its
+    subtree (the user's own rows go with the CASCADE). Returns the direct
+    reports, to pass to reattach() once the delete has nulled their creator FK.
+    """
+    below = UserHierarchy.objects.filter(ancestor=user, depth__gte=1)
+    node_ids = list(below.values_list("descendant_id", flat=True))
+    children = list(below.filter(depth=1).values_list("descendant_id", flat=True))
+    UserHierarchy.objects.filter(descendant_id__in=node_ids).exclude(ancestor_id__in=node_ids).delete()
+    return children
+
+
+def reattach(user_ids):
+    """After delete: reports that still have the other creator link hang under it."""
+    for user in UserProfile.objects.filter(pk__in=user_ids):
+        if parent_id(user):
+            move_node(user)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute the whole table from the creator links; returns the row count."""
+    parents = {
+        pk: manager or superadmin
+        for pk, manager, superadmin in UserProfile.objects.values_list(
+            "id", "created_by_manager_id", "created_by_superadmin_id")
+    }
+    rows = []
+    for pk in parents:
+        node, depth, seen = pk, 0, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(UserHierarchy(ancestor_id=node, descendant_id=pk, depth=depth))
+            node, depth = parents.get(node), depth + 1
+    UserHierarchy.objects.all().delete()
+    UserHierarchy.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
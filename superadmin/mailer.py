@@ -0,0 +1,256 @@
+"""
+Background email delivery through Celery.
+
+enqueue() records the message as queued and publishes a superadmin.tasks
+send_html_email task on the broker, so request handlers never wait on SMTP
+and queued mail survives a web or worker restart. The task sends with
+deliver() in the worker, which keeps one SMTP connection open between
+messages (reopened after Config.SMTP_IDLE_SECONDS idle). A failed send is
+retried by the task up to Config.MAIL_MAX_ATTEMPTS times with exponential
+backoff. Every queued message gets an id; delivery_status(id) reports
+queued / retrying / sent / failed, and failures are counted in
+delivery_metrics().
+
+Templates are compiled once per worker process. Delivery latencies are
+recorded in LatencyHistogram, which keeps its buckets in the shared cache so
+every worker process adds to the same counts.
+"""
+import logging
+import time
+import uuid
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------
+# Templates
+# --------------------------
+@lru_cache(maxsize=64)
+def get_cached_template(template_name):
+    return get_template(template_name)
+
+
+def render_email(template_name, context):
+    """Returns (html, plain) for an email template."""
+    html = get_cached_template(template_name).render(context)
+    return html, strip_tags(html)
+
+
+def build_html_message(to_list, subject, template_name, context, from_email=None, connection=None):
+    html, plain = render_email(template_name, context)
+    email = EmailMessage(subject, plain, from_email or Config.DEFAULT_FROM_EMAIL, to_list, connection=connection)
+    email.content_subtype = "html"
+    email.body = html
+    return email
+
+
+# --------------------------
+# Latency histograms
+# --------------------------
+FAILED_KEY = "mail_latency:failed"
+
+
+def _incr(key, delta=1):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # evicted between add and incr
+        cache.set(key, delta, timeout=None)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram (milliseconds) stored as cache counters.
+    Bucket counts are per bucket (not cumulative); `le` is the upper bound.
+    """
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+    KEY_PREFIX = "mail_latency"
+
+    def __init__(self, name):
+        self.name = name
+
+    def _key(self, suffix):
+        return f"{self.KEY_PREFIX}:{self.name}:{suffix}"
+
+    def observe(self, ms):
+        bucket = next((b for b in self.BUCKETS_MS if ms <= b), "inf")
+        _incr(self._key(bucket))
+        _incr(self._key("count"))
+        _incr(self._key("sum_us"), int(ms * 1000))
+
+    def snapshot(self):
+        labels = [*self.BUCKETS_MS, "inf"]
+        values = cache.get_many([self._key(b) for b in labels] + [self._key("count"), self._key("sum_us")])
+        buckets = {str(b): values.get(self._key(b), 0) for b in labels}
+        count = values.get(self._key("count"), 0)
+        total_ms = values.get(self._key("sum_us"), 0) / 1000
+        return {
+            "count": count,
+            "avg_ms": round(total_ms / count, 1) if count else None,
+            "p50_ms": self._quantile(buckets, count, 0.50),
+            "p95_ms": self._quantile(buckets, count, 0.95),
+            "p99_ms": self._quantile(buckets, count, 0.99),
+            "buckets": buckets,
+        }
+
+    @staticmethod
+    def _quantile(buckets, count, q):
+        """Upper bound of the bucket holding the q-th observation."""
+        if not count:
+            return None
+        seen = 0
+        for label, n in buckets.items():
+            seen += n
+            if seen >= q * count:
+                return None if label == "inf" else int(label)
+        return None
+
+    def reset(self):
+        cache.delete_many([self._key(b) for b in [*self.BUCKETS_MS, "inf"]] + [self._key("count"), self._key("sum_us")])
+
+
+# queued -> picked by the sender, SMTP send, and queued -> delivered
+QUEUE_WAIT = LatencyHistogram("queue_wait")
+SMTP_SEND = LatencyHistogram("smtp_send")
+DELIVERY = LatencyHistogram("delivery")
+HISTOGRAMS = {h.name: h for h in (QUEUE_WAIT, SMTP_SEND, DELIVERY)}
+
+
+RETRIED_KEY = "mail_latency:retried"
+PENDING_KEY = "mail_latency:pending"
+
+
+def delivery_metrics():
+    return {
+        **{name: h.snapshot() for name, h in HISTOGRAMS.items()},
+        "failed": cache.get(FAILED_KEY, 0),
+        "retried": cache.get(RETRIED_KEY, 0),
+        "pending": max(cache.get(PENDING_KEY, 0), 0),
+    }
+
+
+# --------------------------
+# Per-message status
+# --------------------------
+STATUS_QUEUED = "queued"
+STATUS_RETRYING = "retrying"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+def _status_key(message_id):
+    return f"mail_delivery:{message_id}"
+
+
+def _set_status(message_id, status, attempts=0, error=""):
+    cache.set(_status_key(message_id), {"status": status, "attempts": attempts, "error": error},
+              Config.MAIL_STATUS_TTL)
+
+
+def delivery_status(message_id):
+    """{"status", "attempts", "error"} for a message id returned by enqueue(), or None once forgotten."""
+    return cache.get(_status_key(message_id))
+
+
+# --------------------------
+# Queue (web) / deliver (worker)
+# --------------------------
+PUBLISH_RETRY_POLICY = {"max_retries": 2, "interval_start": 0, "interval_step": 0.2, "interval_max": 0.5}
+
+
+def enqueue(to_list, subject, template_name, context, from_email=None):
+    """Publish an HTML email to the worker; returns its message id, or None if the broker is unreachable."""
+    from .tasks import send_html_email
+
+    message_id = uuid.uuid4().hex
+    _set_status(message_id, STATUS_QUEUED)
+    _incr(PENDING_KEY)
+    try:
+        send_html_email.apply_async(
+            args=[message_id, to_list, subject, template_name, context, from_email, time.time()],
+            retry=True, retry_policy=PUBLISH_RETRY_POLICY,
+        )
+    except Exception as e:
+        logger.error(f"Could not queue '{subject}' to {to_list}: {e}")
+        _incr(PENDING_KEY, -1)
+        _set_status(message_id, STATUS_FAILED, 0, f"not queued: {e}"[:500])
+        _incr(FAILED_KEY)
+        return None
+    return message_id
+
+
+def backoff(attempt):
+    """Seconds to wait after failed attempt number `attempt`."""
+    return min(Config.MAIL_RETRY_BACKOFF * 2 ** (attempt - 1), Config.MAIL_RETRY_BACKOFF_MAX)
+
+
+class _WarmConnection:
+    """One SMTP connection per worker process, reused between messages."""
+
+    def __init__(self):
+        self.connection = None
+        self.last_used = 0
+
+    def get(self):
+        if self.connection is not None and time.monotonic() - self.last_used > Config.SMTP_IDLE_SECONDS:
+            self.close()
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+            self.connection.open()
+        self.last_used = time.monotonic()
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+
+smtp = _WarmConnection()
+
+
+def deliver(message_id, attempt, queued_at, to_list, subject, template_name, context, from_email=None):
+    """
+    One send attempt (in the worker). Returns True once the message is sent or
+    given up on, False if the caller should retry after backoff(attempt).
+    """
+    picked_at = time.time()
+    if attempt == 1 and queued_at:
+        QUEUE_WAIT.observe(max(picked_at - queued_at, 0) * 1000)
+
+    try:
+        build_html_message(to_list, subject, template_name, context, from_email, smtp.get()).send(fail_silently=False)
+    except Exception as e:
+        # a dropped idle connection fails here too; the next attempt opens a fresh one
+        smtp.close()
+        if attempt >= Config.MAIL_MAX_ATTEMPTS:
+            logger.error(f"Failed to send '{subject}' to {to_list} after {attempt} attempts: {e}")
+            _set_status(message_id, STATUS_FAILED, attempt, str(e)[:500])
+            _incr(FAILED_KEY)
+            _incr(PENDING_KEY, -1)
+            return True
+        logger.warning(f"Sending '{subject}' to {to_list} failed (attempt {attempt}), "
+                       f"retrying in {backoff(attempt)}s: {e}")
+        _set_status(message_id, STATUS_RETRYING, attempt, str(e)[:500])
+        _incr(RETRIED_KEY)
+        return False
+
+    sent_at = time.time()
+    _set_status(message_id, STATUS_SENT, attempt)
+    _incr(PENDING_KEY, -1)
+    SMTP_SEND.observe((sent_at - picked_at) * 1000)
+    if queued_at:
+        DELIVERY.observe(max(sent_at - queued_at, 0) * 1000)
+    return True
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from superadmin.hierarchy import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the UserHierarchy closure table from the creator links."
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(f"UserHierarchy rebuilt: {rows} rows")
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+TRIGRAM_COLUMNS = ["email", "first_name", "last_name", "full_name"]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm GIN indexes matching the UPPER(col::text) LIKE that icontains emits,
+    # so the user directory search does not scan the table; Postgres only
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS superadmin_userprofile_{column}_trgm "
+            f"ON superadmin_userprofile USING gin (UPPER(({column})::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS superadmin_userprofile_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('superadmin', '0007_alter_userprofile_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
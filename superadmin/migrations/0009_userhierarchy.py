@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_hierarchy(apps, schema_editor):
+    UserProfile = apps.get_model('superadmin', 'UserProfile')
+    UserHierarchy = apps.get_model('superadmin', 'UserHierarchy')
+    parents = {
+        pk: manager_id or superadmin_id
+        for pk, manager_id, superadmin_id in UserProfile.objects.values_list(
+            'id', 'created_by_manager_id', 'created_by_superadmin_id')
+    }
+    rows = []
+    for pk in parents:
+        node, depth, seen = pk, 0, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(UserHierarchy(ancestor_id=node, descendant_id=pk, depth=depth))
+            node, depth = parents.get(node), depth + 1
+    UserHierarchy.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('superadmin', '0008_userprofile_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to=settings.AUTH_USER_MODEL)),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='superadmin__ancesto_8e10b2_idx'), models.Index(fields=['descendant', 'depth'], name='superadmin__descend_aa8c66_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(backfill_hierarchy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('superadmin', '0009_userhierarchy'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userhierarchy',
+            name='ancestor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='userhierarchy',
+            name='descendant',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
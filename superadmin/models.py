@@ -84,8 +84,18 @@ class UserProfile(AbstractBaseUser, PermissionsMixin):
         if self.created_by_manager and self.created_by_manager_id == self.id:
             raise ValidationError("created_by_manager cannot be the user itself.")
 
+        # reject cycles through the creator links, checked against the closure table when they change
+        parent = self.created_by_manager_id or self.created_by_superadmin_id
+        if self.pk and parent and parent != getattr(self, '_loaded_parent', parent):
+            from .hierarchy import check_parent
+            check_parent(self, parent)
+
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.apply_role_flags()
+        super().save(*args, **kwargs)
+
+    def apply_role_flags(self):
         # set staff flags implicitly (keeps serializer code simpler)
         if self.role == self.ROLE_SUPERADMIN:
             self.is_staff = True
@@ -96,7 +106,6 @@ class UserProfile(AbstractBaseUser, PermissionsMixin):
         else:
             self.is_staff = False
             self.is_superuser = False
-        super().save(*args, **kwargs)
 
     def get_creator_info(self):
         if self.role == self.ROLE_MANAGER and self.created_by_superadmin:
@@ -212,3 +221,27 @@ class hiring_managerUser(UserProfile):
         self.role = UserProfile.Hiring_Manager
         super().save(*args, **kwargs)
 
+
+
+class UserHierarchy(models.Model):
+    """
+    Closure table over the creator links (created_by_manager, else
+    created_by_superadmin): one row per (ancestor, descendant) pair, including
+    depth 0 self rows. Maintained by superadmin.hierarchy.
+    """
+    # both are leading columns of the unique_together / (descendant, depth) indexes below
+    ancestor = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='descendant_links',
+                                 db_index=False)
+    descendant = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='ancestor_links',
+                                   db_index=False)
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [
+            models.Index(fields=['ancestor', 'depth']),
+            models.Index(fields=['descendant', 'depth']),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
@@ -0,0 +1,241 @@
+"""
+Bulk user provisioning.
+
+A batch (JSON rows or a CSV upload) is validated as a whole: field checks per
+row, then one query for emails/usernames that already exist. Passwords are
+hashed on a process pool (hashing is CPU-bound and holds the GIL), and the
+users are inserted with bulk_create in one transaction. bulk_create skips
+UserProfile.save(), so the role/creator rules, staff flags and hierarchy rows
+are applied here.
+"""
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from . import hierarchy
+from .config import Config
+from .models import UserProfile
+from .utils import EmailService, bump_users_version
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ['email', 'username', 'first_name', 'last_name', 'full_name',
+              'phone_number', 'address', 'role', 'password']
+
+
+class ProvisionError(Exception):
+    """The batch as a whole is unusable (bad upload, too many rows)."""
+
+
+# --------------------------
+# Role / creator rules
+# --------------------------
+def creator_links(auth_user, role):
+    """
+    (created_by_superadmin, created_by_manager) for a user of `role` created
+    by `auth_user`; raises PermissionError with the reason if not allowed.
+    """
+    if auth_user.role == UserProfile.ROLE_SUPERADMIN:
+        # SuperAdmin can create: SuperAdmin (no creator link), Manager, ExternalUser
+        if role in (UserProfile.ROLE_MANAGER, UserProfile.ROLE_EXTERNAL):
+            return auth_user, None
+        if role == UserProfile.ROLE_SUPERADMIN:
+            return None, None
+        raise PermissionError("HiringManager/HR must be created by a Manager")
+
+    if auth_user.role == UserProfile.ROLE_MANAGER:
+        # Manager can create: HR, HiringManager
+        if role in (UserProfile.ROLE_HR, UserProfile.Hiring_Manager):
+            return None, auth_user
+        raise PermissionError("Managers can only create HR or HiringManager users")
+
+    raise PermissionError("You don't have permission to create users")
+
+
+# --------------------------
+# Input
+# --------------------------
+class ProvisionRowSerializer(serializers.Serializer):
+    """Field checks only; uniqueness is checked for the whole batch at once."""
+    email = serializers.EmailField(max_length=255)
+    username = serializers.CharField(max_length=150, required=False, allow_blank=True, allow_null=True)
+    first_name = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    last_name = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    full_name = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    phone_number = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    address = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    role = serializers.ChoiceField(choices=UserProfile.ROLE_CHOICES, default=UserProfile.ROLE_EXTERNAL)
+    password = serializers.CharField(required=False, allow_blank=True, allow_null=True, write_only=True)
+
+    def validate(self, data):
+        data['email'] = data['email'].lower().strip()
+        for key in ('username', 'first_name', 'last_name', 'full_name', 'phone_number', 'address', 'password'):
+            if key in data and not data[key]:
+                data[key] = None
+        if data.get('full_name'):
+            data['full_name'] = data['full_name'].strip()
+        return data
+
+
+def parse_rows(request):
+    """Rows from a multipart CSV `file`, a JSON list, or JSON {"users": [...]}."""
+    upload = request.FILES.get('file')
+    if upload is not None:
+        try:
+            text = upload.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ProvisionError("CSV file must be UTF-8 encoded")
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames or 'email' not in [f.strip().lower() for f in reader.fieldnames]:
+            raise ProvisionError(f"CSV header must include 'email' (columns: {', '.join(CSV_FIELDS)})")
+        rows = [
+            {k.strip().lower(): (v or '').strip() for k, v in row.items() if k and k.strip().lower() in CSV_FIELDS}
+            for row in reader
+        ]
+    else:
+        rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list):
+            raise ProvisionError("Send a CSV 'file' or a JSON list of users")
+
+    if not rows:
+        raise ProvisionError("No users to create")
+    if len(rows) > Config.PROVISION_MAX_ROWS:
+        raise ProvisionError(f"At most {Config.PROVISION_MAX_ROWS} users per request")
+    return rows
+
+
+def validate_batch(rows, auth_user):
+    """Returns (validated rows, errors); errors are [{"row": n, "errors": {...}}], 1-based."""
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        serializer = ProvisionRowSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+        data = dict(serializer.validated_data)
+        try:
+            data['created_by_superadmin'], data['created_by_manager'] = creator_links(auth_user, data['role'])
+        except PermissionError as e:
+            errors.append({"row": number, "errors": {"role": [str(e)]}})
+            continue
+        valid.append((number, data))
+
+    # duplicates inside the batch, then against the table in one query
+    seen = {}
+    for number, data in valid:
+        for field in ('email', 'username'):
+            value = data.get(field)
+            if value and (field, value) in seen:
+                errors.append({"row": number, "errors": {field: [f"Duplicate of row {seen[(field, value)]}."]}})
+            elif value:
+                seen[(field, value)] = number
+
+    emails = [data['email'] for _, data in valid]
+    usernames = [data['username'] for _, data in valid if data.get('username')]
+    taken_emails, taken_usernames = set(), set()
+    for email, username in UserProfile.objects.filter(
+            Q(email__in=emails) | Q(username__in=usernames)).values_list('email', 'username'):
+        taken_emails.add(email)
+        taken_usernames.add(username)
+    for number, data in valid:
+        if data['email'] in taken_emails:
+            errors.append({"row": number, "errors": {"email": ["A user with this email already exists."]}})
+        if data.get('username') and data['username'] in taken_usernames:
+            errors.append({"row": number, "errors": {"username": ["A user with this username already exists."]}})
+
+    errors.sort(key=lambda e: e["row"])
+    return [data for _, data in valid], errors
+
+
+# --------------------------
+# Password hashing pool
+# --------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _workers():
+    return Config.PROVISION_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent runs threads (log listener) whose locks fork would copy
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def hash_passwords(passwords):
+    """make_password() for each entry (None -> unusable password), in input order."""
+    if sum(1 for p in passwords if p) < Config.PROVISION_POOL_MIN:
+        return [make_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (_workers() * 4))
+    try:
+        return list(_get_pool().map(make_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        logger.warning("Password hashing pool broke; hashing this batch inline")
+        _reset_pool()
+        return [make_password(p) for p in passwords]
+
+
+# --------------------------
+# Create
+# --------------------------
+def provision_users(rows):
+    """
+    Insert validated rows (from validate_batch) in one transaction and queue
+    a welcome email per user once it commits. Returns the created users.
+    """
+    hashed = hash_passwords([row.get('password') for row in rows])
+    users = []
+    for row, password in zip(rows, hashed):
+        fields = {k: v for k, v in row.items() if k != 'password'}
+        user = UserProfile(**fields)
+        user.password = password
+        user.apply_role_flags()
+        users.append(user)
+
+    with transaction.atomic():
+        created = UserProfile.objects.bulk_create(users, batch_size=500)
+        hierarchy.insert_nodes(created)
+        transaction.on_commit(bump_users_version)
+        transaction.on_commit(lambda: queue_welcome_emails(created))
+    return created
+
+
+def queue_welcome_emails(users):
+    for user in users:
+        EmailService.queue_html(
+            [user.email], "Welcome", "welcome_email_template.html",
+            {'email': user.email, 'first_name': user.first_name, 'last_name': user.last_name}
+        )
@@ -91,3 +91,24 @@ class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = ['id', 'email', 'full_name', 'phone_number', 'address', 'role', 'created_by_superadmin', 'created_by_manager']
+
+
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """
+    Directory rows; pass context={"fields": [...]} to return only some fields
+    (see DIRECTORY_FIELDS).
+    """
+    class Meta:
+        model = UserProfile
+        fields = ['id', 'email', 'username', 'first_name', 'last_name', 'full_name', 'phone_number',
+                  'role', 'is_active', 'created_by_superadmin', 'created_by_manager']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("fields")
+        if selected:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+DIRECTORY_FIELDS = UserDirectorySerializer.Meta.fields
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+
+from . import hierarchy
+from .authentication import bump_user_version
+from .models import ExternalUser, HR, Manager, SuperAdmin, UserProfile, hiring_managerUser
+from .utils import bump_users_version
+
+# proxy models send their own signals, so every receiver is connected to all of them
+USER_MODELS = [UserProfile, SuperAdmin, Manager, HR, ExternalUser, hiring_managerUser]
+
+
+def invalidate_user_directory(sender, instance, **kwargs):
+    """Cached role counts are keyed by a version; bumping it drops them all."""
+    bump_users_version()
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Cached auth copies carry the user's version; any save (password, is_active, role) retires them."""
+    # after commit, so a concurrent load cannot cache the pre-save row under the new version
+    pk = instance.pk
+    transaction.on_commit(lambda: bump_user_version(pk))
+
+
+# ----- Org hierarchy closure table -----
+def _parent_from_dict(instance):
+    # only what was loaded: reading a deferred FK here would cost a query per instance
+    values = instance.__dict__
+    if "created_by_manager_id" not in values or "created_by_superadmin_id" not in values:
+        return None
+    return values["created_by_manager_id"] or values["created_by_superadmin_id"]
+
+
+def remember_parent(sender, instance, **kwargs):
+    instance._loaded_parent = _parent_from_dict(instance)
+
+
+def maintain_hierarchy(sender, instance, created, **kwargs):
+    parent = hierarchy.parent_id(instance)
+    if created:
+        hierarchy.insert_node(instance)
+    elif parent != instance._loaded_parent:
+        hierarchy.move_node(instance)
+    instance._loaded_parent = parent
+
+
+def detach_from_hierarchy(sender, instance, **kwargs):
+    instance._hierarchy_children = hierarchy.detach_node(instance)
+
+
+def reattach_reports(sender, instance, **kwargs):
+    hierarchy.reattach(getattr(instance, "_hierarchy_children", []))
+
+
+for model in USER_MODELS:
+    post_save.connect(invalidate_user_directory, sender=model)
+    post_delete.connect(invalidate_user_directory, sender=model)
+    post_save.connect(invalidate_cached_user, sender=model)
+    post_delete.connect(invalidate_cached_user, sender=model)
+    post_init.connect(remember_parent, sender=model)
+    post_save.connect(maintain_hierarchy, sender=model)
+    pre_delete.connect(detach_from_hierarchy, sender=model)
+    post_delete.connect(reattach_reports, sender=model)
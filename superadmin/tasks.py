@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from .config import Config
+from .mailer import backoff, deliver
+
+
+# acks_late + reject_on_worker_lost: a worker that dies mid-send leaves the message on the broker
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=None)
+def send_html_email(self, message_id, to_list, subject, template_name, context, from_email=None, queued_at=None):
+    attempt = self.request.retries + 1
+    if not deliver(message_id, attempt, queued_at, to_list, subject, template_name, context, from_email):
+        raise self.retry(countdown=backoff(attempt), max_retries=Config.MAIL_MAX_ATTEMPTS - 1)
+    return {"message_id": message_id, "attempts": attempt}
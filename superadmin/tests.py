@@ -1,3 +1,530 @@
-from django.test import TestCase
+import json
+import logging
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from itertools import count
+from unittest import mock
 
-# Create your tests here.
+from celery.exceptions import Retry
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import EmailMessage
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from restserver.testing import QueryBudgetMixin
+from restserver.utils.ratelimit import MemoryBackend, set_backend
+
+from . import hierarchy
+from . import mailer as mailer_module
+from .authentication import clear_local_cache, load_user
+from .config import Config
+from .mailer import backoff, delivery_metrics, delivery_status
+from .models import UserHierarchy, UserProfile
+from .provisioning import hash_passwords, provision_users, validate_batch
+from .tasks import send_html_email
+from .utils import CustomLogger, EmailService, send_otp
+
+_seq = count()
+
+
+def make_team(manager, n):
+    for _ in range(n):
+        i = next(_seq)
+        UserProfile.objects.create(
+            email=f"member{i}@example.com", password="x", first_name=f"Member{i}", last_name="Sharma",
+            role=UserProfile.ROLE_HR if i % 2 else UserProfile.Hiring_Manager, created_by_manager=manager,
+        )
+
+
+class UserListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.user
+        )
+        make_team(cls.manager, 4)
+
+    def grow(self):
+        make_team(self.manager, 12)
+
+    def test_users_list(self):
+        self.assertQueryBudget(1, "/api/superadmin/users/", grow=self.grow)
+
+    def test_users_list_for_manager(self):
+        # subtree through the closure table
+        self.assertQueryBudget(1, "/api/superadmin/users/", grow=self.grow, user=self.manager)
+
+    def test_directory(self):
+        # role counts, page count, page
+        self.assertQueryBudget(3, "/api/superadmin/users/directory/?page_size=50", grow=self.grow)
+
+    def test_manager_team(self):
+        self.assertQueryBudget(2, f"/api/superadmin/manager_list/?manager_id={self.manager.pk}", grow=self.grow)
+
+
+class UserDirectoryTests(TestCase):
+    client_class = APIClient
+    url = "/api/superadmin/users/directory/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", first_name="Asha", last_name="Rao",
+            role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.admin,
+        )
+        cls.other_manager = UserProfile.objects.create(
+            email="other@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.admin,
+        )
+        cls.hr = UserProfile.objects.create(
+            email="priya@example.com", password="x", first_name="Priya", last_name="Sharma",
+            role=UserProfile.ROLE_HR, created_by_manager=cls.manager, is_active=False,
+        )
+        make_team(cls.manager, 3)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, 200, response.content[:300])
+        return response.data
+
+    def emails(self, data):
+        return [row["email"] for row in data["results"]]
+
+    def test_paginates_in_id_order(self):
+        data = self.get("page_size=2")
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(self.emails(data), ["admin@example.com", "manager@example.com"])
+        self.assertIsNotNone(data["next"])
+        last = self.get("page_size=2&page=4")
+        self.assertEqual(len(last["results"]), 1)
+        self.assertIsNone(last["next"])
+
+    def test_search_every_word_must_match(self):
+        self.assertEqual(self.emails(self.get("search=pri")), ["priya@example.com"])
+        self.assertEqual(self.emails(self.get("search=priya sha")), ["priya@example.com"])
+        self.assertEqual(self.emails(self.get("search=priya rao")), [])
+
+    def test_filters(self):
+        data = self.get(f"role=Manager,HR&created_by={self.manager.pk}&is_active=false")
+        self.assertEqual(self.emails(data), ["priya@example.com"])
+        self.assertEqual(self.client.get(f"{self.url}?created_by=me").status_code, 400)
+
+    def test_field_selection(self):
+        row = self.get("fields=id,email&page_size=1")["results"][0]
+        self.assertEqual(set(row), {"id", "email"})
+        self.assertEqual(self.client.get(f"{self.url}?fields=id,password").status_code, 400)
+
+    def test_manager_sees_only_their_subtree(self):
+        self.client.force_authenticate(self.manager)
+        data = self.get()
+        self.assertEqual(data["count"], 4)
+        self.assertNotIn("other@example.com", self.emails(data))
+        self.assertEqual(data["counts"]["total"], 4)
+
+    def test_role_counts_are_cached_until_a_user_changes(self):
+        counts = self.get()["counts"]
+        self.assertEqual(counts["total"], 7)
+        self.assertEqual(counts[UserProfile.ROLE_MANAGER], 2)
+
+        with self.assertNumQueries(2):  # page count and page; counts from cache
+            self.client.get(self.url)
+
+        UserProfile.objects.create(
+            email="new@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=self.admin,
+        )
+        counts = self.get()["counts"]
+        self.assertEqual(counts["total"], 8)
+        self.assertEqual(counts[UserProfile.ROLE_MANAGER], 3)
+
+        self.hr.delete()
+        self.assertEqual(self.get()["counts"]["total"], 7)
+
+
+class HierarchyTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.m1 = UserProfile.objects.create(
+            email="m1@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.admin
+        )
+        cls.m2 = UserProfile.objects.create(
+            email="m2@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.admin
+        )
+        cls.hr = UserProfile.objects.create(
+            email="hr@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=cls.m1
+        )
+        cls.intern = UserProfile.objects.create(
+            email="intern@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=cls.hr
+        )
+
+    def ancestors(self, user):
+        return dict(UserHierarchy.objects.filter(descendant=user).values_list("ancestor__email", "depth"))
+
+    def test_insert_links_every_ancestor(self):
+        self.assertEqual(self.ancestors(self.intern), {
+            "intern@example.com": 0, "hr@example.com": 1, "m1@example.com": 2, "admin@example.com": 3,
+        })
+        self.assertEqual(set(hierarchy.subtree(self.m1)), {self.hr, self.intern})
+        self.assertTrue(hierarchy.in_subtree(self.admin, self.intern.pk))
+        self.assertFalse(hierarchy.in_subtree(self.m2, self.intern.pk))
+
+    def test_move_relinks_the_subtree(self):
+        self.hr.created_by_manager = self.m2
+        self.hr.save()
+        self.assertEqual(self.ancestors(self.intern), {
+            "intern@example.com": 0, "hr@example.com": 1, "m2@example.com": 2, "admin@example.com": 3,
+        })
+        self.assertEqual(list(hierarchy.subtree(self.m1)), [])
+        self.assertEqual(set(hierarchy.subtree(self.m2)), {self.hr, self.intern})
+
+    def test_cycle_is_rejected(self):
+        manager = UserProfile.objects.get(pk=self.m1.pk)
+        manager.created_by_manager = self.intern
+        with self.assertRaises(ValidationError):
+            manager.clean()
+
+        # moving under a user outside the subtree is fine
+        hr = UserProfile.objects.get(pk=self.hr.pk)
+        hr.created_by_manager = self.m2
+        hr.clean()
+
+    def test_delete_reattaches_reports(self):
+        self.hr.delete()
+        self.assertEqual(self.ancestors(self.intern), {"intern@example.com": 0})
+        self.assertEqual(list(hierarchy.subtree(self.m1)), [])
+
+    def test_rebuild_matches_maintained_table(self):
+        self.hr.created_by_manager = self.m2
+        self.hr.save()
+        maintained = set(UserHierarchy.objects.values_list("ancestor_id", "descendant_id", "depth"))
+        self.assertEqual(hierarchy.rebuild(), len(maintained))
+        self.assertEqual(set(UserHierarchy.objects.values_list("ancestor_id", "descendant_id", "depth")), maintained)
+
+    def test_only_the_direct_creator_can_edit_or_delete(self):
+        self.client.force_authenticate(self.m1)
+        self.assertEqual(self.client.patch(f"/api/superadmin/users/{self.intern.pk}/", {"first_name": "X"}).status_code, 403)
+        self.assertEqual(self.client.delete(f"/api/superadmin/users/{self.intern.pk}/").status_code, 403)
+        self.assertEqual(self.client.patch(f"/api/superadmin/users/{self.hr.pk}/", {"first_name": "X"}).status_code, 200)
+
+        self.client.force_authenticate(self.hr)
+        self.assertEqual(self.client.delete(f"/api/superadmin/users/{self.intern.pk}/").status_code, 200)
+
+
+class AuthCacheTests(TestCase):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def save(self, user, **changes):
+        for field, value in changes.items():
+            setattr(user, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+    def test_cached_after_first_load(self):
+        with self.assertNumQueries(1):
+            load_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(load_user(self.user.pk).email, "admin@example.com")
+
+        # another process: its local LRU is empty, the shared copy is still valid
+        clear_local_cache()
+        with self.assertNumQueries(0):
+            load_user(self.user.pk)
+
+    def test_returns_copies(self):
+        load_user(self.user.pk).first_name = "Changed"
+        self.assertNotEqual(load_user(self.user.pk).first_name, "Changed")
+
+    def test_save_invalidates(self):
+        load_user(self.user.pk)
+        user = UserProfile.objects.get(pk=self.user.pk)
+        self.save(user, first_name="Renamed")
+        with self.assertNumQueries(1):
+            self.assertEqual(load_user(self.user.pk).first_name, "Renamed")
+
+    def test_deactivated_user_is_rejected_on_next_request(self):
+        self.assertEqual(self.client.get("/api/superadmin/users/").status_code, 200)
+        self.save(UserProfile.objects.get(pk=self.user.pk), is_active=False)
+        self.assertEqual(self.client.get("/api/superadmin/users/").status_code, 401)
+
+    def test_deleted_user_is_rejected_on_next_request(self):
+        self.assertEqual(self.client.get("/api/superadmin/users/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.get(pk=self.user.pk).delete()
+        self.assertIsNone(load_user(self.user.pk))
+        self.assertEqual(self.client.get("/api/superadmin/users/").status_code, 401)
+
+    def test_evicted_version_reloads(self):
+        load_user(self.user.pk)
+        cache.delete(f"auth_user_version:{self.user.pk}")
+        UserProfile.objects.filter(pk=self.user.pk).update(first_name="Fresh")
+        with self.assertNumQueries(1):
+            self.assertEqual(load_user(self.user.pk).first_name, "Fresh")
+
+
+class BulkProvisionTests(TestCase):
+    client_class = APIClient
+    url = "/api/superadmin/users/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create(email="admin@example.com", password="x", role=UserProfile.ROLE_SUPERADMIN)
+        cls.manager = UserProfile.objects.create(
+            email="manager@example.com", password="x", role=UserProfile.ROLE_MANAGER, created_by_superadmin=cls.admin
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+        patcher = mock.patch("superadmin.provisioning.EmailService.queue_html")
+        self.queue_html = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data, query=""):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f"{self.url}{query}", data, format="json")
+
+    def test_creates_users_with_links_and_welcome_emails(self):
+        response = self.post({"users": [
+            {"email": " New.Manager@Example.com", "role": UserProfile.ROLE_MANAGER, "password": "s3cret"},
+            {"email": "guest@example.com"},
+        ]})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["count"], 2)
+
+        manager = UserProfile.objects.get(email="new.manager@example.com")
+        self.assertEqual(manager.created_by_superadmin, self.admin)
+        self.assertTrue(manager.is_staff)
+        self.assertTrue(manager.check_password("s3cret"))
+        guest = UserProfile.objects.get(email="guest@example.com")
+        self.assertEqual(guest.role, UserProfile.ROLE_EXTERNAL)
+        self.assertFalse(guest.has_usable_password())
+
+        self.assertTrue(hierarchy.in_subtree(self.admin, manager.pk))
+        self.assertEqual(self.queue_html.call_count, 2)
+
+    def test_csv_upload_by_manager(self):
+        upload = SimpleUploadedFile("users.csv", b"Email,Role,First_Name\nhr1@example.com,HR,Asha\n", "text/csv")
+        self.client.force_authenticate(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201, response.data)
+        hr = UserProfile.objects.get(email="hr1@example.com")
+        self.assertEqual((hr.created_by_manager, hr.first_name), (self.manager, "Asha"))
+        self.assertTrue(hierarchy.in_subtree(self.manager, hr.pk))
+
+    def test_any_invalid_row_creates_nothing(self):
+        response = self.post([
+            {"email": "ok@example.com"},
+            {"email": "not-an-email"},
+            {"email": "OK@example.com"},
+            {"email": "manager@example.com"},
+            {"email": "hr@example.com", "role": UserProfile.ROLE_HR},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["row"] for e in response.data["errors"]], [2, 3, 4, 5])
+        self.assertFalse(UserProfile.objects.filter(email="ok@example.com").exists())
+        self.queue_html.assert_not_called()
+
+    def test_dry_run_only_validates(self):
+        response = self.post([{"email": "ok@example.com"}], query="?dry_run=true")
+        self.assertEqual((response.status_code, response.data["count"]), (200, 1))
+        self.assertFalse(UserProfile.objects.filter(email="ok@example.com").exists())
+
+    def test_batch_limits(self):
+        self.assertEqual(self.post([]).status_code, 400)
+        with mock.patch.object(Config, "PROVISION_MAX_ROWS", 1):
+            self.assertEqual(self.post([{"email": "a@example.com"}, {"email": "b@example.com"}]).status_code, 400)
+
+    def test_hr_cannot_provision(self):
+        hr = UserProfile.objects.create(
+            email="hr@example.com", password="x", role=UserProfile.ROLE_HR, created_by_manager=self.manager
+        )
+        self.client.force_authenticate(hr)
+        self.assertEqual(self.post([{"email": "a@example.com"}]).status_code, 403)
+
+    def test_failure_during_insert_rolls_back(self):
+        valid, errors = validate_batch([{"email": "a@example.com"}, {"email": "b@example.com"}], self.admin)
+        self.assertEqual(errors, [])
+        before = (UserProfile.objects.count(), UserHierarchy.objects.count())
+
+        with mock.patch("superadmin.provisioning.hierarchy.insert_nodes", side_effect=RuntimeError("boom")), \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                provision_users(valid)
+        self.assertEqual((UserProfile.objects.count(), UserHierarchy.objects.count()), before)
+        self.assertEqual(callbacks, [])
+        self.queue_html.assert_not_called()
+
+    def test_broken_hash_pool_falls_back_inline(self):
+        pool = mock.Mock()
+        pool.map.side_effect = BrokenProcessPool()
+        with mock.patch.object(Config, "PROVISION_POOL_MIN", 1), \
+                mock.patch("superadmin.provisioning._get_pool", return_value=pool):
+            hashed = hash_passwords(["one", None])
+        self.assertTrue(UserProfile(password=hashed[0]).check_password("one"))
+        self.assertFalse(UserProfile(password=hashed[1]).has_usable_password())
+
+    def test_conflict_after_validation_rolls_back(self):
+        valid, _ = validate_batch([{"email": "a@example.com"}, {"email": "b@example.com"}], self.admin)
+        UserProfile.objects.create(
+            email="b@example.com", password="x", role=UserProfile.ROLE_EXTERNAL, created_by_superadmin=self.admin
+        )
+        with self.assertRaises(IntegrityError):
+            provision_users(valid)
+        self.assertFalse(UserProfile.objects.filter(email="a@example.com").exists())
+
+
+def run_eagerly(args, **options):
+    # what a worker would do with the published task, retries included (countdowns are skipped)
+    return send_html_email.apply(args=args)
+
+
+class MailDeliveryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        mailer_module.smtp.close()
+        patcher = mock.patch.object(send_html_email, "apply_async", side_effect=run_eagerly)
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(Config, "MAIL_MAX_ATTEMPTS", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def send(self, side_effect=None):
+        with mock.patch.object(EmailMessage, "send", autospec=True, side_effect=side_effect) as send:
+            message_id = EmailService.queue_html(["a@example.com"], "Your OTP Code", "otp_email.html", {"otp": "123456"})
+        return message_id, send
+
+    def test_sent_by_the_worker(self):
+        message_id, send = self.send()
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(delivery_status(message_id), {"status": "sent", "attempts": 1, "error": ""})
+        metrics = delivery_metrics()
+        self.assertEqual((metrics["delivery"]["count"], metrics["queue_wait"]["count"]), (1, 1))
+        self.assertEqual(metrics["pending"], 0)
+
+    def test_task_payload_is_json(self):
+        EmailService.queue_html(["a@example.com"], "Welcome", "welcome_email_template.html", {"email": "a@example.com"})
+        json.dumps(self.apply_async.call_args.kwargs["args"])
+
+    def test_retries_with_backoff_then_sends(self):
+        message_id, send = self.send(side_effect=[OSError("reset"), OSError("reset"), 1])
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(delivery_status(message_id), {"status": "sent", "attempts": 3, "error": ""})
+        self.assertEqual(delivery_metrics()["retried"], 2)
+
+    def test_gives_up_after_max_attempts(self):
+        message_id, send = self.send(side_effect=OSError("smtp down"))
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(delivery_status(message_id), {"status": "failed", "attempts": 3, "error": "smtp down"})
+        self.assertEqual(delivery_metrics()["failed"], 1)
+        self.assertEqual(delivery_metrics()["pending"], 0)
+
+    def test_retry_is_scheduled_with_backoff(self):
+        with mock.patch.object(EmailMessage, "send", side_effect=OSError("reset")), \
+                mock.patch.object(send_html_email, "retry", side_effect=Retry()) as retry:
+            send_html_email.apply(args=["id", ["a@example.com"], "Hi", "otp_email.html", {"otp": "1"}])
+        retry.assert_called_once_with(countdown=Config.MAIL_RETRY_BACKOFF, max_retries=2)
+
+    def test_backoff_is_bounded(self):
+        with mock.patch.object(Config, "MAIL_RETRY_BACKOFF", 2):
+            self.assertEqual([backoff(n) for n in (1, 2, 3)], [2, 4, 8])
+            self.assertEqual(backoff(20), Config.MAIL_RETRY_BACKOFF_MAX)
+
+    def test_broker_down_is_reported(self):
+        self.apply_async.side_effect = ConnectionError("broker down")
+        message_id, send = self.send()
+        self.assertIsNone(message_id)
+        send.assert_not_called()
+        self.assertEqual(delivery_metrics()["failed"], 1)
+
+    def test_otp_is_queued_by_default(self):
+        ok, message = send_otp("Person@Example.com")
+        self.assertEqual((ok, message), (True, "OTP queued for delivery"))
+        self.assertEqual(self.apply_async.call_count, 1)
+        self.assertEqual(mail.outbox[0].to, ["person@example.com"])
+        self.assertIn(cache.get("otp:person@example.com"), mail.outbox[0].body)
+
+    def test_otp_is_sent_inline_when_the_broker_is_down(self):
+        self.apply_async.side_effect = ConnectionError("broker down")
+        ok, message = send_otp("person@example.com")
+        self.assertEqual((ok, message), (True, "OTP sent successfully"))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sync_otp_send_failure_is_reported(self):
+        with mock.patch.object(Config, "OTP_ASYNC_DELIVERY", False), \
+                mock.patch.object(EmailMessage, "send", side_effect=OSError("smtp down")):
+            ok, message = send_otp("person@example.com")
+        self.assertFalse(ok)
+        self.assertIn("smtp down", message)
+        self.assertIsNone(cache.get("otp:person@example.com"))
+        self.apply_async.assert_not_called()
+
+
+class OTPThrottleTests(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        previous = set_backend(MemoryBackend())
+        self.addCleanup(set_backend, previous)
+
+    def reset(self, email):
+        return self.client.post("/api/superadmin/forgot-password/", {
+            "email": email, "password": "new-pass", "confirm_password": "new-pass", "otp": "000000",
+        }, format="json")
+
+    def verify(self, email):
+        return self.client.post("/api/superadmin/verify-otp/", {"email": email, "otp": "000000"}, format="json")
+
+    def test_password_reset_has_its_own_bucket(self):
+        for _ in range(10):
+            self.assertEqual(self.reset("a@example.com").status_code, 400)
+        response = self.reset("A@example.com ")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+        # OTP verification for the same email is not used up by reset attempts
+        self.assertEqual(self.verify("a@example.com").status_code, 400)
+        self.assertEqual(self.reset("b@example.com").status_code, 400)
+
+    def test_verify_limit_does_not_block_reset(self):
+        for _ in range(10):
+            self.verify("a@example.com")
+        self.assertEqual(self.verify("a@example.com").status_code, 429)
+        self.assertEqual(self.reset("a@example.com").status_code, 400)
+
+
+class CustomLoggerTests(TestCase):
+    def test_records_are_written_once(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(LOG_DIR=tmp):
+            custom = CustomLogger("superadmin_tests_once")
+            handler = next(h for h in custom.logger.handlers if hasattr(h, "listener"))
+            self.addCleanup(custom.logger.removeHandler, handler)
+            root_handler = mock.Mock(level=logging.NOTSET)
+            logging.getLogger().addHandler(root_handler)
+            self.addCleanup(logging.getLogger().removeHandler, root_handler)
+            custom.log("warning", "saved")
+            handler.close()
+            root_handler.handle.assert_not_called()
+            with open(f"{tmp}/superadmin_tests_once/superadmin_tests_once.log", encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 1)
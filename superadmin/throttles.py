@@ -0,0 +1,44 @@
+from restserver.utils.ratelimit import SLIDING, LuaRateThrottle
+
+
+def _email(request):
+    email = request.data.get("email") if hasattr(request, "data") else None
+    return email.lower().strip() if isinstance(email, str) and email.strip() else None
+
+
+class OTPRequestThrottle(LuaRateThrottle):
+    """Per client IP; the per-email limit lives in send_otp."""
+    scope = "otp_send_ip"
+    rate = "20/10m"
+    mode = SLIDING
+
+
+class OTPVerifyThrottle(LuaRateThrottle):
+    """Per email, so OTPs cannot be brute-forced from many IPs."""
+    scope = "otp_verify"
+    rate = "10/5m"
+    mode = SLIDING
+
+    def get_identity(self, request, view):
+        return _email(request)
+
+
+class PasswordResetThrottle(LuaRateThrottle):
+    """Per email, in its own bucket: reset attempts do not use up the OTP verification budget."""
+    scope = "password_reset"
+    rate = "10/5m"
+    mode = SLIDING
+
+    def get_identity(self, request, view):
+        return _email(request)
+
+
+class LoginThrottle(LuaRateThrottle):
+    """Per email + IP: slows password guessing without locking the account for everyone."""
+    scope = "login"
+    rate = "10/m"
+    mode = SLIDING
+
+    def get_identity(self, request, view):
+        email = _email(request)
+        return f"{email}:{self.get_ident(request)}" if email else None
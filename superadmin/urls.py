@@ -2,16 +2,20 @@
 from django.urls import path
 from .views import (
     CustomerViews, LoginCustomer, CustomerManageViews,
-    OTPView, VerifyOTP, ForgotPasswordAPIView , ManagerTeamListAPIView
+    OTPView, VerifyOTP, ForgotPasswordAPIView , ManagerTeamListAPIView, OTPDeliveryMetricsView,
+    UserDirectoryAPIView, BulkProvisionUsersAPIView,
 )
 
 urlpatterns = [
     path('signup/', CustomerViews.as_view(), name='signup'),
     path('login/', LoginCustomer.as_view(), name='login'),
     path('users/', CustomerManageViews.as_view(), name='users-list'),
+    path('users/bulk/', BulkProvisionUsersAPIView.as_view(), name='users-bulk'),
+    path('users/directory/', UserDirectoryAPIView.as_view(), name='users-directory'),
     path('users/<int:id>/', CustomerManageViews.as_view(), name='users-detail'),
     path('send-otp/', OTPView.as_view(), name='send-otp'),
     path('verify-otp/', VerifyOTP.as_view(), name='verify-otp'),
+    path('otp-metrics/', OTPDeliveryMetricsView.as_view(), name='otp-metrics'),
     path('forgot-password/', ForgotPasswordAPIView.as_view(), name='forgot-password'),
     path('manager_list/', ManagerTeamListAPIView.as_view(), name='manager-list'),
 ]
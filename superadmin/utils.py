@@ -1,41 +1,50 @@
 import os
 import logging
-from datetime import datetime
-from django.core.mail import EmailMessage, send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.mail import send_mail
 from django.core.cache import cache
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count, Q
 import random
+import time
+
+from restserver.utils.log import QueueLogHandler
+from restserver.utils.ratelimit import SLIDING, RateLimiter
 
 from .config import Config
+from .models import UserProfile
+from . import mailer
+from .mailer import build_html_message
 
 # --------------------------
 # Custom Logger
 # --------------------------
 class CustomLogger:
+    """
+    Per-app JSON log under LOG_DIR/<app_name>/, written by a background listener
+    (restserver.utils.log.QueueLogHandler) so log() never blocks the caller.
+    Critical messages are emailed off-thread, deduplicated and rate-limited.
+    """
     def __init__(self, app_name, filename=None):
         self.app_name = app_name
         self.logger = logging.getLogger(app_name)
         self.logger.setLevel(getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO))
+        # the queue handler writes every record; passing it on to root would emit it twice
+        self.logger.propagate = False
 
-        log_directory = os.path.join(settings.BASE_DIR, 'logs', app_name)
-        os.makedirs(log_directory, exist_ok=True)
-
+        log_directory = os.path.join(settings.LOG_DIR, app_name)
         if not filename:
-            filename = f"{datetime.utcnow().strftime('%Y-%m-%d')}.log"
+            filename = f"{app_name}.log"
         log_file_path = os.path.join(log_directory, filename)
 
-        formatter = logging.Formatter(
-            '%(asctime)s %(process)d %(thread)s %(levelname)8s '
-            '%(filename)s %(funcName)s %(lineno)d %(message)s'
-        )
-
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setFormatter(formatter)
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
+        if not any(isinstance(h, QueueLogHandler) for h in self.logger.handlers):
+            self.logger.addHandler(QueueLogHandler(
+                filename=log_file_path,
+                when='midnight',
+                console=False,
+                alert_recipients=[Config.ERROR_RECIPIENT],
+                subject_prefix=f"CRITICAL: {app_name}",
+            ))
 
     def log(self, level, message):
         level = level.lower()
@@ -48,27 +57,11 @@ class CustomLogger:
         elif level == 'error':
             self.logger.error(message, stacklevel=2)
         elif level == 'critical':
+            # the alert email is sent by the listener's CriticalAlertHandler
             self.logger.critical(message, stacklevel=2)
-            self.send_critical_email(message)
         else:
             self.logger.info(message, stacklevel=2)
 
-    def send_critical_email(self, message):
-        recipient = Config.ERROR_RECIPIENT or getattr(settings, 'ADMINS', None)
-        if not recipient:
-            self.logger.error("No error recipient configured for critical alerts.")
-            return
-        subject = f"CRITICAL: {self.app_name} error"
-        body = message
-        try:
-            if isinstance(recipient, (list, tuple)):
-                emails = [r[1] if isinstance(r, (list, tuple)) and len(r) > 1 else r for r in recipient]
-            else:
-                emails = [recipient]
-            send_mail(subject, body, Config.DEFAULT_FROM_EMAIL, emails, fail_silently=False)
-        except Exception as e:
-            self.logger.exception("Failed to send critical email: %s", e)
-
 
 # --------------------------
 # Email Service
@@ -81,17 +74,16 @@ class EmailService:
 
     @staticmethod
     def send_html(to_list, subject, template_name, context, from_email=None):
-        from_email = from_email or Config.DEFAULT_FROM_EMAIL
-        html_message = render_to_string(template_name, context)
-        plain_message = strip_tags(html_message)
-        email = EmailMessage(subject, plain_message, from_email, to_list)
-        email.content_subtype = "html"
-        email.body = html_message
-        email.send(fail_silently=False)
+        build_html_message(to_list, subject, template_name, context, from_email).send(fail_silently=False)
+
+    @staticmethod
+    def queue_html(to_list, subject, template_name, context, from_email=None):
+        """Hand the email to the Celery worker; returns a message id for mailer.delivery_status(), or None."""
+        return mailer.enqueue(to_list, subject, template_name, context, from_email)
 
 
 # --------------------------
-# OTP helpers with rate-limit via cache
+# OTP helpers with rate-limit (restserver.utils.ratelimit, one atomic round trip)
 # --------------------------
 def generate_otp(length=None):
     length = length or Config.OTP_LENGTH
@@ -99,8 +91,9 @@ def generate_otp(length=None):
     end = (10 ** length) - 1
     return str(random.randint(start, end))
 
-def _otp_rate_key(email):
-    return f"otp_rate:{email.lower()}"
+otp_send_limiter = RateLimiter(
+    "otp_send", f"{Config.OTP_RATE_LIMIT_MAX}/{Config.OTP_RATE_LIMIT_WINDOW}s", mode=SLIDING
+)
 
 def send_otp(email, template='otp_email.html', context_extra=None):
     """
@@ -108,23 +101,26 @@ def send_otp(email, template='otp_email.html', context_extra=None):
     Returns (ok: bool, msg: str)
     """
     email = email.lower()
-    rate_key = _otp_rate_key(email)
-    counter = cache.get(rate_key) or 0
-    if counter >= Config.OTP_RATE_LIMIT_MAX:
+    if not otp_send_limiter.hit(email).allowed:
         return False, "Too many OTP requests. Try again later."
 
     otp = generate_otp()
     otp_key = f"otp:{email}"
     cache.set(otp_key, otp, Config.OTP_TTL_SECONDS)
-    cache.incr(rate_key) if cache.get(rate_key) is not None else cache.set(rate_key, 1, Config.OTP_RATE_LIMIT_WINDOW)
 
     context = {'otp': otp}
     if context_extra:
         context.update(context_extra or {})
 
+    # delivered (and retried) by the worker; the caller is told it is queued, not sent.
+    # Broker unreachable: send it here rather than lose it.
+    if Config.OTP_ASYNC_DELIVERY and EmailService.queue_html([email], "Your OTP Code", template, context):
+        return True, "OTP queued for delivery"
+
     try:
         EmailService.send_html([email], "Your OTP Code", template, context)
     except Exception as e:
+        cache.delete(otp_key)
         return False, f"Failed to send OTP email: {e}"
 
     return True, "OTP sent successfully"
@@ -139,3 +135,53 @@ def verify_otp(email, otp):
         return False, "Invalid OTP"
     cache.delete(otp_key)
     return True, "OTP verified"
+
+
+# --------------------------
+# User directory: search + cached role counts
+# --------------------------
+USERS_VERSION_KEY = "user_directory:version"
+ROLE_COUNTS_TTL = 300
+
+
+def users_version():
+    return cache.get_or_set(USERS_VERSION_KEY, 1, None)
+
+
+def bump_users_version():
+    """Invalidates every cached role count at once (called on UserProfile save/delete)."""
+    try:
+        cache.incr(USERS_VERSION_KEY)
+    except ValueError:
+        # evicted: restart from a value no old cache key can have used
+        cache.set(USERS_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def role_counts(queryset, scope):
+    """
+    {role: n, ..., "total": n} for `queryset` in one conditional aggregate,
+    cached per `scope` until the next UserProfile change.
+    """
+    key = f"user_role_counts:{users_version()}:{scope}"
+    counts = cache.get(key)
+    if counts is None:
+        counts = queryset.order_by().aggregate(
+            total=Count("id"),
+            **{role: Count("id", filter=Q(role=role)) for role, _ in UserProfile.ROLE_CHOICES},
+        )
+        cache.set(key, counts, ROLE_COUNTS_TTL)
+    return counts
+
+
+def search_users(queryset, term):
+    """
+    Substring match on Postgres (served by the pg_trgm indexes), prefix match
+    elsewhere; every word has to match one of email / first / last / full name.
+    """
+    lookup = "icontains" if connection.vendor == "postgresql" else "istartswith"
+    for word in term.split():
+        queryset = queryset.filter(
+            Q(**{f"email__{lookup}": word}) | Q(**{f"first_name__{lookup}": word})
+            | Q(**{f"last_name__{lookup}": word}) | Q(**{f"full_name__{lookup}": word})
+        )
+    return queryset
@@ -3,22 +3,29 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.contrib.auth.hashers import make_password
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import Q  # ✅ use Q from here
 
+from . import hierarchy
+from .authentication import CachedJWTAuthentication
 from .models import UserProfile
-from .serializers import UserSerializer, UserListSerializer
-from .utils import send_otp, verify_otp, EmailService
+from .serializers import UserSerializer, UserListSerializer, UserDirectorySerializer, DIRECTORY_FIELDS
+from .utils import send_otp, verify_otp, role_counts, search_users
+from .mailer import delivery_metrics
+from .provisioning import (
+    ProvisionError, creator_links, parse_rows, provision_users, queue_welcome_emails, validate_batch,
+)
+from .throttles import LoginThrottle, OTPRequestThrottle, OTPVerifyThrottle, PasswordResetThrottle
 
 
 # -------------------------
 # Signup / Create User
 # -------------------------
 class CustomerViews(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [AllowAny]  # explicit auth checks are done below
 
     def post(self, request):
@@ -37,13 +44,7 @@ class CustomerViews(APIView):
             with transaction.atomic():
                 user = serializer.save(role=UserProfile.ROLE_SUPERADMIN)
 
-            try:
-                EmailService.send_html(
-                    [user.email], "Welcome", "welcome_email_template.html",
-                    {'email': user.email, 'first_name': user.first_name, 'last_name': user.last_name}
-                )
-            except Exception:
-                pass
+            queue_welcome_emails([user])
 
             return Response(
                 {"status": "success", "msg": "SuperAdmin created", "data": UserSerializer(user).data},
@@ -68,38 +69,10 @@ class CustomerViews(APIView):
             return Response({"status": "failure", "msg": "User already exists"}, status=400)
 
         # --- Decide creator + enforce permissions ---
-        created_by_superadmin = None
-        created_by_manager = None
-
-        if auth_user.role == UserProfile.ROLE_SUPERADMIN:
-            # SuperAdmin can create: SuperAdmin (optional), Manager, ExternalUser
-            if role in (UserProfile.ROLE_MANAGER, UserProfile.ROLE_EXTERNAL):
-                created_by_superadmin = auth_user
-            elif role == UserProfile.ROLE_SUPERADMIN:
-                # allow SA to create SA (no creator link needed)
-                pass
-            else:
-                # HR / HiringManager must be created by a Manager
-                return Response(
-                    {"status": "failure", "msg": "HiringManager/HR must be created by a Manager"},
-                    status=403
-                )
-
-        elif auth_user.role == UserProfile.ROLE_MANAGER:
-            # Manager can create: HR, HiringManager
-            if role in (UserProfile.ROLE_HR, UserProfile.Hiring_Manager):
-                created_by_manager = auth_user
-            else:
-                return Response(
-                    {"status": "failure", "msg": "Managers can only create HR or HiringManager users"},
-                    status=403
-                )
-        else:
-            # HR / External / HiringManager cannot create users
-            return Response(
-                {"status": "failure", "msg": "You don't have permission to create users"},
-                status=403
-            )
+        try:
+            created_by_superadmin, created_by_manager = creator_links(auth_user, role)
+        except PermissionError as e:
+            return Response({"status": "failure", "msg": str(e)}, status=403)
 
         # --- Create user with explicit creator fields ---
         with transaction.atomic():
@@ -109,25 +82,61 @@ class CustomerViews(APIView):
                 created_by_manager=created_by_manager
             )
 
-        # --- Best-effort welcome email ---
-        try:
-            EmailService.send_html(
-                [user.email], "Welcome", "welcome_email_template.html",
-                {'email': user.email, 'first_name': user.first_name, 'last_name': user.last_name}
-            )
-        except Exception:
-            pass
+        # --- Welcome email, sent by the worker ---
+        queue_welcome_emails([user])
 
         return Response(
             {"status": "success", "msg": f"{user.role} created successfully", "data": UserSerializer(user).data},
             status=201
         )
 
+# -------------------------
+# Bulk provisioning
+# -------------------------
+class BulkProvisionUsersAPIView(APIView):
+    """
+    POST /users/bulk/  (CSV `file` upload, a JSON list, or {"users": [...]}; ?dry_run=true to validate only)
+    All rows are created or none: any invalid row returns 400 with per-row errors.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role not in (UserProfile.ROLE_SUPERADMIN, UserProfile.ROLE_MANAGER):
+            return Response({"status": "failure", "msg": "You don't have permission to create users"}, status=403)
+
+        try:
+            rows = parse_rows(request)
+        except ProvisionError as e:
+            return Response({"status": "failure", "msg": str(e)}, status=400)
+
+        valid, errors = validate_batch(rows, request.user)
+        if errors:
+            return Response({"status": "failure", "msg": f"{len(errors)} invalid rows, nothing created",
+                             "errors": errors}, status=400)
+
+        if request.query_params.get('dry_run') == 'true':
+            return Response({"status": "success", "msg": f"{len(valid)} users valid", "count": len(valid)}, status=200)
+
+        try:
+            users = provision_users(valid)
+        except IntegrityError:
+            # a row was created concurrently after validation
+            return Response({"status": "failure", "msg": "Some users already exist, nothing created"}, status=409)
+
+        return Response(
+            {"status": "success", "msg": f"{len(users)} users created", "count": len(users),
+             "data": UserListSerializer(users, many=True).data},
+            status=201
+        )
+
+
 # -------------------------
 # Login
 # -------------------------
 class LoginCustomer(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request):
         email = request.data.get('email')
@@ -168,7 +177,7 @@ class LoginCustomer(APIView):
 # User Management (list/detail/update/delete)
 # -------------------------
 class CustomerManageViews(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, id=None):
@@ -181,9 +190,7 @@ class CustomerManageViews(APIView):
         if current_user.role == UserProfile.ROLE_SUPERADMIN:
             users = UserProfile.objects.all()
         else:
-            users = UserProfile.objects.filter(
-                Q(created_by_superadmin=current_user) | Q(created_by_manager=current_user)
-            )
+            users = hierarchy.subtree(current_user)
 
         return Response({"data": UserListSerializer(users, many=True).data}, status=200)
 
@@ -197,8 +204,8 @@ class CustomerManageViews(APIView):
         # Only SuperAdmin or the creator can edit
         if not (
             current_user.role == UserProfile.ROLE_SUPERADMIN or
-            user.created_by_superadmin == current_user or
-            user.created_by_manager == current_user
+            user.created_by_superadmin_id == current_user.pk or
+            user.created_by_manager_id == current_user.pk
         ):
             return Response({"msg": "You are not authorized to edit this user"}, status=403)
 
@@ -219,7 +226,7 @@ class CustomerManageViews(APIView):
         allowed = False
         if current_user.role == UserProfile.ROLE_SUPERADMIN:
             allowed = True
-        if user.created_by_superadmin == current_user or user.created_by_manager == current_user:
+        if user.created_by_superadmin_id == current_user.pk or user.created_by_manager_id == current_user.pk:
             allowed = True
 
         if not allowed:
@@ -229,11 +236,69 @@ class CustomerManageViews(APIView):
         return Response({"msg": "User deleted successfully"}, status=200)
 
 
+# -------------------------
+# User directory (paginated, searchable, with role counts)
+# -------------------------
+class UserDirectoryPagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class UserDirectoryAPIView(APIView):
+    """
+    GET /users/directory/?search=&role=HR,Manager&created_by=<id>&is_active=true&fields=id,email&page=
+    SuperAdmin sees everyone, other users everyone below them in the hierarchy.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    pagination_class = UserDirectoryPagination
+
+    def get_scope(self, user):
+        if user.role == UserProfile.ROLE_SUPERADMIN:
+            return UserProfile.objects.all(), "all"
+        return hierarchy.subtree(user), f"subtree:{user.pk}"
+
+    def get(self, request):
+        params = request.query_params
+        qs, scope = self.get_scope(request.user)
+        counts = role_counts(qs, scope)
+
+        fields = [f.strip() for f in params.get('fields', '').split(',') if f.strip()]
+        unknown = set(fields) - set(DIRECTORY_FIELDS)
+        if unknown:
+            return Response({"status": "failure", "msg": f"Unknown fields: {', '.join(sorted(unknown))}"}, status=400)
+
+        if params.get('search'):
+            qs = search_users(qs, params['search'])
+        if params.get('role'):
+            qs = qs.filter(role__in=[r.strip() for r in params['role'].split(',')])
+        if params.get('created_by'):
+            creator = params['created_by']
+            if not creator.isdigit():
+                return Response({"status": "failure", "msg": "created_by must be a user id"}, status=400)
+            qs = qs.filter(Q(created_by_superadmin_id=creator) | Q(created_by_manager_id=creator))
+        if params.get('is_active') in ('true', 'false'):
+            qs = qs.filter(is_active=params['is_active'] == 'true')
+
+        qs = qs.order_by('id')
+        if fields:
+            qs = qs.only(*fields)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        data = UserDirectorySerializer(page, many=True, context={"fields": fields}).data
+        response = paginator.get_paginated_response(data)
+        response.data = {"status": "success", "counts": counts, **response.data}
+        return response
+
+
 # -------------------------
 # OTP endpoints
 # -------------------------
 class OTPView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPRequestThrottle]
 
     def post(self, request):
         email = request.data.get('email')
@@ -247,6 +312,7 @@ class OTPView(APIView):
 
 class VerifyOTP(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPVerifyThrottle]
 
     def post(self, request):
         email = request.data.get('email')
@@ -259,11 +325,23 @@ class VerifyOTP(APIView):
         return Response({"message": msg}, status=200)
 
 
+class OTPDeliveryMetricsView(APIView):
+    """Queue wait / SMTP send / end-to-end delivery latency histograms (SuperAdmin only)."""
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != UserProfile.ROLE_SUPERADMIN:
+            return Response({"msg": "Only SuperAdmin can view delivery metrics"}, status=403)
+        return Response({"status": "success", "data": delivery_metrics()}, status=200)
+
+
 # -------------------------
 # Forgot password (via OTP)
 # -------------------------
 class ForgotPasswordAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [PasswordResetThrottle]
 
     def post(self, request):
         email = request.data.get('email')
@@ -293,7 +371,7 @@ class ForgotPasswordAPIView(APIView):
 
 
 class ManagerTeamListAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, manager_id=None):
@@ -310,25 +388,26 @@ class ManagerTeamListAPIView(APIView):
         if manager.role != UserProfile.ROLE_MANAGER:
             return Response({"status": "error", "message": "The provided user is not a Manager."}, status=400)
         hiring_role = getattr(UserProfile, "ROLE_HIRING_MANAGER", getattr(UserProfile, "Hiring_Manager", "HiringManager"))
-        base_qs = UserProfile.objects.filter(
+        # one query for both lists; counts come from the lists themselves
+        team = list(UserProfile.objects.filter(
             created_by_manager=manager_id,
             role__in=[UserProfile.ROLE_HR, hiring_role],
-        ).order_by("id")
+        ).order_by("id"))
 
-        hr_qs = base_qs.filter(role=UserProfile.ROLE_HR)
-        hm_qs = base_qs.filter(role=hiring_role)
+        hr_list = [u for u in team if u.role == UserProfile.ROLE_HR]
+        hm_list = [u for u in team if u.role == hiring_role]
 
-        hr_data = UserListSerializer(hr_qs, many=True).data
-        hm_data = UserListSerializer(hm_qs, many=True).data
+        hr_data = UserListSerializer(hr_list, many=True).data
+        hm_data = UserListSerializer(hm_list, many=True).data
 
         return Response(
             {
                 "status": "success",
                 "manager": {"id": manager.id, "email": manager.email, "full_name": manager.full_name},
                 "counts": {
-                    "hr": hr_qs.count(),
-                    "hiring_manager": hm_qs.count(),
-                    "total": base_qs.count(),
+                    "hr": len(hr_list),
+                    "hiring_manager": len(hm_list),
+                    "total": len(team),
                 },
                 "hr_list": hr_data,
                 "hiring_manager_list": hm_data,